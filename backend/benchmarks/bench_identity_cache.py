@@ -0,0 +1,85 @@
+"""
+Measures GET /notifications/ with and without the identity cache.
+
+Run with the database and Redis up:
+    python -m backend.benchmarks.bench_identity_cache --requests 2000
+"""
+import argparse
+import statistics
+import time
+
+from flask_jwt_extended import create_access_token
+
+from backend.core.app_factory import create_app
+from backend.db import db
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.utils.identity_cache import identity_cache
+from backend.utils.query_counter import QUERY_COUNT_HEADER, enable_query_count_header
+
+BENCH_USERNAME = "bench_identity_worker"
+
+
+def ensure_user() -> User:
+    user = User.find_by({"username": BENCH_USERNAME})
+    if not user:
+        user = User(
+            username=BENCH_USERNAME,
+            email=f"{BENCH_USERNAME}@example.com",
+            password_hash="hashed_password",
+            role=Role.WORKER,
+            first_name="Bench",
+            family_name="Worker",
+            personal_id="000000001",
+        )
+        user.save_to_db()
+    return user
+
+
+def run(app, client, requests: int, cache_enabled: bool) -> dict:
+    app.config["IDENTITY_CACHE_ENABLED"] = cache_enabled
+    identity_cache.clear_local()
+    identity_cache.invalidate(BENCH_USERNAME)
+    client.get("/notifications/")  # warm up
+
+    latencies = []
+    queries = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get("/notifications/")
+        latencies.append(time.perf_counter() - start)
+        queries.append(int(response.headers[QUERY_COUNT_HEADER]))
+        assert response.status_code == 200, response.get_json()
+
+    latencies.sort()
+    return {
+        "cache": "on" if cache_enabled else "off",
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "queries_per_request": statistics.mean(queries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    app = create_app()
+    enable_query_count_header(app)
+    # Identities are dicts, which newer flask-jwt-extended releases reject as "sub" unless told otherwise
+    app.config["JWT_VERIFY_SUB"] = False
+    with app.app_context():
+        user = ensure_user()
+        token = create_access_token(identity={"username": user.username, "role": user.role.value})
+
+    client = app.test_client()
+    client.set_cookie("access_token_cookie", token)
+    for cache_enabled in (False, True):
+        result = run(app, client, args.requests, cache_enabled)
+        print(f"identity cache {result['cache']:>3}: mean {result['mean_ms']:.3f} ms, "
+              f"p95 {result['p95_ms']:.3f} ms, {result['queries_per_request']:.1f} queries/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Measures how long listing a user's unread notifications and counting them take as the
+notifications table grows. Rows are spread over the past year, so with monthly partitions
+and the hot window the queries only touch the last few partitions and the latency should
+stay flat. Also prints how many partitions each plan reads.
+
+Run with the database up (it inserts millions of rows for throwaway users and deletes them
+afterwards, so not against production):
+    python -m backend.benchmarks.bench_notification_partitions --rows 100000 1000000 3000000
+"""
+import argparse
+import datetime
+import re
+import statistics
+import time
+
+from sqlalchemy import delete, insert, text
+
+from backend.core.app_factory import create_app
+from backend.db import db
+from backend.models.notification import Notification
+from backend.models.notification_partitions import TABLE, add_months, create_partitions, month_start
+from backend.models.roles import Role
+from backend.models.user import User
+
+USER_PREFIX = "bench_partitions_"
+SPREAD_HOURS = 360 * 24
+# One in this many notifications is unread
+UNREAD_EVERY = 10
+
+
+def create_users(count: int) -> list:
+    rows = [{"username": f"{USER_PREFIX}{i}", "email": f"{USER_PREFIX}{i}@example.com", "password_hash": "-",
+             "role": Role.WORKER, "first_name": "Bench", "family_name": "Worker",
+             "personal_id": f"{USER_PREFIX}{i}"} for i in range(count)]
+    user_ids = list(db.session.scalars(insert(User).returning(User.id), rows))
+    db.session.commit()
+    return user_ids
+
+
+def insert_notifications(user_ids: list, first: int, last: int):
+    db.session.execute(text(
+        f"INSERT INTO {TABLE} (user_id, message, is_read, is_approved, created_at, updated_at) "
+        f"SELECT (CAST(:user_ids AS integer[]))[1 + i % :users], 'Bench notification', i % :unread_every <> 0, "
+        f"true, now() - (i % :spread) * interval '1 hour', now() "
+        f"FROM generate_series(:first, :last) AS i"
+    ), {"user_ids": user_ids, "users": len(user_ids), "unread_every": UNREAD_EVERY, "spread": SPREAD_HOURS,
+        "first": first, "last": last})
+    db.session.commit()
+    db.session.execute(text(f"ANALYZE {TABLE}"))
+
+
+def partitions_read(query: str, params: dict) -> int:
+    plan = "\n".join(db.session.execute(text(f"EXPLAIN {query}"), params).scalars())
+    return len(set(re.findall(rf"on ({TABLE}_\d{{4}}_\d{{2}})", plan)))
+
+
+def measure(user_id: int, rounds: int):
+    page, count = [], []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        Notification.get_unread_page(user_id, limit=20)
+        page.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        Notification.count_unread(user_id)
+        count.append(time.perf_counter() - started)
+        db.session.rollback()
+    return statistics.median(page), statistics.median(count)
+
+
+def cleanup():
+    user_ids = list(db.session.scalars(db.select(User.id).where(User.username.like(f"{USER_PREFIX}%"))))
+    if user_ids:
+        db.session.execute(delete(Notification).where(Notification.user_id.in_(user_ids)))
+        db.session.execute(delete(User).where(User.id.in_(user_ids)))
+        db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 3_000_000])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    with create_app().app_context():
+        cleanup()
+        current = month_start(datetime.datetime.now(datetime.UTC))
+        # Older months than those made with the table; the archival drops them once they expire
+        create_partitions(db.session.connection(), add_months(current, -12), 13)
+        db.session.commit()
+        user_ids = create_users(args.users)
+        try:
+            inserted = 0
+            for rows in sorted(args.rows):
+                insert_notifications(user_ids, inserted, rows - 1)
+                inserted = rows
+                page, count = measure(user_ids[0], args.rounds)
+                read = partitions_read(
+                    f"SELECT id FROM {TABLE} WHERE user_id = :user_id AND is_read IS FALSE AND created_at >= :since",
+                    {"user_id": user_ids[0], "since": Notification.hot_since()}
+                )
+                print(f"{rows:>9} rows: unread page {page * 1000:.2f} ms, unread count {count * 1000:.2f} ms "
+                      f"(median), {read} partitions read")
+        finally:
+            cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Shows the plans of the hot query paths with and without the indexes added by the schema
+migrations, on a generated dataset. Each query is explained once with its index dropped inside a
+transaction that is rolled back, and once with the index in place.
+
+Run with the database up (it inserts rows for throwaway users and events, holds exclusive locks
+while explaining and deletes everything afterwards, so not against production):
+    python -m backend.benchmarks.bench_query_plans --rows 1000000
+"""
+import argparse
+import datetime
+import re
+
+from sqlalchemy import delete, insert, text
+
+from backend.core.app_factory import create_app
+from backend.db import db
+from backend.models.event import Event
+from backend.models.event_job import EventJob
+from backend.models.event_users import EventUsers
+from backend.models.notification import Notification
+from backend.models.notification_partitions import add_months, create_partitions, month_start
+from backend.models.reviews import Review
+from backend.models.roles import Role
+from backend.models.user import User
+
+PREFIX = "bench_plans_"
+RECRUITERS = 1000
+# Rows of event_users, reviews and notifications per event
+ROWS_PER_EVENT = 10
+SCAN = re.compile(r"(Parallel Seq Scan|Seq Scan|Index Only Scan|Bitmap Index Scan|Bitmap Heap Scan|Index Scan)")
+
+# (index, query) pairs; parameters are filled in by main()
+QUERIES = [
+    ("ix_event_users_worker_id",
+     "SELECT event_id FROM event_users WHERE worker_id = :worker_id"),
+    ("ix_event_jobs_event_id_job_title",
+     "SELECT id FROM event_jobs WHERE event_id = :event_id AND job_title = 'Waiter'"),
+    ("ix_events_start_datetime_id",
+     "SELECT id FROM events WHERE start_datetime > :now ORDER BY start_datetime, id LIMIT 20"),
+    ("ix_events_recruiter",
+     "SELECT id FROM events WHERE recruiter = :recruiter"),
+    ("ix_reviews_worker_id_timestamp_id",
+     "SELECT id FROM reviews WHERE worker_id = :worker_id ORDER BY timestamp DESC, id DESC LIMIT 20"),
+    ("ix_notifications_user_id_is_read_created_at",
+     "SELECT id FROM notifications WHERE user_id = :worker_id AND is_read IS FALSE AND created_at >= :since "
+     "ORDER BY created_at DESC, id DESC LIMIT 20"),
+]
+
+
+def populate(rows: int) -> dict:
+    events = max(rows // ROWS_PER_EVENT, 1)
+    users = ROWS_PER_EVENT * 100
+    user_ids = list(db.session.scalars(insert(User).returning(User.id), [
+        {"username": f"{PREFIX}{i}", "email": f"{PREFIX}{i}@example.com", "password_hash": "-",
+         "role": Role.WORKER, "first_name": "Bench", "family_name": "Worker", "personal_id": f"{PREFIX}{i}"}
+        for i in range(users)
+    ]))
+    params = {"user_ids": user_ids, "users": users, "events": events, "rows": rows,
+              "recruiters": RECRUITERS, "prefix": PREFIX, "per_event": ROWS_PER_EVENT}
+    # Events start within a year around now, so the feed only wants part of them
+    db.session.execute(text(
+        "INSERT INTO events (name, start_datetime, end_datetime, recruiter, status, company_id) "
+        "SELECT 'Bench event', now() + (i % 365 - 182) * interval '1 day', "
+        "now() + (i % 365 - 182) * interval '1 day' + interval '4 hours', "
+        ":prefix || (i % :recruiters), 'planned', '0' FROM generate_series(0, :events - 1) AS i"
+    ), params)
+    db.session.execute(text(
+        "INSERT INTO event_jobs (event_id, job_title, slots, openings) "
+        "SELECT id, title, 10, 10 FROM events, unnest(ARRAY['Waiter', 'Bartender']) AS title "
+        "WHERE recruiter LIKE :prefix || '%'"
+    ), params)
+    # Each event gets ROWS_PER_EVENT workers and reviews; worker k of an event is 100 * k users further
+    # along, so no pair repeats
+    per_event = (
+        "WITH e AS (SELECT events.id AS event_id, event_jobs.id AS job_id, "
+        "           row_number() OVER (ORDER BY events.id) AS n "
+        "           FROM events JOIN event_jobs ON event_jobs.event_id = events.id AND job_title = 'Waiter' "
+        "           WHERE recruiter LIKE :prefix || '%') "
+    )
+    worker = "(CAST(:user_ids AS integer[]))[1 + (e.n + k * 100) % :users]"
+    db.session.execute(text(
+        per_event + "INSERT INTO event_users (event_id, worker_id, job_id, approval_status, approval_count) "
+        f"SELECT e.event_id, {worker}, e.job_id, false, 0 FROM e, generate_series(0, :per_event - 1) AS k"
+    ), params)
+    db.session.execute(text(
+        per_event + "INSERT INTO reviews (worker_id, commenter_id, review_text, timestamp, event_id) "
+        f"SELECT {worker}, (CAST(:user_ids AS integer[]))[1], 'Good', now() - (e.n % 1000) * interval '1 hour', "
+        "e.event_id FROM e, generate_series(0, :per_event - 1) AS k"
+    ), params)
+    current = month_start(datetime.datetime.now(datetime.UTC))
+    create_partitions(db.session.connection(), add_months(current, -4), 4)
+    db.session.execute(text(
+        "INSERT INTO notifications (user_id, message, is_read, is_approved, created_at, updated_at) "
+        "SELECT (CAST(:user_ids AS integer[]))[1 + i % :users], 'Bench notification', i % 10 <> 0, true, "
+        "now() - (i % 2000) * interval '1 hour', now() FROM generate_series(0, :rows - 1) AS i"
+    ), params)
+    db.session.commit()
+    for table in ("users", "events", "event_jobs", "event_users", "reviews", "notifications"):
+        db.session.execute(text(f"ANALYZE {table}"))
+    db.session.commit()
+    event_id = db.session.scalar(db.select(Event.id).where(Event.recruiter == f"{PREFIX}0").limit(1))
+    # Don't hold locks that would keep explain() from dropping indexes
+    db.session.commit()
+    return {"worker_id": user_ids[0], "event_id": event_id, "recruiter": f"{PREFIX}0",
+            "now": datetime.datetime.now(datetime.UTC), "since": Notification.hot_since()}
+
+
+def explain(query: str, params: dict, drop_index: str = None) -> str:
+    with db.engine.connect() as connection:
+        transaction = connection.begin()
+        if drop_index:
+            connection.execute(text(f"DROP INDEX {drop_index}"))
+        plan = "\n".join(connection.execute(text(f"EXPLAIN (ANALYZE) {query}"), params).scalars())
+        transaction.rollback()
+    scans = sorted(set(SCAN.findall(plan)))
+    elapsed = re.search(r"Execution Time: ([\d.]+) ms", plan).group(1)
+    return f"{', '.join(scans):<36} {elapsed:>9} ms"
+
+
+def cleanup():
+    user_ids = list(db.session.scalars(db.select(User.id).where(User.username.like(f"{PREFIX}%"))))
+    event_ids = db.select(Event.id).where(Event.recruiter.like(f"{PREFIX}%"))
+    db.session.execute(delete(EventUsers).where(EventUsers.event_id.in_(event_ids)))
+    db.session.execute(delete(Review).where(Review.event_id.in_(event_ids)))
+    if user_ids:
+        db.session.execute(delete(Notification).where(Notification.user_id.in_(user_ids)))
+    db.session.commit()
+    # Deleting a job or an event checks the tables referencing it through columns that aren't indexed,
+    # reading every page of them; vacuuming first leaves little to read
+    with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("VACUUM event_users, reviews, notifications"))
+    db.session.execute(delete(EventJob).where(EventJob.event_id.in_(event_ids)))
+    db.session.execute(delete(Event).where(Event.recruiter.like(f"{PREFIX}%")))
+    if user_ids:
+        db.session.execute(delete(User).where(User.id.in_(user_ids)))
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000,
+                        help="rows of event_users, reviews and notifications; events get a tenth")
+    args = parser.parse_args()
+
+    with create_app().app_context():
+        cleanup()
+        try:
+            params = populate(args.rows)
+            print(f"{'index':<45} {'without':<49} with")
+            for index, query in QUERIES:
+                print(f"{index:<45} {explain(query, params, drop_index=index):<49} {explain(query, params)}")
+        finally:
+            cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Measures how long claiming and acknowledging a batch of due reminders takes as the number of
+reminders pending in the future grows. With time buckets the dispatcher only reads the current
+and past buckets, so the latency should stay flat.
+
+Run with Redis up (it clears every pending reminder first, so not against production):
+    python -m backend.benchmarks.bench_reminder_dispatch --pending 10000 50000 200000
+"""
+import argparse
+import statistics
+import time
+
+from backend.redis.maintenance import clear_reminders
+from backend.redis.notification_scheduler import (
+    ack_reminders, claim_due_reminders, reminder_member, _replace_reminders,
+)
+
+# Benchmark reminders belong to negative event ids so they can't be mistaken for real ones
+FUTURE_EVENTS = 1000
+DUE_EVENT_ID = -1
+HORIZON_SECONDS = 30 * 24 * 3600
+
+
+def populate_future(pending: int, now: float):
+    per_event = max(pending // FUTURE_EVENTS, 1)
+    for event in range(FUTURE_EVENTS):
+        event_id = -(event + 2)
+        start = now + 3600 + event * HORIZON_SECONDS / FUTURE_EVENTS
+        _replace_reminders(event_id, [], {
+            reminder_member(event_id, worker_id, "1_hour_before"): start + worker_id
+            for worker_id in range(per_event)
+        })
+
+
+def dispatch_round(batch: int) -> float:
+    now = time.time()
+    _replace_reminders(DUE_EVENT_ID, [], {
+        reminder_member(DUE_EVENT_ID, worker_id, "1_hour_before"): now - 1 for worker_id in range(batch)
+    })
+    started = time.perf_counter()
+    claimed = claim_due_reminders(now, batch)
+    ack_reminders([member for member, _ in claimed])
+    elapsed = time.perf_counter() - started
+    assert len(claimed) == batch, f"claimed {len(claimed)} of {batch}"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pending", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    for pending in args.pending:
+        clear_reminders(confirm=True)
+        populate_future(pending, time.time())
+        latencies = sorted(dispatch_round(args.batch) for _ in range(args.rounds))
+        print(f"{pending:>9} pending: median {statistics.median(latencies) * 1000:.2f} ms, "
+              f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.2f} ms "
+              f"to claim and acknowledge {args.batch} due reminders")
+    clear_reminders(confirm=True)
+
+
+if __name__ == "__main__":
+    main()
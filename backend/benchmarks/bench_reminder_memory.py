@@ -0,0 +1,101 @@
+"""
+Compares the Redis memory taken by pending reminders in the old JSON layout
+(message embedded in each member, plus a per-(event, worker) index set) and in the
+compact `event_id:worker_id:label` layout with a per-event index.
+
+Run with Redis up:
+    python -m backend.benchmarks.bench_reminder_memory --reminders 100000
+
+Uses MEMORY USAGE where the server supports it and falls back to the raw payload size.
+Keys are written under bench:reminders:* and deleted afterwards.
+"""
+import argparse
+import json
+import time
+
+from redis.exceptions import ResponseError
+
+from backend.redis.notification_scheduler import REMINDERS, reminder_member
+from backend.redis.redis_client import redis_client
+
+PREFIX = "bench:reminders"
+WORKERS_PER_EVENT = 200
+EVENT_NAME = "Wedding reception at the Tel Aviv port, main hall"
+
+
+def populate(layout: str, reminders: int) -> list:
+    """
+    Writes `reminders` reminders in the given layout and returns the keys used.
+    """
+    zset_key = f"{PREFIX}:{layout}"
+    keys = {zset_key}
+    now = time.time()
+    pipeline = redis_client.pipeline(transaction=False)
+    for i in range(reminders):
+        reminder = REMINDERS[i % len(REMINDERS)]
+        pair = i // len(REMINDERS)
+        event_id, worker_id = pair // WORKERS_PER_EVENT + 1, pair % WORKERS_PER_EVENT + 1
+        if layout == "json":
+            member = json.dumps({
+                "worker_id": worker_id,
+                "event_id": event_id,
+                "message": f"Reminder ({reminder['label']}): Please confirm your attendance for event: {EVENT_NAME} .",
+                "label": reminder["label"],
+                "check_delay": reminder["check_delay"],
+            })
+            index_key = f"{PREFIX}:{layout}:worker:{event_id}:{worker_id}"
+        else:
+            member = reminder_member(event_id, worker_id, reminder["label"])
+            index_key = f"{PREFIX}:{layout}:event:{event_id}"
+        pipeline.zadd(zset_key, {member: now + 3600 + i})
+        pipeline.sadd(index_key, member)
+        keys.add(index_key)
+        if i % 5000 == 4999:
+            pipeline.execute()
+    pipeline.execute()
+    return sorted(keys)
+
+
+def measure(keys: list) -> tuple:
+    """
+    Returns (bytes, method) for the keys: MEMORY USAGE if available, else the payload size.
+    """
+    try:
+        redis_client.memory_usage(keys[0], samples=0)
+    except ResponseError:
+        total = 0
+        for key in keys:
+            if redis_client.type(key) == "zset":
+                total += sum(len(member) + 8 for member, _ in redis_client.zscan_iter(key, count=5000))
+            else:
+                total += sum(len(member) for member in redis_client.sscan_iter(key, count=5000))
+        return total, "payload bytes"
+
+    pipeline = redis_client.pipeline(transaction=False)
+    for key in keys:
+        pipeline.memory_usage(key, samples=0)
+    return sum(size or 0 for size in pipeline.execute()), "MEMORY USAGE"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reminders", type=int, default=100_000)
+    args = parser.parse_args()
+
+    results = {}
+    for layout in ("json", "compact"):
+        keys = populate(layout, args.reminders)
+        try:
+            results[layout] = measure(keys) + (len(keys),)
+        finally:
+            for start in range(0, len(keys), 1000):
+                redis_client.delete(*keys[start:start + 1000])
+
+    for layout, (size, method, key_count) in results.items():
+        print(f"{layout:>7}: {size / 1024 / 1024:7.2f} MiB ({method}) in {key_count} keys, "
+              f"{size / args.reminders:.0f} bytes/reminder")
+    print(f"compact layout uses {results['compact'][0] / results['json'][0]:.0%} of the JSON layout")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 import threading
-import time
 from backend.core.celery_app import app, celery
-from backend.redis.notification_worker import process_scheduled_reminders
+from backend.redis.notification_worker import (
+    archive_old_notifications, flush_hr_digests, process_scheduled_reminders, reconcile_unread_counts,
+    sweep_approval_timeouts,
+)
+from backend.redis.leader import LeaderLease, run_as_leader
+from backend.redis.reminder_loop import run_eta_scheduler, run_poll_scheduler
 import logging
 
 # Set up logging
@@ -22,42 +26,74 @@ def start_celery_worker():
     celery.worker_main(['worker', '--loglevel=info', '--pool=solo'])
 
 
-def run_scheduled_tasks():
-    logger.info("Starting scheduled tasks runner")
-    while True:
-        try:
-            logger.info("Running scheduled tasks")
-            task = process_scheduled_reminders.delay()
-            logger.info(f"Scheduled task execution queued with ID: {task.id}")
-        except Exception as e:
-            logger.error("Error in scheduled tasks")
-            logger.exception(e)
+def enqueue_reminder_dispatch():
+    task = process_scheduled_reminders.delay()
+    logger.info(f"Scheduled task execution queued with ID: {task.id}")
+    task = sweep_approval_timeouts.delay()
+    logger.info(f"Approval sweep queued with ID: {task.id}")
+    task = flush_hr_digests.delay()
+    logger.info(f"HR digest flush queued with ID: {task.id}")
 
-        # Wait for 30 seconds before next run
-        logger.info("Waiting 30 seconds until next check...")
-        time.sleep(30)
 
+def run_reminder_scheduler(should_run):
+    mode = app.config['REMINDER_SCHEDULER_MODE']
+    logger.info(f"Starting scheduled tasks runner in {mode} mode")
+    if mode == "poll":
+        run_poll_scheduler(enqueue_reminder_dispatch, should_run=should_run)
+    else:
+        run_eta_scheduler(enqueue_reminder_dispatch, max_sleep=app.config['REMINDER_SCHEDULER_MAX_SLEEP'],
+                          should_run=should_run)
+
+
+def enqueue_unread_reconciliation():
+    task = reconcile_unread_counts.delay()
+    logger.info(f"Unread counter reconciliation queued with ID: {task.id}")
+
+
+def run_unread_reconciliation():
+    lease = LeaderLease("unread_reconciler", ttl_ms=app.config['REMINDER_SCHEDULER_LEASE_TTL_MS'])
+    run_as_leader(lease, lambda should_run: run_poll_scheduler(
+        enqueue_unread_reconciliation, interval=app.config['UNREAD_COUNT_RECONCILE_SECONDS'], should_run=should_run
+    ))
 
-if __name__ == "__main__":
-    # Clear existing reminders on startup (optional, for troubleshooting)
-    try:
-        from backend.redis.redis_client import redis_client
 
-        redis_client.delete("event_reminders")
-        logger.info("Cleared existing reminders from Redis")
-    except Exception as e:
-        logger.error("Error clearing reminders")
-        logger.exception(e)
+def enqueue_notification_archival():
+    task = archive_old_notifications.delay()
+    logger.info(f"Notification archival queued with ID: {task.id}")
 
+
+def run_notification_archival():
+    lease = LeaderLease("notification_archiver", ttl_ms=app.config['REMINDER_SCHEDULER_LEASE_TTL_MS'])
+    run_as_leader(lease, lambda should_run: run_poll_scheduler(
+        enqueue_notification_archival, interval=app.config['NOTIFICATION_ARCHIVE_INTERVAL_SECONDS'],
+        should_run=should_run
+    ))
+
+
+def run_scheduled_tasks():
+    # Every node runs this thread, but only the holder of the lease schedules reminders.
+    # Pending reminders are kept across restarts; clear them with
+    # `python -m backend.redis.maintenance clear-reminders --yes`.
+    lease = LeaderLease("reminder_scheduler", ttl_ms=app.config['REMINDER_SCHEDULER_LEASE_TTL_MS'])
+    run_as_leader(lease, run_reminder_scheduler)
+
+
+if __name__ == "__main__":
     flask_thread = threading.Thread(target=start_flask)
     celery_thread = threading.Thread(target=start_celery_worker)
     scheduler_thread = threading.Thread(target=run_scheduled_tasks)
+    reconciler_thread = threading.Thread(target=run_unread_reconciliation)
+    archiver_thread = threading.Thread(target=run_notification_archival)
 
     logger.info("Starting all threads")
     flask_thread.start()
     celery_thread.start()
     scheduler_thread.start()
+    reconciler_thread.start()
+    archiver_thread.start()
 
     flask_thread.join()
     celery_thread.join()
-    scheduler_thread.join()
\ No newline at end of file
+    scheduler_thread.join()
+    reconciler_thread.join()
+    archiver_thread.join()
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Versioned schema migrations. The application applies pending ones on startup; they can also be
+run by hand, e.g. before rolling out several nodes:
+
+    python -m backend.migrations.runner upgrade    # apply pending migrations
+    python -m backend.migrations.runner status     # list applied and pending migrations
+"""
+import argparse
+import datetime
+import logging
+from typing import Callable, List, Optional
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.engine import Connection
+
+from backend.db import db
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Key of the Postgres advisory lock held while migrating, so nodes starting together apply each migration once
+MIGRATION_LOCK_KEY = 4_242_001
+
+
+class SchemaMigration(db.Model):
+    """
+    One row per applied migration.
+    """
+    __tablename__ = "schema_migrations"
+
+    version = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    applied_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.datetime.now(datetime.UTC))
+
+
+class Migration:
+    """
+    A schema change. `upgrade` gets the connection to run it on. Transactional migrations run in one
+    transaction with the row recording them; the others run in autocommit mode, as CREATE INDEX
+    CONCURRENTLY requires, so they must be safe to run again after failing half way.
+    """
+
+    def __init__(self, version: int, name: str, upgrade: Callable[[Connection], None], transactional: bool = True):
+        self.version = version
+        self.name = name
+        self.upgrade = upgrade
+        self.transactional = transactional
+
+
+def _migrations(migrations: Optional[List[Migration]]) -> List[Migration]:
+    if migrations is None:
+        from backend.migrations.versions import MIGRATIONS
+        migrations = MIGRATIONS
+    return sorted(migrations, key=lambda migration: migration.version)
+
+
+def applied_versions(connection: Connection) -> List[int]:
+    SchemaMigration.__table__.create(connection, checkfirst=True)
+    return list(connection.execute(select(SchemaMigration.version).order_by(SchemaMigration.version)).scalars())
+
+
+def run_migrations(migrations: Optional[List[Migration]] = None) -> List[int]:
+    """
+    Applies the migrations that weren't applied yet, in version order, and returns their versions.
+    Stops at the first one that fails, leaving it and the later ones pending.
+    """
+    engine = db.engine
+    done = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_connection:
+        lock_connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            applied = set(applied_versions(lock_connection))
+            for migration in _migrations(migrations):
+                if migration.version in applied:
+                    continue
+                logger.info(f"Applying migration {migration.version} {migration.name}")
+                if migration.transactional:
+                    with engine.begin() as connection:
+                        migration.upgrade(connection)
+                        _record(connection, migration)
+                else:
+                    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                        migration.upgrade(connection)
+                        _record(connection, migration)
+                done.append(migration.version)
+        finally:
+            lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    return done
+
+
+def _record(connection: Connection, migration: Migration) -> None:
+    connection.execute(insert(SchemaMigration).values(version=migration.version, name=migration.name))
+
+
+def main():
+    from backend.core.app_factory import create_app
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("upgrade", help="apply pending migrations")
+    commands.add_parser("status", help="list applied and pending migrations")
+    args = parser.parse_args()
+
+    # Creating the app already applies pending migrations
+    with create_app().app_context():
+        if args.command == "upgrade":
+            run_migrations()
+        with db.engine.connect() as connection:
+            applied = set(applied_versions(connection))
+            connection.commit()
+        for migration in _migrations(None):
+            state = "applied" if migration.version in applied else "pending"
+            print(f"{migration.version:>4} {migration.name:<40} {state}")
+
+
+if __name__ == "__main__":
+    main()
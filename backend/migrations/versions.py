@@ -0,0 +1,69 @@
+"""
+The schema migrations, in the order they are applied. Append new ones with the next version;
+never change one that was released.
+
+The first migration creates the tables as the models declare them, so on a new database the
+later ones find their changes already made. They are written to be no-ops in that case.
+"""
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from backend.db import db
+from backend.migrations.runner import Migration
+from backend.models.notification_partitions import partition_existing_table
+
+
+def create_index_concurrently(connection: Connection, name: str, table: str, columns: List[str]) -> None:
+    """
+    Builds the index without blocking writes to the table. Must run in autocommit mode.
+    """
+    valid = connection.execute(text(
+        "SELECT pg_index.indisvalid FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+        "WHERE pg_class.relname = :name"
+    ), {"name": name}).scalar()
+    if valid:
+        return
+    if valid is not None:
+        # Left behind by a concurrent build that failed or was interrupted
+        connection.execute(text(f"DROP INDEX CONCURRENTLY {name}"))
+    quoted = ", ".join(f'"{column}"' for column in columns)
+    connection.execute(text(f"CREATE INDEX CONCURRENTLY {name} ON {table} ({quoted})"))
+
+
+def create_tables(connection: Connection) -> None:
+    # Databases that predate migrations already have most tables; only the missing ones are created
+    db.metadata.create_all(connection)
+
+
+def partition_notifications(connection: Connection) -> None:
+    partition_existing_table(connection)
+
+
+def index_hot_query_paths(connection: Connection) -> None:
+    # Events a worker signed up for; the primary key starts with event_id
+    create_index_concurrently(connection, "ix_event_users_worker_id", "event_users", ["worker_id"])
+    # A job looked up by title when assigning workers and applying to events
+    create_index_concurrently(connection, "ix_event_jobs_event_id_job_title", "event_jobs", ["event_id", "job_title"])
+    # The worker feed, in start order
+    create_index_concurrently(connection, "ix_events_start_datetime_id", "events", ["start_datetime", "id"])
+    # Events of a recruiter
+    create_index_concurrently(connection, "ix_events_recruiter", "events", ["recruiter"])
+    # Reviews of a worker, newest first
+    create_index_concurrently(connection, "ix_reviews_worker_id_timestamp_id", "reviews",
+                              ["worker_id", "timestamp", "id"])
+
+
+def make_personal_id_optional(connection: Connection) -> None:
+    # Signup never required it, but the column did; Postgres lets many rows leave a unique column NULL
+    connection.execute(text("ALTER TABLE users ALTER COLUMN personal_id DROP NOT NULL"))
+
+
+MIGRATIONS = [
+    Migration(1, "create_tables", create_tables),
+    # Also adds the notification dedup keys and the (user_id, is_read, created_at) index
+    Migration(2, "partition_notifications", partition_notifications),
+    Migration(3, "index_hot_query_paths", index_hot_query_paths, transactional=False),
+    Migration(4, "make_personal_id_optional", make_personal_id_optional),
+]
@@ -2,14 +2,21 @@ import datetime
 from typing import List, Dict, Optional, Tuple
 
 from flask import Response, jsonify
+from sqlalchemy import tuple_
 
 from backend.db import db
 from backend.models.event_job import EventJob
 from backend.models.event_users import EventUsers
+from backend.redis.feed_cache import invalidate_feed_cache
+from backend.redis.notification_scheduler import purge_event_reminders, reschedule_event_reminders
 
 
 class Event(db.Model):
     __tablename__ = "events"
+    __table_args__ = (
+        db.Index("ix_events_start_datetime_id", "start_datetime", "id"),
+        db.Index("ix_events_recruiter", "recruiter"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(80), nullable=False)
@@ -53,10 +60,14 @@ class Event(db.Model):
         Updates event fields. If 'status' is passed as an EventStatus enum,
         convert it to its string representation.
         """
+        old_start = self.start_datetime
         for key, value in data.items():
             if hasattr(self, key) and key != 'id' and value:
                 setattr(self, key, value)
         db.session.commit()
+        invalidate_feed_cache()
+        if self.start_datetime != old_start:
+            reschedule_event_reminders(self.id, old_start, self.start_datetime)
 
     @staticmethod
     def delete(event_id: int) -> Tuple[Response, int]:
@@ -68,6 +79,8 @@ class Event(db.Model):
             EventUsers.query.filter_by(event_id=event_id).delete()
             db.session.delete(event)
             db.session.commit()
+            invalidate_feed_cache()
+            purge_event_reminders(event_id)
             return jsonify({"message": "Event deleted successfully"}), 200
         except Exception as e:
             db.session.rollback()
@@ -77,7 +90,12 @@ class Event(db.Model):
         db.session.add(self)
         db.session.commit()
 
-    def to_dict(self):
+    def to_dict(self, jobs: Optional[List[EventJob]] = None) -> Dict:
+        """
+        Serializes the event with its jobs. Pass preloaded jobs to avoid a per-event query.
+        """
+        if jobs is None:
+            jobs = EventJob.query.filter_by(event_id=self.id).all()
         return {
             "id": self.id,
             "name": self.name,
@@ -94,10 +112,29 @@ class Event(db.Model):
                     "slots": job.slots,
                     "openings": job.openings
                 }
-                for job in EventJob.query.filter_by(event_id=self.id).all()
+                for job in jobs
             ],
         }
 
+    @staticmethod
+    def to_dict_many(events: List["Event"]) -> List[Dict]:
+        """
+        Serializes a list of events, loading the jobs of all of them in a single query.
+        """
+        if not events:
+            return []
+        jobs_by_event = EventJob.get_jobs_by_events([event.id for event in events])
+        return [event.to_dict(jobs_by_event.get(event.id, [])) for event in events]
+
+    @classmethod
+    def find_by_ids(cls, event_ids) -> Dict[int, 'Event']:
+        """
+        Loads many events with one query, keyed by id.
+        """
+        if not event_ids:
+            return {}
+        return {event.id: event for event in cls.query.filter(cls.id.in_(list(event_ids))).all()}
+
     @classmethod
     def find_by(cls, field: str, value: any) -> Optional['Event']:
         try:
@@ -108,22 +145,35 @@ class Event(db.Model):
             raise e
 
     @staticmethod
-    def get_future_events_excluding_signed(worker_id: int, filters: Dict) -> List["Event"]:
+    def get_future_events_excluding_signed(worker_id: Optional[int], filters: Dict, limit: Optional[int] = None,
+                                           after: Optional[Tuple[datetime.datetime, int]] = None) -> List["Event"]:
+        """
+        Returns future events with open jobs that the worker hasn't signed up for,
+        ordered by (start_datetime, id). `after` is the sort key of the last event
+        of the previous page, so every page is a single index range scan.
+        Pass worker_id=None to get the feed shared by all workers.
+        """
         try:
-            signed_event_ids = db.session.query(EventUsers.event_id).filter_by(worker_id=worker_id).subquery()
+            open_jobs = db.session.query(EventJob.id).filter(
+                EventJob.event_id == Event.id,
+                EventJob.openings > 0
+            )
+            if "job_title" in filters:
+                open_jobs = open_jobs.filter(EventJob.job_title == filters["job_title"])
             query = Event.query.filter(
                 Event.start_datetime > datetime.datetime.now(datetime.UTC),
-                ~Event.id.in_(signed_event_ids)
+                open_jobs.exists()
             )
+            if worker_id is not None:
+                signed_event_ids = db.session.query(EventUsers.event_id).filter_by(worker_id=worker_id)
+                query = query.filter(~Event.id.in_(signed_event_ids))
             if "location" in filters:
-                query = query.filter(Event.location == filters["location"])
-            if "job_title" in filters:
-                query = query.join(EventJob).filter(
-                    EventJob.job_title == filters["job_title"],
-                    EventJob.openings > 0
-                )
-            else:
-                query = query.join(EventJob).filter(EventJob.openings > 0)
+                query = query.filter(Event.city == filters["location"])
+            if after:
+                query = query.filter(tuple_(Event.start_datetime, Event.id) > after)
+            query = query.order_by(Event.start_datetime, Event.id)
+            if limit:
+                query = query.limit(limit)
             return query.all()
         except Exception as e:
             raise e
@@ -1,3 +1,7 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, update
 from sqlalchemy.exc import SQLAlchemyError
 
 from backend.db import db
@@ -5,6 +9,9 @@ from backend.db import db
 
 class EventJob(db.Model):
     __tablename__ = "event_jobs"
+    __table_args__ = (
+        db.Index("ix_event_jobs_event_id_job_title", "event_id", "job_title"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey("events.id"), nullable=False)
@@ -27,6 +34,19 @@ class EventJob(db.Model):
         db.session.commit()
         return event_job
 
+    @staticmethod
+    def get_jobs_by_events(event_ids: List[int]) -> Dict[int, List["EventJob"]]:
+        """
+        Loads the jobs of several events in one query, grouped by event id.
+        """
+        jobs_by_event = defaultdict(list)
+        if not event_ids:
+            return jobs_by_event
+        jobs = EventJob.query.filter(EventJob.event_id.in_(event_ids)).order_by(EventJob.id).all()
+        for job in jobs:
+            jobs_by_event[job.event_id].append(job)
+        return jobs_by_event
+
     def add_job_to_event(self: int, job_id: int, slots: int) -> None:
         try:
             db.session.execute(
@@ -41,6 +61,37 @@ class EventJob(db.Model):
         db.session.add(self)
         db.session.commit()
 
+    @staticmethod
+    def reserve_opening(job_id: int, count: int = 1) -> Optional[int]:
+        """
+        Atomically takes `count` openings of the job with a single conditional UPDATE,
+        so concurrent approvals can never oversell it. Returns the remaining openings,
+        or None if the job doesn't have enough openings. The caller commits.
+        """
+        stmt = (
+            update(EventJob)
+            .where(EventJob.id == job_id, EventJob.openings >= count)
+            .values(openings=EventJob.openings - count)
+            .returning(EventJob.openings)
+            .execution_options(synchronize_session=False)
+        )
+        return db.session.execute(stmt).scalar()
+
+    @staticmethod
+    def release_opening(job_id: int, count: int = 1) -> Optional[int]:
+        """
+        Atomically gives `count` openings back to the job, never exceeding its slots.
+        Returns the remaining openings, or None if nothing was released. The caller commits.
+        """
+        stmt = (
+            update(EventJob)
+            .where(EventJob.id == job_id, EventJob.openings < EventJob.slots)
+            .values(openings=func.least(EventJob.openings + count, EventJob.slots))
+            .returning(EventJob.openings)
+            .execution_options(synchronize_session=False)
+        )
+        return db.session.execute(stmt).scalar()
+
     def reduce_openings(self) -> None:
         """
         Reduces the number of openings for the job by 1.
@@ -1,13 +1,15 @@
 import datetime
+from collections import Counter, defaultdict
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import JSON
-from typing import List, Dict
+from sqlalchemy import JSON, func, insert, tuple_, update
+from typing import List, Dict, Set, Tuple
 from enum import Enum
 
 from backend.models.user import User
 from backend.models.event_job import EventJob
 from backend.db import db
-from backend.redis.notification_scheduler import schedule_worker_reminders
+from backend.redis.feed_cache import invalidate_feed_cache
+from backend.redis.notification_scheduler import cancel_worker_reminders, schedule_worker_reminders
 
 
 class WorkerStatus(Enum):
@@ -19,6 +21,9 @@ class WorkerStatus(Enum):
 
 class EventUsers(db.Model):
     __tablename__ = 'event_users'
+    __table_args__ = (
+        db.Index("ix_event_users_worker_id", "worker_id"),
+    )
 
     event_id = db.Column(db.Integer, db.ForeignKey('events.id'), primary_key=True)
     worker_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
@@ -69,16 +74,31 @@ class EventUsers(db.Model):
         """
         Creates or updates the EventUsers row to link worker to an event
         with a job & specified status, committing DB changes.
-        If status is APPROVED, decrement job openings.
+        If status is APPROVED, reserve an opening of the job; if an approved worker
+        moves to another job or loses the approval, give the old job's opening back.
+        Openings are changed with conditional UPDATEs, so no job row is read and locked.
+        Raises ValueError if the job has no openings left.
         """
         try:
-            existing = EventUsers.query.filter_by(event_id=event_id, worker_id=worker_id).first()
-            is_already_approved = existing and existing.status == WorkerStatus.APPROVED
-            is_job_new = existing and existing.job_id != job_id
+            existing = EventUsers.query.filter_by(event_id=event_id, worker_id=worker_id).with_for_update().first()
+            was_approved = existing is not None and WorkerStatus(existing.status) == WorkerStatus.APPROVED
+            old_job_id = existing.job_id if existing else None
+            is_approved = status == WorkerStatus.APPROVED
+
+            reserve = is_approved and (not was_approved or old_job_id != job_id)
+            release = was_approved and (not is_approved or old_job_id != job_id)
+
+            openings_changes = []
+            if reserve:
+                openings_changes.append((job_id, EventJob.reserve_opening))
+            if release:
+                openings_changes.append((old_job_id, EventJob.release_opening))
+            # Touch job rows in id order so two workers swapping jobs can't deadlock
+            for changed_job_id, change in sorted(openings_changes, key=lambda item: item[0]):
+                if change(changed_job_id) is None and change is EventJob.reserve_opening:
+                    raise ValueError("No openings available for this job.")
+
             if existing:
-                if is_already_approved and is_job_new:
-                    old_job = EventJob.query.get(existing.job_id)
-                    old_job.openings += 1
                 existing.job_id = job_id
                 existing.status = status.value
             else:
@@ -92,23 +112,108 @@ class EventUsers(db.Model):
                 )
                 db.session.add(new_entry)
 
-            # Decrement openings
-            if status == WorkerStatus.APPROVED and (not is_already_approved or is_job_new):
-                job = EventJob.query.get(job_id)
-                if job and job.openings > 0:
-
-                    # event.start_datetime is assumed available from your event record.
-                    from backend.models.event import Event
-                    event = Event.query.get(event_id)
-                    schedule_worker_reminders(event_id, worker_id, event.start_datetime)
-                    job.openings -= 1
-                    db.session.add(job)
-
             db.session.commit()
-        except SQLAlchemyError as e:
+        except (SQLAlchemyError, ValueError) as e:
             db.session.rollback()
             raise e
 
+        if openings_changes:
+            invalidate_feed_cache()
+        if reserve:
+            from backend.models.event import Event
+            event = db.session.get(Event, event_id)
+            # The event may have been deleted since the commit; it took its reminders with it
+            if event is not None:
+                schedule_worker_reminders(event_id, worker_id, event.start_datetime)
+        elif was_approved and not is_approved:
+            cancel_worker_reminders(event_id, [worker_id])
+
+    @staticmethod
+    def bulk_assign(event_id: int,
+                    assignments: List[Tuple[int, int, WorkerStatus]]) -> Tuple[List[int], List[int]]:
+        """
+        Applies many (worker_id, job_id, status) assignments for one event with set-based
+        statements: one locking read of the existing rows, one conditional UPDATE per affected
+        job for the net change in openings, one executemany UPDATE and one multi-row INSERT.
+        Returns (reserved, released): the ids of workers that took a new slot and of workers
+        that lost their approval. The caller commits (or rolls back).
+        Raises ValueError if a job doesn't have enough openings for all its approvals.
+        """
+        if not assignments:
+            return [], []
+        worker_ids = [worker_id for worker_id, _, _ in assignments]
+        existing_rows = {
+            row.worker_id: row
+            for row in EventUsers.query.filter(
+                EventUsers.event_id == event_id,
+                EventUsers.worker_id.in_(worker_ids)
+            ).with_for_update().all()
+        }
+
+        openings_delta = defaultdict(int)
+        reserved_worker_ids = []
+        released_worker_ids = []
+        updates = []
+        inserts = []
+        for worker_id, job_id, status in assignments:
+            existing = existing_rows.get(worker_id)
+            was_approved = existing is not None and WorkerStatus(existing.status) == WorkerStatus.APPROVED
+            old_job_id = existing.job_id if existing else None
+            is_approved = status == WorkerStatus.APPROVED
+
+            if is_approved and (not was_approved or old_job_id != job_id):
+                openings_delta[job_id] -= 1
+                reserved_worker_ids.append(worker_id)
+            if was_approved and (not is_approved or old_job_id != job_id):
+                openings_delta[old_job_id] += 1
+            if was_approved and not is_approved:
+                released_worker_ids.append(worker_id)
+
+            if existing:
+                updates.append({"event_id": event_id, "worker_id": worker_id, "job_id": job_id, "status": status})
+            else:
+                inserts.append({"event_id": event_id, "worker_id": worker_id, "job_id": job_id, "status": status,
+                                "approval_status": False, "approval_count": 0})
+
+        # Touch job rows in id order so concurrent bulk approvals can't deadlock
+        for job_id in sorted(openings_delta):
+            delta = openings_delta[job_id]
+            if delta < 0 and EventJob.reserve_opening(job_id, -delta) is None:
+                raise ValueError(f"Not enough openings for job {job_id} to approve {-delta} more workers.")
+            if delta > 0:
+                EventJob.release_opening(job_id, delta)
+
+        if updates:
+            db.session.execute(update(EventUsers), updates)
+        if inserts:
+            db.session.execute(insert(EventUsers), inserts)
+        return reserved_worker_ids, released_worker_ids
+
+    @staticmethod
+    def increment_approval_counts(pairs: List[Tuple[int, int]]) -> None:
+        """
+        Adds one to approval_count of each (event_id, worker_id) pair, once per occurrence,
+        with one UPDATE per distinct number of occurrences. The caller commits.
+        """
+        by_increment = defaultdict(list)
+        for pair, occurrences in Counter(pairs).items():
+            by_increment[occurrences].append(pair)
+        for increment, increment_pairs in by_increment.items():
+            db.session.execute(
+                update(EventUsers)
+                .where(tuple_(EventUsers.event_id, EventUsers.worker_id).in_(increment_pairs))
+                .values(approval_count=func.coalesce(EventUsers.approval_count, 0) + increment)
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def get_event_ids_by_worker(worker_id: int) -> Set[int]:
+        """
+        Returns the ids of all events the worker is signed up for, in any status.
+        """
+        rows = db.session.query(EventUsers.event_id).filter_by(worker_id=worker_id).all()
+        return {event_id for event_id, in rows}
+
     @staticmethod
     def get_workers_detailed(event_id: int) -> List[Dict]:
         """
@@ -1,23 +1,53 @@
 import datetime
-from typing import Optional
+from collections import Counter
+from typing import Optional, List, Dict, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, insert, tuple_, update
+from sqlalchemy.orm import Session, object_session
+
 from backend.db import db
+from backend.models.notification_dedup_key import NotificationDedupKey
+from backend.models.notification_partitions import create_initial_partitions
+from backend.redis.notification_stream import publish_notifications
+from backend.redis.unread_counter import adjust_unread_counts
+
+# Keys of session.info collecting changes to unread counts and created notifications until the session commits
+UNREAD_DELTAS = "unread_deltas"
+NEW_NOTIFICATIONS = "new_notifications"
+# Notifications older than this many days aren't listed, counted or marked read on behalf of users
+HOT_DAYS = 90
 
 
 class Notification(db.Model):
+    """
+    Partitioned by month of created_at (see notification_partitions), so the primary key
+    includes created_at. Queries on behalf of users only look at the last HOT_DAYS days.
+    """
     __tablename__ = "notifications"
+    __table_args__ = (
+        db.Index("ix_notifications_user_id_is_read_created_at", "user_id", "is_read", "created_at"),
+        db.Index("ix_notifications_dedup_key", "dedup_key"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id = db.Column(db.Integer, primary_key=True)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     message = db.Column(db.String(512), nullable=False)
     is_read = db.Column(db.Boolean, default=False)
     is_approved = db.Column(db.Boolean, default=True)
     event_id = db.Column(db.Integer, db.ForeignKey("events.id"), nullable=True)
+    # Identifies the notification of a scheduled reminder so a retried dispatch doesn't send it twice,
+    # unique through NotificationDedupKey
+    dedup_key = db.Column(db.String(128), nullable=True)
 
-    created_at = db.Column(db.DateTime, default=datetime.datetime.now(datetime.UTC))
+    # Callables, so each row gets the time it was written rather than the time the module was imported
+    created_at = db.Column(db.DateTime, primary_key=True, nullable=False,
+                           default=lambda: datetime.datetime.now(datetime.UTC))
     updated_at = db.Column(
         db.DateTime,
-        default=datetime.datetime.now(datetime.UTC),
-        onupdate=datetime.datetime.now(datetime.UTC),
+        default=lambda: datetime.datetime.now(datetime.UTC),
+        onupdate=lambda: datetime.datetime.now(datetime.UTC),
     )
 
     def __init__(self, user_id: int, message: str, event_id: Optional[int] = None, is_approved: bool = False):
@@ -47,29 +77,215 @@ class Notification(db.Model):
         notification.save_to_db()
         return notification
 
+    @classmethod
+    def bulk_create(cls, notifications: List[Dict]) -> List["Notification"]:
+        """
+        Inserts many notifications with a single INSERT ... RETURNING. The caller commits.
+        Each dict holds user_id and message, and optionally event_id and is_approved.
+        """
+        if not notifications:
+            return []
+        rows = [{"event_id": None, "is_approved": False, "is_read": False, **notification}
+                for notification in notifications]
+        created = list(db.session.scalars(insert(cls).returning(cls), rows))
+        track_new_notifications(db.session, created)
+        return created
+
+    @classmethod
+    def bulk_create_once(cls, notifications: List[Dict]) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Inserts the notifications whose dedup_key isn't taken yet: one INSERT ... ON CONFLICT DO NOTHING
+        claims the keys and one INSERT ... RETURNING creates the notifications of the new ones.
+        The caller commits. Each dict holds user_id, message and dedup_key, and optionally event_id
+        and is_approved. Returns the ids of the created notifications and of those that already
+        existed, by dedup_key.
+        """
+        if not notifications:
+            return {}, {}
+        rows = [{"event_id": None, "is_approved": False, "is_read": False, **notification}
+                for notification in notifications]
+        new_keys = NotificationDedupKey.claim([row["dedup_key"] for row in rows])
+        inserted = cls.bulk_create([row for row in rows if row["dedup_key"] in new_keys])
+        created = {notification.dedup_key: notification.id for notification in inserted}
+        existing = {}
+        missing = [row["dedup_key"] for row in rows if row["dedup_key"] not in created]
+        if missing:
+            existing = dict(db.session.execute(
+                db.select(cls.dedup_key, cls.id).where(cls.dedup_key.in_(missing))
+            ).all())
+        return created, existing
+
+    @staticmethod
+    def hot_since() -> datetime.datetime:
+        """
+        Start of the window of notifications shown to users. Filtering on it lets Postgres skip
+        the partitions of older months.
+        """
+        days = current_app.config.get("NOTIFICATION_HOT_DAYS", HOT_DAYS) if has_app_context() else HOT_DAYS
+        return datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=days)
+
     @classmethod
     def find_by_id(cls, notification_id: int) -> "Notification":
-        return cls.query.get(notification_id)
+        return cls.query.filter_by(id=notification_id).first()
 
+    @classmethod
+    def find_unapproved_with_context(cls, notification_ids: List[int]) -> List[Tuple["Notification", "Event", "User"]]:
+        """
+        Loads the unapproved notifications among `notification_ids` together with their
+        event and recipient in a single query.
+        """
+        from backend.models.event import Event
+        from backend.models.user import User
+        if not notification_ids:
+            return []
+        return (
+            db.session.query(cls, Event, User)
+            .join(Event, cls.event_id == Event.id)
+            .join(User, cls.user_id == User.id)
+            .filter(cls.id.in_(notification_ids), cls.is_approved.is_(False), cls.created_at >= cls.hot_since())
+            .order_by(cls.id)
+            .all()
+        )
 
     @classmethod
-    def mark_notification_as_read(cls, notification_ids: list, user_id: int) -> int:
+    def bulk_mark_read(cls, notification_ids: List[int]) -> None:
+        """
+        Marks the notifications as read with a single UPDATE. The caller commits.
+        """
+        if notification_ids:
+            cls._mark_read_where(cls.id.in_(notification_ids))
+
+    @classmethod
+    def _mark_read_where(cls, *conditions) -> int:
         """
-        Marks multiple notifications as read for a given user.
+        Marks the unread notifications matching `conditions` as read with a single UPDATE ... RETURNING
+        and returns how many there were. The caller commits.
         """
-        notifications = cls.query.filter(
-            cls.id.in_(notification_ids),
-            cls.user_id == user_id
+        user_ids = db.session.scalars(
+            update(cls).where(*conditions, cls.is_read.is_(False), cls.created_at >= cls.hot_since())
+            .values(is_read=True)
+            .returning(cls.user_id)
+            .execution_options(synchronize_session=False)
         ).all()
+        track_unread_changes(db.session, {user_id: -count for user_id, count in Counter(user_ids).items()})
+        return len(user_ids)
+
+    @classmethod
+    def get_unread_page(cls, user_id: int, limit: int,
+                        before: Optional[Tuple[datetime.datetime, int]] = None) -> List["Notification"]:
+        """
+        Returns the user's unread notifications newest first.
+        `before` is the (created_at, id) of the last notification of the previous page.
+        """
+        query = cls.query.filter(cls.user_id == user_id, cls.is_read.is_(False), cls.created_at >= cls.hot_since())
+        if before:
+            query = query.filter(tuple_(cls.created_at, cls.id) < before)
+        return query.order_by(cls.created_at.desc(), cls.id.desc()).limit(limit).all()
+
+    @classmethod
+    def find_for_user_after(cls, user_id: int, last_id: int, limit: int) -> List["Notification"]:
+        """
+        Returns up to `limit` notifications of the user with an id above `last_id`, oldest first.
+        """
+        return (
+            cls.query.filter(cls.user_id == user_id, cls.id > last_id, cls.created_at >= cls.hot_since())
+            .order_by(cls.id).limit(limit).all()
+        )
+
+    @classmethod
+    def count_unread(cls, user_id: int) -> int:
+        return db.session.scalar(
+            db.select(func.count()).select_from(cls)
+            .where(cls.user_id == user_id, cls.is_read.is_(False), cls.created_at >= cls.hot_since())
+        )
 
-        for notification in notifications:
-            notification.is_read = True
+    @classmethod
+    def count_unread_by_user(cls, user_ids: List[int]) -> Dict[int, int]:
+        """
+        Returns the number of unread notifications of each user that has any, in one query.
+        """
+        if not user_ids:
+            return {}
+        return dict(db.session.execute(
+            db.select(cls.user_id, func.count())
+            .where(cls.user_id.in_(user_ids), cls.is_read.is_(False), cls.created_at >= cls.hot_since())
+            .group_by(cls.user_id)
+        ).all())
 
+    @classmethod
+    def mark_notification_as_read(cls, notification_ids: list, user_id: int) -> int:
+        """
+        Marks the given notifications of the user as read with a single UPDATE.
+        Returns how many of them were unread.
+        """
+        return cls._commit_mark_read(cls.id.in_(notification_ids), cls.user_id == user_id)
+
+    @classmethod
+    def mark_all_read_up_to(cls, user_id: int, up_to_id: int) -> int:
+        """
+        Marks every notification of the user up to and including `up_to_id` as read with a single
+        UPDATE, so notifications that arrived after the client loaded its list stay unread.
+        Reminders still waiting for the user's approval are left alone. Returns how many were marked.
+        """
+        return cls._commit_mark_read(cls.user_id == user_id, cls.id <= up_to_id, cls.is_approved.is_(True))
+
+    @classmethod
+    def _commit_mark_read(cls, *conditions) -> int:
         try:
+            marked = cls._mark_read_where(*conditions)
             db.session.commit()
         except Exception as e:
             db.session.rollback()
             raise e
+        return marked
+
+
+event.listen(Notification.__table__, "after_create", create_initial_partitions)
+
+
+def track_new_notifications(session: Session, notifications: List[Notification]) -> None:
+    """
+    Counts the notifications as unread and queues them for the users' notification streams,
+    both once `session` commits.
+    """
+    if notifications:
+        session.info.setdefault(NEW_NOTIFICATIONS, []).extend(notification.to_dict() for notification in notifications)
+        track_unread_changes(session, Counter(notification.user_id for notification in notifications))
+
+
+def track_unread_changes(session: Session, deltas: Dict[int, int]) -> None:
+    """
+    Records {user_id: change} to users' unread counts, applied to their Redis counters once
+    `session` commits and dropped if it rolls back.
+    """
+    if deltas:
+        session.info.setdefault(UNREAD_DELTAS, Counter()).update(deltas)
+
+
+@event.listens_for(Notification, "after_insert")
+def _track_inserted(mapper, connection, notification):
+    # Notifications added through the session; bulk INSERTs are tracked by the methods issuing them
+    track_new_notifications(object_session(notification), [notification])
+
+
+@event.listens_for(Notification.is_read, "set", active_history=True)
+def _track_read_flag(notification, value, old_value, initiator):
+    # Only existing notifications; new ones are counted when they are created
+    session = object_session(notification)
+    if session is None or notification.id is None or bool(value) == bool(old_value):
+        return
+    track_unread_changes(session, {notification.user_id: -1 if value else 1})
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_changes(session):
+    deltas = session.info.pop(UNREAD_DELTAS, None)
+    if deltas:
+        adjust_unread_counts(deltas)
+    publish_notifications(session.info.pop(NEW_NOTIFICATIONS, []))
 
-        return len(notifications)
 
+@event.listens_for(Session, "after_rollback")
+def _drop_uncommitted_changes(session):
+    session.info.pop(UNREAD_DELTAS, None)
+    session.info.pop(NEW_NOTIFICATIONS, None)
@@ -0,0 +1,49 @@
+import datetime
+from typing import List, Set
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from backend.db import db
+
+
+class NotificationDedupKey(db.Model):
+    """
+    Dedup keys of sent notifications. The partitioned notifications table can't enforce a
+    unique key that doesn't include created_at, so uniqueness is enforced here.
+    """
+    __tablename__ = "notification_dedup_keys"
+
+    dedup_key = db.Column(db.String(128), primary_key=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.datetime.now(datetime.UTC))
+
+    @classmethod
+    def claim(cls, dedup_keys: List[str]) -> Set[str]:
+        """
+        Records the keys with a single INSERT ... ON CONFLICT DO NOTHING and returns those that
+        were new. A concurrent transaction claiming the same key waits for this one to finish.
+        The caller commits.
+        """
+        if not dedup_keys:
+            return set()
+        return set(db.session.scalars(
+            pg_insert(cls).values([{"dedup_key": key} for key in dedup_keys])
+            .on_conflict_do_nothing(index_elements=[cls.dedup_key])
+            .returning(cls.dedup_key)
+        ))
+
+    @classmethod
+    def find_taken(cls, dedup_keys: List[str]) -> Set[str]:
+        """
+        Returns the keys among `dedup_keys` that were already claimed.
+        """
+        if not dedup_keys:
+            return set()
+        return set(db.session.scalars(db.select(cls.dedup_key).where(cls.dedup_key.in_(dedup_keys))))
+
+    @classmethod
+    def delete_older_than(cls, cutoff: datetime.datetime) -> int:
+        """
+        Forgets keys whose notifications have been archived. The caller commits.
+        """
+        return db.session.execute(delete(cls).where(cls.created_at < cutoff)).rowcount
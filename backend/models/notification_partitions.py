@@ -0,0 +1,193 @@
+"""
+Monthly partitions of the notifications table.
+
+    python -m backend.models.notification_partitions archive    # create upcoming partitions and
+                                                                 # drop those past the retention period
+
+A notifications table created before partitioning is converted by the schema migrations.
+"""
+import argparse
+import datetime
+import logging
+from typing import Dict, List
+
+from flask import current_app, has_app_context
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from backend.db import db
+from backend.models.notification_dedup_key import NotificationDedupKey
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TABLE = "notifications"
+DEFAULT_PARTITION = f"{TABLE}_default"
+# Partitions are created this many months ahead, so inserts never land in the default partition
+MONTHS_AHEAD = 3
+# Partitions whose month ended more than this many months ago are dropped
+RETENTION_MONTHS = 12
+
+
+def month_start(moment: datetime.datetime) -> datetime.date:
+    return datetime.date(moment.year, moment.month, 1)
+
+
+def add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime.date) -> str:
+    return f"{TABLE}_{month.year:04d}_{month.month:02d}"
+
+
+def create_partitions(connection: Connection, first_month: datetime.date, months: int) -> List[str]:
+    """
+    Creates the monthly partitions from `first_month` on that don't exist yet and returns their names.
+    """
+    created = []
+    existing = set(list_partitions(connection))
+    for i in range(months):
+        month = add_months(first_month, i)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        connection.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        ))
+        created.append(name)
+    return created
+
+
+def list_partitions(connection: Connection) -> Dict[str, datetime.date]:
+    """
+    Returns the monthly partitions of the table with the month each one holds.
+    """
+    rows = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table"
+    ), {"table": TABLE}).scalars()
+    partitions = {}
+    for name in rows:
+        year, month = name[len(TABLE) + 1:].split("_") if name != DEFAULT_PARTITION else (None, None)
+        if year is not None:
+            partitions[name] = datetime.date(int(year), int(month), 1)
+    return partitions
+
+
+def create_initial_partitions(table, connection: Connection, **kwargs) -> None:
+    """
+    Listener of the table's after_create event. Rows outside every monthly partition go to
+    the default one rather than failing.
+    """
+    connection.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+    current = month_start(datetime.datetime.now(datetime.UTC))
+    create_partitions(connection, add_months(current, -1), MONTHS_AHEAD + 2)
+
+
+def _config(name: str, default: int) -> int:
+    return current_app.config.get(name, default) if has_app_context() else default
+
+
+def archive_notifications(now: datetime.datetime = None) -> Dict[str, List[str]]:
+    """
+    Creates the partitions of the coming months and drops those older than the retention period,
+    together with their dedup keys. Returns the names of the created and dropped partitions.
+    The unread counters only count notifications inside the hot window, which is far shorter
+    than the retention period, so dropping a partition leaves them as they are.
+    """
+    now = now or datetime.datetime.now(datetime.UTC)
+    current = month_start(now)
+    oldest_kept = add_months(current, -_config("NOTIFICATION_RETENTION_MONTHS", RETENTION_MONTHS))
+    try:
+        connection = db.session.connection()
+        created = create_partitions(connection, current, _config("NOTIFICATION_MONTHS_AHEAD", MONTHS_AHEAD) + 1)
+
+        dropped = []
+        for name, month in sorted(list_partitions(connection).items(), key=lambda item: item[1]):
+            if month >= oldest_kept:
+                continue
+            connection.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+            connection.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+        NotificationDedupKey.delete_older_than(datetime.datetime.combine(oldest_kept, datetime.time()))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    logger.info(f"Created partitions {created}, dropped partitions {dropped}")
+    return {"created": created, "dropped": dropped}
+
+
+def partition_existing_table(connection: Connection) -> int:
+    """
+    Replaces a notifications table created before partitioning with the partitioned one, copying
+    every row and dedup key. Returns the number of rows copied, or 0 if the table is already
+    partitioned or doesn't exist. Writes to notifications wait until it is done. The caller commits.
+    """
+    from backend.models.notification import Notification
+    legacy = f"{TABLE}_unpartitioned"
+    kind = connection.execute(text("SELECT relkind FROM pg_class WHERE relname = :table"),
+                              {"table": TABLE}).scalar()
+    if kind != "r":
+        return 0
+
+    connection.execute(text(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE"))
+    connection.execute(text(f"ALTER TABLE {TABLE} RENAME TO {legacy}"))
+    # Free the names of the indexes and the id sequence for the new table
+    for index in connection.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = :table"),
+                                    {"table": legacy}).scalars():
+        connection.execute(text(f"ALTER INDEX {index} RENAME TO {legacy}_{index}"))
+    connection.execute(text(f"ALTER SEQUENCE IF EXISTS {TABLE}_id_seq RENAME TO {legacy}_id_seq"))
+
+    NotificationDedupKey.__table__.create(connection, checkfirst=True)
+    Notification.__table__.create(connection)
+    oldest = connection.execute(text(f"SELECT min(created_at) FROM {legacy}")).scalar()
+    if oldest is not None:
+        first = month_start(oldest)
+        current = month_start(datetime.datetime.now(datetime.UTC))
+        months = (current.year - first.year) * 12 + current.month - first.month
+        create_partitions(connection, first, months)
+
+    # Tables created before some columns were added don't have them
+    legacy_columns = set(connection.execute(text(
+        "SELECT column_name FROM information_schema.columns WHERE table_name = :table"
+    ), {"table": legacy}).scalars())
+    columns = [column.name for column in Notification.__table__.columns if column.name in legacy_columns]
+    selected = ["coalesce(created_at, now())" if column == "created_at" else column for column in columns]
+    copied = connection.execute(text(
+        f"INSERT INTO {TABLE} ({', '.join(columns)}) SELECT {', '.join(selected)} FROM {legacy}"
+    )).rowcount
+    if "dedup_key" in legacy_columns:
+        connection.execute(text(
+            f"INSERT INTO {NotificationDedupKey.__tablename__} (dedup_key, created_at) "
+            f"SELECT dedup_key, coalesce(created_at, now()) FROM {legacy} WHERE dedup_key IS NOT NULL "
+            f"ON CONFLICT DO NOTHING"
+        ))
+    connection.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), coalesce(max(id), 0) + 1, false) FROM {TABLE}"
+    ))
+    connection.execute(text(f"DROP TABLE {legacy}"))
+    logger.info(f"Copied {copied} notifications into the partitioned table")
+    return copied
+
+
+def main():
+    from backend.core.app_factory import create_app
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("archive", help="create upcoming partitions and drop expired ones")
+    args = parser.parse_args()
+
+    with create_app().app_context():
+        if args.command == "archive":
+            archive_notifications()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,23 @@
-from typing import Optional
+from typing import Optional, List, Tuple
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import joinedload
 
 from backend.db import db
+from backend.redis.profile_cache import invalidate_profile_summary
 import datetime
 
 class Review(db.Model):
     __tablename__ = 'reviews'
+    __table_args__ = (
+        db.Index("ix_reviews_worker_id_timestamp_id", "worker_id", "timestamp", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     worker_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     commenter_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     review_text = db.Column(db.Text, nullable=False)
-    timestamp = db.Column(db.DateTime, default=datetime.datetime.now(datetime.UTC))
+    timestamp = db.Column(db.DateTime, default=lambda: datetime.datetime.now(datetime.UTC))
     event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
 
     # Relationships
@@ -49,6 +56,27 @@ class Review(db.Model):
         except Exception as e:
             db.session.rollback()
             raise e
+        invalidate_profile_summary(worker_id)
+
+    @classmethod
+    def get_page_for_worker(cls, worker_id: int, limit: int,
+                            before: Optional[Tuple[datetime.datetime, int]] = None) -> List["Review"]:
+        """
+        Returns the worker's reviews newest first, with commenter and event loaded in the same query.
+        `before` is the (timestamp, id) of the last review of the previous page.
+        """
+        try:
+            query = cls.query.options(joinedload(cls.commenter), joinedload(cls.event)).filter(cls.worker_id == worker_id)
+            if before:
+                query = query.filter(tuple_(cls.timestamp, cls.id) < before)
+            return query.order_by(cls.timestamp.desc(), cls.id.desc()).limit(limit).all()
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+    @classmethod
+    def count_for_worker(cls, worker_id: int) -> int:
+        return db.session.query(func.count(cls.id)).filter(cls.worker_id == worker_id).scalar()
 
 
 
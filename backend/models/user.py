@@ -1,17 +1,19 @@
 from sqlalchemy.orm import relationship
 import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, List, Set
 
-from sqlalchemy import Enum
+from sqlalchemy import Enum, insert, or_
 
 from backend.db import db
 from backend.models.reviews import Review
 from backend.models.roles import Role
+from backend.redis.profile_cache import invalidate_profile_summary
 from backend.utils.auth import check_password
 
 
 class User(db.Model):
     __tablename__ = 'users'
+    UNIQUE_FIELDS = ("username", "email", "personal_id")
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -30,7 +32,8 @@ class User(db.Model):
     phone_number = db.Column(db.String(20), nullable=True)
     first_name = db.Column(db.String(50), nullable=False)
     family_name = db.Column(db.String(50), nullable=False)
-    personal_id = db.Column(db.String(256), unique=True, nullable=False)
+    # Optional at signup; unique among the users that have one
+    personal_id = db.Column(db.String(256), unique=True, nullable=True)
     company_name = db.Column(db.String(50), nullable=True)
     company_id = db.Column(db.String(50), default="0")
     city = db.Column(db.String(100), nullable=True)
@@ -52,6 +55,7 @@ class User(db.Model):
                 setattr(self, key, value)
         self.updated_at = datetime.datetime.now(datetime.UTC)
         db.session.commit()
+        invalidate_profile_summary(self.id)
 
     def delete(self) -> None:
         db.session.delete(self)
@@ -70,6 +74,50 @@ class User(db.Model):
             print(e)
             raise e
 
+    @classmethod
+    def find_all_by(cls, filters: dict) -> List['User']:
+        try:
+            return cls.query.filter_by(**filters).order_by(cls.id).all()
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            raise e
+
+    @classmethod
+    def find_taken_values(cls, values: Dict[str, Iterable[str]]) -> Dict[str, Set[str]]:
+        """
+        Looks up candidate values of the unique fields (UNIQUE_FIELDS)
+        in a single query and returns, per field, the values already taken by some user.
+        """
+        candidates = {field: set(field_values) for field, field_values in values.items()}
+        taken = {field: set() for field in candidates}
+        clauses = [getattr(cls, field).in_(field_values) for field, field_values in candidates.items() if field_values]
+        if not clauses:
+            return taken
+        try:
+            rows = db.session.query(*(getattr(cls, field) for field in cls.UNIQUE_FIELDS)).filter(or_(*clauses)).all()
+        except Exception as e:
+            db.session.rollback()
+            raise e
+        for row in rows:
+            for field, field_values in candidates.items():
+                if getattr(row, field) in field_values:
+                    taken[field].add(getattr(row, field))
+        return taken
+
+    @classmethod
+    def bulk_create(cls, users: List[Dict]) -> None:
+        """
+        Inserts many users with one multi-row INSERT in a single transaction.
+        Raises IntegrityError (after rolling back) if any unique field is already taken.
+        """
+        try:
+            db.session.execute(insert(cls), users)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
     @classmethod
     def delete_by(cls, field: str, value: str) -> bool:
         try:
@@ -94,4 +142,5 @@ class User(db.Model):
         except Exception as e:
             db.session.rollback()
             raise e
+        invalidate_profile_summary(self.id)
 
@@ -0,0 +1,46 @@
+import json
+import logging
+from typing import Dict, List, Optional
+
+from redis.exceptions import RedisError
+
+from backend.redis.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+DIRECTORY_KEY_PREFIX = "company_hr_managers"
+DIRECTORY_TTL_SECONDS = 24 * 60 * 60
+
+
+def _directory_key(company_id: str) -> str:
+    return f"{DIRECTORY_KEY_PREFIX}:{company_id}"
+
+
+def get_cached_hr_managers(company_id: str) -> Optional[List[Dict]]:
+    """
+    Returns the cached HR managers ({id, name, phone}) of the company, or None on a miss.
+    An empty list means the company is known to have no HR manager.
+    """
+    try:
+        value = redis_client.get(_directory_key(company_id))
+    except RedisError as e:
+        logger.warning(f"Company directory unavailable: {e}")
+        return None
+    return json.loads(value) if value is not None else None
+
+
+def set_cached_hr_managers(company_id: str, hr_managers: List[Dict]) -> None:
+    try:
+        redis_client.set(_directory_key(company_id), json.dumps(hr_managers), ex=DIRECTORY_TTL_SECONDS)
+    except RedisError as e:
+        logger.warning(f"Failed to cache HR managers of company {company_id}: {e}")
+
+
+def invalidate_hr_managers(*company_ids: str) -> None:
+    keys = [_directory_key(company_id) for company_id in set(company_ids) if company_id is not None]
+    if not keys:
+        return
+    try:
+        redis_client.delete(*keys)
+    except RedisError as e:
+        logger.error(f"Failed to invalidate HR managers of companies {company_ids}: {e}")
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from backend.redis.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+FEED_CACHE_PREFIX = "feed_cache"
+FEED_VERSION_KEY = f"{FEED_CACHE_PREFIX}:version"
+FEED_STATS_KEY = f"{FEED_CACHE_PREFIX}:stats"
+FEED_CACHE_TTL_SECONDS = 60
+# Only the first events of the feed are cached; pages past them are read from the database
+FEED_CACHE_HEAD_SIZE = 200
+# How long one request may hold the right to rebuild an entry before another one can take it
+FEED_REBUILD_LOCK_SECONDS = 5
+# The only request args the feed is filtered by, and so the only ones in the cache key
+FEED_FILTERS = ("location", "job_title")
+
+# Reads the current version and the entry stored under it, and counts the hit or miss, in one round trip.
+_GET_FEED_SCRIPT = redis_client.register_script("""
+local version = redis.call('GET', KEYS[1]) or '0'
+local value = redis.call('GET', ARGV[1] .. ':' .. version .. ':' .. ARGV[2])
+if value then
+    redis.call('HINCRBY', KEYS[2], 'hits', 1)
+else
+    redis.call('HINCRBY', KEYS[2], 'misses', 1)
+end
+return {version, value}
+""")
+
+
+def feed_filters(args: Dict) -> Dict:
+    """
+    Keeps the recognized, non-empty feed filters out of the request args.
+    """
+    return {key: args[key] for key in FEED_FILTERS if args.get(key)}
+
+
+def _filters_digest(filters: Dict) -> str:
+    return hashlib.sha1(json.dumps(feed_filters(filters), sort_keys=True).encode()).hexdigest()
+
+
+def _feed_key(version: str, filters: Dict) -> str:
+    return f"{FEED_CACHE_PREFIX}:{version}:{_filters_digest(filters)}"
+
+
+def get_shared_feed(filters: Dict) -> Tuple[Optional[str], Optional[Dict]]:
+    """
+    Returns (version, head) for the cached head of the list of open future events matching the filters:
+    {"events": [...], "complete": bool}, where complete means there are no events after them.
+    head is None on a miss. version is None as well if Redis is unavailable, meaning
+    the result must not be cached.
+    """
+    try:
+        version, value = _GET_FEED_SCRIPT(keys=[FEED_VERSION_KEY, FEED_STATS_KEY],
+                                          args=[FEED_CACHE_PREFIX, _filters_digest(filters)])
+    except RedisError as e:
+        logger.warning(f"Feed cache unavailable: {e}")
+        return None, None
+    return version, json.loads(value) if value else None
+
+
+def acquire_feed_rebuild(version: str, filters: Dict) -> bool:
+    """
+    Returns True for the one request allowed to rebuild the entry of this version and filters,
+    so that a burst of misses after an invalidation runs the query once. The others read
+    their page from the database meanwhile.
+    """
+    try:
+        return bool(redis_client.set(f"{_feed_key(version, filters)}:rebuild", 1, nx=True,
+                                     ex=FEED_REBUILD_LOCK_SECONDS))
+    except RedisError as e:
+        logger.warning(f"Failed to lock feed rebuild: {e}")
+        return False
+
+
+def set_shared_feed(version: str, filters: Dict, events: List[Dict], complete: bool) -> None:
+    """
+    Stores the head of the shared feed under the version it was read with. If the cache was
+    invalidated in the meantime the entry is written under a stale version and never read.
+    """
+    try:
+        redis_client.set(_feed_key(version, filters), json.dumps({"events": events, "complete": complete}),
+                         ex=FEED_CACHE_TTL_SECONDS)
+    except RedisError as e:
+        logger.warning(f"Failed to cache feed: {e}")
+
+
+def invalidate_feed_cache() -> None:
+    """
+    Invalidates every cached feed by bumping the version; old entries expire on their own.
+    """
+    try:
+        redis_client.incr(FEED_VERSION_KEY)
+    except RedisError as e:
+        logger.error(f"Failed to invalidate feed cache: {e}")
+
+
+def get_feed_cache_stats() -> Dict:
+    stats = redis_client.hgetall(FEED_STATS_KEY)
+    hits = int(stats.get("hits", 0))
+    misses = int(stats.get("misses", 0))
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+    }
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Dict, List, Tuple
+
+from flask import current_app, has_app_context
+from redis.exceptions import RedisError
+
+from backend.redis.notification_scheduler import (
+    CLAIM_TIMEOUT_SECONDS, HR_DIGESTS_DUE_KEY, HR_DIGESTS_PROCESSING_KEY, WAKEUP_KEY, claim_due,
+)
+from backend.redis.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# List of the applications to one event waiting to be sent to one HR manager as a digest
+DIGEST_BUFFER_PREFIX = "hr_digests:buffer"
+# Applications are collected for this long after the first one before the digest is sent
+DIGEST_WINDOW_SECONDS = 5 * 60
+# Buffers outlive their window by this long, in case they are never flushed
+DIGEST_BUFFER_GRACE_SECONDS = 24 * 3600
+MAX_MESSAGE_LENGTH = 512
+
+
+def digest_window_seconds() -> int:
+    """
+    The digest window; 0 means HR managers are notified of every application right away.
+    """
+    if has_app_context():
+        return current_app.config.get("HR_DIGEST_WINDOW_SECONDS", DIGEST_WINDOW_SECONDS)
+    return DIGEST_WINDOW_SECONDS
+
+
+def application_message(event_name: str, applicants: List[Dict]) -> str:
+    """
+    The notification telling an HR manager about applications ({name, city, age}) to an event.
+    """
+    if len(applicants) == 1:
+        applicant = applicants[0]
+        return f"{applicant['name']}, from {applicant['city']}, age {applicant['age']}, requests to join {event_name}."
+
+    header = f"{len(applicants)} workers request to join {event_name}: "
+    listed = []
+    for i, applicant in enumerate(applicants):
+        entry = f"{applicant['name']} ({applicant['city']}, {applicant['age']})"
+        rest = len(applicants) - i - 1
+        more = f" and {rest} more." if rest else "."
+        if len(header) + len(", ".join(listed + [entry])) + len(more) > MAX_MESSAGE_LENGTH:
+            return header + ", ".join(listed) + f" and {len(applicants) - i} more."
+        listed.append(entry)
+    return header + ", ".join(listed) + "."
+
+
+def buffer_application(hr_manager_ids: List[int], event_id: int, applicant: Dict) -> bool:
+    """
+    Adds an application ({name, city, age}) to the digests of the HR managers for the event,
+    with an id that tells it apart from later applications of the same worker.
+    A digest is due one window after its first application. Returns False if Redis is
+    unavailable, in which case the caller should notify the HR managers directly.
+    """
+    window = digest_window_seconds()
+    flush_at = time.time() + window
+    entry = json.dumps({**applicant, "id": uuid.uuid4().hex})
+    try:
+        pipeline = redis_client.pipeline()
+        for hr_manager_id in hr_manager_ids:
+            key = _buffer_key(hr_manager_id, event_id)
+            pipeline.rpush(key, entry)
+            pipeline.expire(key, window + DIGEST_BUFFER_GRACE_SECONDS)
+            pipeline.zadd(HR_DIGESTS_DUE_KEY, {f"{hr_manager_id}:{event_id}": flush_at}, nx=True)
+        # Let the scheduler recompute how long to sleep
+        pipeline.delete(WAKEUP_KEY)
+        pipeline.rpush(WAKEUP_KEY, "1")
+        pipeline.execute()
+        return True
+    except RedisError as e:
+        logger.error(f"Failed to buffer application to event {event_id}: {e}")
+        return False
+
+
+def claim_due_digests(now: float, limit: int,
+                      claim_timeout: int = CLAIM_TIMEOUT_SECONDS) -> List[Tuple[int, int, List[Dict]]]:
+    """
+    Atomically claims up to `limit` digests whose window closed, like claim_due_reminders, and
+    returns them as (hr_manager_id, event_id, applicants). Acknowledge them with ack_digests.
+    """
+    members = [member for member, _ in
+               claim_due(HR_DIGESTS_DUE_KEY, HR_DIGESTS_PROCESSING_KEY, now, limit, claim_timeout)]
+    if not members:
+        return []
+    pipeline = redis_client.pipeline(transaction=False)
+    digests = []
+    for member in members:
+        hr_manager_id, event_id = (int(part) for part in member.split(":"))
+        digests.append((hr_manager_id, event_id))
+        pipeline.lrange(_buffer_key(hr_manager_id, event_id), 0, -1)
+    return [(hr_manager_id, event_id, [json.loads(applicant) for applicant in applicants])
+            for (hr_manager_id, event_id), applicants in zip(digests, pipeline.execute())]
+
+
+def ack_digests(digests: List[Tuple[int, int, int]]) -> None:
+    """
+    Removes the first `count` applications of each sent (hr_manager_id, event_id, count) digest
+    and its claim. Applications buffered while it was being sent stay for the next digest.
+    """
+    if not digests:
+        return
+    pipeline = redis_client.pipeline()
+    for hr_manager_id, event_id, count in digests:
+        pipeline.ltrim(_buffer_key(hr_manager_id, event_id), count, -1)
+        pipeline.zrem(HR_DIGESTS_PROCESSING_KEY, f"{hr_manager_id}:{event_id}")
+    pipeline.execute()
+
+
+def digest_dedup_keys(hr_manager_id: int, event_id: int, applicants: List[Dict]) -> List[str]:
+    """
+    The dedup keys a digest of the first 1, 2, ... len(applicants) buffered applications would have.
+    A digest claimed again because its acknowledgement failed still starts with the applications
+    that were sent, so whichever of these keys is taken tells how many of them went out.
+    """
+    if not applicants:
+        return []
+    first = applicants[0].get("id") or hashlib.sha1(json.dumps(applicants[0], sort_keys=True).encode()).hexdigest()
+    return [f"hr_digest:{hr_manager_id}:{event_id}:{first}:{count}" for count in range(1, len(applicants) + 1)]
+
+
+def _buffer_key(hr_manager_id: int, event_id: int) -> str:
+    return f"{DIGEST_BUFFER_PREFIX}:{hr_manager_id}:{event_id}"
@@ -0,0 +1,123 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+from redis.exceptions import RedisError
+
+from backend.redis.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+LEADER_KEY_PREFIX = "leader"
+LEASE_TTL_MS = 10_000
+
+# Extends the lease only if this instance still holds it
+_renew_script = redis_client.register_script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+""")
+
+# Gives the lease up only if this instance still holds it
+_release_script = redis_client.register_script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+""")
+
+
+class LeaderLease:
+    """
+    A lease in Redis that at most one instance holds at a time, used to elect the single
+    active instance of a role (e.g. the reminder scheduler) across processes and nodes.
+
+    maintain() keeps trying to take the lease and renews it while held, every third of its TTL.
+    If the leader dies, its lease expires and another instance takes over within one TTL plus
+    one renew interval. An instance treats itself as leader only until the end of its last
+    successful renewal, so it steps down before anyone else can take over, even if Redis is
+    unreachable.
+    """
+
+    def __init__(self, name: str, ttl_ms: int = LEASE_TTL_MS):
+        self.key = f"{LEADER_KEY_PREFIX}:{name}"
+        self.ttl_ms = ttl_ms
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        self._valid_until = 0.0
+        self._stop = threading.Event()
+
+    @property
+    def renew_interval(self) -> float:
+        return self.ttl_ms / 3000
+
+    def is_leader(self) -> bool:
+        return time.monotonic() < self._valid_until
+
+    def try_acquire(self) -> bool:
+        """
+        Takes the lease if it is free, or renews it if this instance already holds it.
+        """
+        started = time.monotonic()
+        try:
+            held = bool(_renew_script(keys=[self.key], args=[self.owner, self.ttl_ms])) or \
+                bool(redis_client.set(self.key, self.owner, nx=True, px=self.ttl_ms))
+        except RedisError as e:
+            logger.warning(f"Could not reach Redis for lease {self.key}: {e}")
+            held = False
+        if held:
+            if not self.is_leader():
+                logger.info(f"{self.owner} became leader of {self.key}")
+            # Measured from before the call, so the local view never outlives the lease in Redis
+            self._valid_until = started + self.ttl_ms / 1000
+        elif self.is_leader():
+            logger.warning(f"{self.owner} lost leadership of {self.key}")
+            self._valid_until = 0.0
+        return held
+
+    def release(self) -> None:
+        self._valid_until = 0.0
+        try:
+            _release_script(keys=[self.key], args=[self.owner])
+        except RedisError as e:
+            logger.warning(f"Could not release lease {self.key}: {e}")
+
+    def maintain(self) -> None:
+        """
+        Acquires and renews the lease until stop() is called, then releases it so another
+        instance can take over without waiting for it to expire.
+        """
+        while not self._stop.is_set():
+            self.try_acquire()
+            self._stop.wait(self.renew_interval)
+        self.release()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+
+def run_as_leader(lease: LeaderLease, work: Callable[[Callable[[], bool]], None],
+                  poll_interval: Optional[float] = None) -> None:
+    """
+    Maintains `lease` in a background thread and runs `work` whenever this instance is the leader.
+    `work` receives a should_run callable and must return soon after it turns False.
+    """
+    poll_interval = poll_interval or lease.renew_interval
+    maintainer = threading.Thread(target=lease.maintain, name=f"{lease.key}-lease", daemon=True)
+    maintainer.start()
+    try:
+        while not lease.stopped():
+            if lease.is_leader():
+                work(lambda: lease.is_leader() and not lease.stopped())
+            else:
+                time.sleep(poll_interval)
+    finally:
+        lease.stop()
+        maintainer.join()
@@ -0,0 +1,101 @@
+"""
+Maintenance commands for the Redis data of the reminder pipeline.
+
+    python -m backend.redis.maintenance clear-reminders          # show what would be deleted
+    python -m backend.redis.maintenance clear-reminders --yes    # delete every pending reminder
+    python -m backend.redis.maintenance migrate-reminders        # move reminders of the old single
+                                                                 # event_reminders zset into buckets
+"""
+import argparse
+import logging
+from collections import defaultdict
+from typing import List
+
+from backend.redis.notification_scheduler import (
+    APPROVAL_CHECKS_KEY, APPROVAL_PROCESSING_KEY, BUCKET_PREFIX, BUCKET_REGISTRY_KEY, EVENT_INDEX_PREFIX,
+    LEGACY_REMINDERS_KEY, PROCESSING_KEY, WAKEUP_KEY, parse_reminder, reminder_member, _replace_reminders,
+)
+from backend.redis.redis_client import redis_client
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MIGRATION_BATCH_SIZE = 1000
+
+
+def reminder_keys() -> List[str]:
+    keys = [key for key in (LEGACY_REMINDERS_KEY, BUCKET_REGISTRY_KEY, PROCESSING_KEY, APPROVAL_CHECKS_KEY,
+                            APPROVAL_PROCESSING_KEY, WAKEUP_KEY)
+            if redis_client.exists(key)]
+    for prefix in (BUCKET_PREFIX, EVENT_INDEX_PREFIX):
+        keys.extend(redis_client.scan_iter(match=f"{prefix}:*", count=1000))
+    return keys
+
+
+def clear_reminders(confirm: bool) -> int:
+    """
+    Deletes all pending and claimed reminders with their indexes and pending approval checks.
+    Without `confirm`, only reports them.
+    """
+    keys = reminder_keys()
+    pipeline = redis_client.pipeline(transaction=False)
+    for key in keys:
+        if key == LEGACY_REMINDERS_KEY or key == PROCESSING_KEY or key.startswith(f"{BUCKET_PREFIX}:"):
+            pipeline.zcard(key)
+    pending = sum(pipeline.execute())
+    if not confirm:
+        logger.info(f"Would delete {pending} reminders in {len(keys)} keys, pass --yes to delete them")
+        return 0
+    for start in range(0, len(keys), 1000):
+        redis_client.delete(*keys[start:start + 1000])
+    logger.info(f"Deleted {pending} reminders in {len(keys)} keys")
+    return pending
+
+
+def migrate_reminders() -> int:
+    """
+    Moves the reminders of the single event_reminders zset into time buckets, converting JSON
+    members to the compact format on the way. Safe to run while the application is up.
+    """
+    # Event indexes used to be sets of members; they are rebuilt as hashes below
+    for key in redis_client.scan_iter(match=f"{EVENT_INDEX_PREFIX}:*", count=1000):
+        if redis_client.type(key) == "set":
+            redis_client.delete(key)
+
+    migrated = 0
+    while True:
+        entries = redis_client.zrange(LEGACY_REMINDERS_KEY, 0, MIGRATION_BATCH_SIZE - 1, withscores=True)
+        if not entries:
+            break
+        by_event = defaultdict(dict)
+        for member, score in entries:
+            try:
+                event_id, worker_id, label = parse_reminder(member)
+            except (ValueError, KeyError):
+                logger.warning(f"Dropping malformed reminder: {member}")
+                continue
+            by_event[event_id][reminder_member(event_id, worker_id, label)] = score
+        for event_id, reminders in by_event.items():
+            _replace_reminders(event_id, [], reminders)
+        redis_client.zrem(LEGACY_REMINDERS_KEY, *[member for member, _ in entries])
+        migrated += len(entries)
+    logger.info(f"Migrated {migrated} reminders into buckets")
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    clear = commands.add_parser("clear-reminders", help="delete every pending reminder")
+    clear.add_argument("--yes", action="store_true", help="actually delete them")
+    commands.add_parser("migrate-reminders", help="move reminders of the old single zset into time buckets")
+    args = parser.parse_args()
+
+    if args.command == "clear-reminders":
+        clear_reminders(args.yes)
+    elif args.command == "migrate-reminders":
+        migrate_reminders()
+
+
+if __name__ == "__main__":
+    main()
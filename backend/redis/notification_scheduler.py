@@ -2,14 +2,299 @@ import datetime
 import json
 import time
 import logging
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app, has_app_context
 
-from backend.stores.notification_store import NotificationStore
 from backend.redis.redis_client import redis_client
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pending reminders are sharded by due time into bucket zsets named <prefix>:<bucket start timestamp>
+BUCKET_PREFIX = "event_reminders:bucket"
+# Zset of the bucket keys that may hold reminders, scored by the bucket's start timestamp
+BUCKET_REGISTRY_KEY = "event_reminders:buckets"
+# Width of a bucket, overridable with the REMINDER_BUCKET_SECONDS app config
+BUCKET_SECONDS = 3600
+# The single zset that held every reminder before they were bucketed, see `maintenance migrate-reminders`
+LEGACY_REMINDERS_KEY = "event_reminders"
+# Reminders claimed by a dispatcher, scored by when the claim expires
+PROCESSING_KEY = "event_reminders:processing"
+# A claimed reminder that isn't acknowledged within this long is handed out again
+CLAIM_TIMEOUT_SECONDS = 5 * 60
+# Notifications whose approval deadline is pending, scored by the deadline
+APPROVAL_CHECKS_KEY = "approval_checks"
+# Approval checks claimed by a sweep, scored by when the claim expires
+APPROVAL_PROCESSING_KEY = "approval_checks:processing"
+# HR digests waiting for their window to close, "<hr_manager_id>:<event_id>" scored by when to send them
+HR_DIGESTS_DUE_KEY = "hr_digests:due"
+# HR digests claimed by a flush, scored by when the claim expires
+HR_DIGESTS_PROCESSING_KEY = "hr_digests:processing"
+# List pushed to when a reminder due before all others is added, waking the scheduler early
+WAKEUP_KEY = "event_reminders:wakeup"
+# Hash of dispatch lag statistics: count, total and max seconds between due time and delivery
+LAG_STATS_KEY = "event_reminders:lag_stats"
+# Upper bounds, in seconds, of the lag histogram buckets
+LAG_BUCKETS = (1, 5, 30, 60, 300)
+# Hash of the reminders of one event, mapping each member to the bucket key holding it
+EVENT_INDEX_PREFIX = "event_reminders:event"
+# Buckets and indexes outlive their last reminder by this long, in case it is never dispatched
+EVENT_INDEX_GRACE_SECONDS = 24 * 3600
+
+# Shared by the scripts working on buckets. KEYS[1] is the bucket registry, KEYS[2] the processing zset,
+# ARGV[1] the bucket width, ARGV[2] the bucket key prefix and ARGV[3] the grace period.
+# Bucket keys are derived from scores inside the scripts, which is fine on a single Redis node.
+# An emptied bucket zset disappears on its own; one that is never drained expires after its grace period.
+_BUCKETS_LUA = """
+local registry = KEYS[1]
+local processing = KEYS[2]
+local bucket_seconds = tonumber(ARGV[1])
+local bucket_prefix = ARGV[2]
+local grace = tonumber(ARGV[3])
+
+local function add_to_bucket(score, member)
+    local start = math.floor(score / bucket_seconds) * bucket_seconds
+    local key = bucket_prefix .. ':' .. string.format('%d', start)
+    redis.call('ZADD', key, score, member)
+    redis.call('ZADD', registry, start, key)
+    redis.call('EXPIREAT', key, start + bucket_seconds + grace)
+    return key
+end
+
+-- The score of the earliest pending reminder as a string, dropping empty buckets from the registry
+local function earliest_due()
+    while true do
+        local bucket = redis.call('ZRANGE', registry, 0, 0)[1]
+        if not bucket then return nil end
+        local first = redis.call('ZRANGE', bucket, 0, 0, 'WITHSCORES')
+        if first[2] then return first[2] end
+        redis.call('ZREM', registry, bucket)
+    end
+end
+
+local function extend_expiry(key, expire_at)
+    local ttl = redis.call('TTL', key)
+    local now = tonumber(redis.call('TIME')[1])
+    if ttl < 0 or now + ttl < expire_at then
+        redis.call('EXPIREAT', key, expire_at)
+    end
+end
+"""
+
+# KEYS[3] is the wakeup list, KEYS[4] the index of the event.
+# ARGV[4] is a count n, followed by n members to remove and then (score, member) pairs to add.
+# Removes the old reminders, claimed or not, and adds and indexes the new ones, atomically.
+# Pushes to the wakeup list if a new reminder is due before everything already pending.
+_replace_reminders_script = redis_client.register_script(_BUCKETS_LUA + """
+local earliest = tonumber(earliest_due() or math.huge)
+local stale_count = tonumber(ARGV[4])
+local removed = 0
+for i = 5, 4 + stale_count do
+    local bucket = redis.call('HGET', KEYS[4], ARGV[i])
+    if bucket then
+        removed = removed + redis.call('ZREM', bucket, ARGV[i])
+        redis.call('HDEL', KEYS[4], ARGV[i])
+    end
+    redis.call('ZREM', processing, ARGV[i])
+end
+
+local last_score = 0
+local wake = false
+for i = 5 + stale_count, #ARGV, 2 do
+    local score = tonumber(ARGV[i])
+    redis.call('HSET', KEYS[4], ARGV[i + 1], add_to_bucket(score, ARGV[i + 1]))
+    if score > last_score then last_score = score end
+    if score < earliest then wake = true end
+end
+if last_score > 0 then
+    -- Only ever extend the event index, other workers' reminders may be due later
+    extend_expiry(KEYS[4], math.ceil(last_score) + grace)
+end
+if wake then
+    redis.call('DEL', KEYS[3])
+    redis.call('RPUSH', KEYS[3], '1')
+end
+return removed
+""")
+
+# ARGV[4] is now, ARGV[5] the batch size, ARGV[6] when the new claims expire, ARGV[7] the event index prefix.
+# Expired claims go back into the bucket of now, then the earliest due reminders of the current and
+# past buckets are moved to the processing zset and returned with the score they were due at.
+_claim_due_reminders_script = redis_client.register_script(_BUCKETS_LUA + """
+local now = tonumber(ARGV[4])
+local expired = redis.call('ZRANGEBYSCORE', processing, '-inf', now)
+for i = 1, #expired do
+    redis.call('ZREM', processing, expired[i])
+    local bucket = add_to_bucket(now, expired[i])
+    local event_id = string.match(expired[i], '^(%-?%d+):')
+    if event_id then
+        redis.call('HSET', ARGV[7] .. ':' .. event_id, expired[i], bucket)
+    end
+end
+
+local remaining = tonumber(ARGV[5])
+local claimed = {}
+local buckets = redis.call('ZRANGEBYSCORE', registry, '-inf', now)
+for i = 1, #buckets do
+    if remaining <= 0 then break end
+    local due = redis.call('ZRANGEBYSCORE', buckets[i], '-inf', now, 'WITHSCORES', 'LIMIT', 0, remaining)
+    for j = 1, #due, 2 do
+        redis.call('ZREM', buckets[i], due[j])
+        redis.call('ZADD', processing, ARGV[6], due[j])
+        claimed[#claimed + 1] = due[j]
+        claimed[#claimed + 1] = due[j + 1]
+        remaining = remaining - 1
+    end
+    if redis.call('ZCARD', buckets[i]) == 0 then
+        redis.call('ZREM', registry, buckets[i])
+    end
+end
+return claimed
+""")
+
+# Returns the score of the earliest pending reminder, or nil.
+_next_due_script = redis_client.register_script(_BUCKETS_LUA + """
+return earliest_due()
+""")
+
+# KEYS[3] is the wakeup list, KEYS[4] the index of the event. ARGV[4] is the number of seconds to shift by.
+# Moves every pending reminder of the event by the same amount; claimed ones are already being sent.
+_shift_event_script = redis_client.register_script(_BUCKETS_LUA + """
+local entries = redis.call('HGETALL', KEYS[4])
+local delta = tonumber(ARGV[4])
+local last_score = 0
+local shifted = 0
+for i = 1, #entries, 2 do
+    local member, bucket = entries[i], entries[i + 1]
+    local score = redis.call('ZSCORE', bucket, member)
+    if score then
+        local new_score = tonumber(score) + delta
+        redis.call('ZREM', bucket, member)
+        redis.call('HSET', KEYS[4], member, add_to_bucket(new_score, member))
+        if new_score > last_score then last_score = new_score end
+        shifted = shifted + 1
+    end
+end
+if shifted > 0 then
+    redis.call('EXPIREAT', KEYS[4], math.ceil(last_score) + grace)
+    if delta < 0 then
+        redis.call('DEL', KEYS[3])
+        redis.call('RPUSH', KEYS[3], '1')
+    end
+end
+return shifted
+""")
+
+# KEYS[3] is the index of the event. ARGV[4], if given, is the only member to remove.
+# Removes the reminders of the event, pending or claimed, from their buckets and the index.
+_remove_event_reminders_script = redis_client.register_script(_BUCKETS_LUA + """
+local entries
+if ARGV[4] then
+    entries = {ARGV[4], redis.call('HGET', KEYS[3], ARGV[4])}
+else
+    entries = redis.call('HGETALL', KEYS[3])
+end
+local removed = 0
+for i = 1, #entries, 2 do
+    if entries[i + 1] then
+        removed = removed + redis.call('ZREM', entries[i + 1], entries[i])
+    end
+    removed = removed + redis.call('ZREM', processing, entries[i])
+    redis.call('HDEL', KEYS[3], entries[i])
+end
+return removed
+""")
+
+# KEYS[1] is a zset of due times, KEYS[2] its processing zset.
+# ARGV[1] is now, ARGV[2] the batch size, ARGV[3] when the new claims expire.
+# Expired claims go back as due now, then the earliest due entries are moved to the processing zset
+# and returned with the score they were due at.
+_claim_due_script = redis_client.register_script("""
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for i = 1, #expired do
+    redis.call('ZADD', KEYS[1], ARGV[1], expired[i])
+    redis.call('ZREM', KEYS[2], expired[i])
+end
+
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, tonumber(ARGV[2]))
+for i = 1, #due, 2 do
+    redis.call('ZREM', KEYS[1], due[i])
+    redis.call('ZADD', KEYS[2], ARGV[3], due[i])
+end
+return due
+""")
+
+# Sets field ARGV[1] of hash KEYS[1] to ARGV[2] if that is larger than its current value
+_record_max_script = redis_client.register_script("""
+local current = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or '0')
+if tonumber(ARGV[2]) > current then
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+end
+""")
+
+
+# Reminders sent before an event, in terms of seconds before the event starts
+REMINDERS = [
+    {
+        "label": "27_hours_before",
+        "seconds_before": 27 * 3600,  # 27 hours in seconds
+        "check_delay": 3 * 3600  # 3 hours in seconds
+    },
+    {
+        "label": "1_hour_before",
+        "seconds_before": 1 * 3600,  # 1 hour in seconds
+        "check_delay": 20 * 60  # 20 minutes in seconds
+    }
+]
+REMINDERS_BY_LABEL = {reminder["label"]: reminder for reminder in REMINDERS}
+
+
+def reminder_member(event_id: int, worker_id: int, label: str) -> str:
+    """
+    The event_reminders member of a reminder. Members only hold ids; the message is rendered when it is sent.
+    """
+    return f"{event_id}:{worker_id}:{label}"
+
+
+def parse_reminder(member: str) -> Tuple[int, int, str]:
+    """
+    Returns (event_id, worker_id, label) of a member. JSON members written before the
+    compact format are still understood.
+    """
+    if member.startswith("{"):
+        data = json.loads(member)
+        return data["event_id"], data["worker_id"], data["label"]
+    event_id, worker_id, label = member.split(":", 2)
+    return int(event_id), int(worker_id), label
+
+
+def reminder_message(label: str, event_name: str) -> str:
+    return f"Reminder ({label}): Please confirm your attendance for event: {event_name} ."
+
+
+def reminder_dedup_key(event_id: int, worker_id: int, label: str, start_time: datetime.datetime) -> str:
+    """
+    Identifies the notification sent for a reminder of an event starting at `start_time`.
+    """
+    return f"reminder:{reminder_member(event_id, worker_id, label)}:{int(_event_timestamp(start_time))}"
+
+
+def approval_check_dedup_key(notification_id: int) -> str:
+    """
+    Identifies the handling of the approval deadline of a reminder notification.
+    """
+    return f"approval_check:{notification_id}"
+
+
+def _event_timestamp(start_time: datetime.datetime) -> float:
+    # Convert datetime to timestamp, treating naive datetimes as local time (Israel, UTC+3)
+    if start_time.tzinfo is not None:
+        return start_time.timestamp()
+    israel_tz = datetime.timezone(datetime.timedelta(hours=3))
+    return start_time.replace(tzinfo=israel_tz).timestamp()
+
 
 def schedule_worker_reminders(event_id: int, worker_id: int, start_time: datetime.datetime):
     """
@@ -20,99 +305,252 @@ def schedule_worker_reminders(event_id: int, worker_id: int, start_time: datetim
         worker_id: The ID of the worker
         start_time: The start time of the event
     """
-    # Convert datetime to timestamp, treating naive datetimes as local time (Israel, UTC+2)
-    if start_time.tzinfo is not None:
-        event_timestamp = start_time.timestamp()
-    else:
-        # If no timezone, treat as local time (Israel, UTC+3)
-        israel_tz = datetime.timezone(datetime.timedelta(hours=3))
-        event_timestamp = start_time.replace(tzinfo=israel_tz).timestamp()
+    schedule_reminders_for_workers(event_id, [worker_id], start_time)
+
+
+def schedule_reminders_for_workers(event_id: int, worker_ids: List[int], start_time: datetime.datetime):
+    """
+    Schedule reminder notifications for several workers of the same event,
+    replacing reminders they already have for it. Members are built from ids alone,
+    so nothing is loaded from the database, and all of them are written in one script call.
 
-    # Get current timestamp
+    Args:
+        event_id: The ID of the event
+        worker_ids: The IDs of the workers
+        start_time: The start time of the event
+    """
+    if not worker_ids:
+        return
+    event_timestamp = _event_timestamp(start_time)
     current_timestamp = time.time()
 
-    # Log in terms of timestamps and human-readable time
-    logger.info(f"Scheduling reminders for event {event_id}, worker {worker_id}")
+    logger.info(f"Scheduling reminders for event {event_id}, {len(worker_ids)} workers")
     logger.info(f"Event timestamp: {event_timestamp}, time: {time.ctime(event_timestamp)}")
-    logger.info(f"Current timestamp: {current_timestamp}, time: {time.ctime(current_timestamp)}")
     logger.info(f"Time to event: {(event_timestamp - current_timestamp) / 3600:.2f} hours")
 
-    # Define reminders in terms of seconds before event
-    reminders = [
-        {
-            "label": "27_hours_before",
-            "seconds_before": 27 * 3600,  # 27 hours in seconds
-            "check_delay": 3 * 3600  # 3 hours in seconds
-        },
-        {
-            "label": "1_hour_before",
-            "seconds_before": 1 * 3600,  # 1 hour in seconds
-            "check_delay": 20 * 60  # 20 minutes in seconds
-        }
-    ]
-
-    # Before adding new reminders, check and remove any existing ones for this event/worker
-    all_reminders = redis_client.zrange("event_reminders", 0, -1)
-    for reminder_bytes in all_reminders:
-        try:
-            reminder_data = json.loads(reminder_bytes)
-            if (reminder_data.get("event_id") == event_id and
-                    reminder_data.get("worker_id") == worker_id):
-                redis_client.zrem("event_reminders", reminder_bytes)
-                logger.info(f"Removed existing reminder for event {event_id}, worker {worker_id}")
-        except Exception as e:
-            logger.warning(f"Error processing existing reminder: {e}")
-
-    for reminder in reminders:
+    new_reminders = {}
+    for reminder in REMINDERS:
         # Calculate reminder time based on event time
         reminder_timestamp = event_timestamp - reminder["seconds_before"]
 
-        # Log in terms of timestamps and human-readable time
-        logger.info(f"Reminder {reminder['label']} timestamp: {reminder_timestamp}")
-        logger.info(f"Reminder time: {time.ctime(reminder_timestamp)}")
-
-        # Calculate time difference from now
-        time_diff_seconds = reminder_timestamp - current_timestamp
-        logger.info(f"Time until this reminder: {time_diff_seconds / 60:.2f} minutes")
-
         # Don't schedule past reminders
-        if time_diff_seconds <= 0:
+        if reminder_timestamp <= current_timestamp:
             logger.info(f"Skipping {reminder['label']} as it's already past")
             continue
 
-        from backend.stores import EventStore
-        event = EventStore.get_event_by("id", event_id)
-        message = f"Reminder ({reminder['label']}): Please confirm your attendance for event: {event.name} ."
-
-        # Store the reminder data
-        reminder_data = {
-            "worker_id": worker_id,
-            "event_id": event_id,
-            "message": message,
-            "label": reminder["label"],
-            "check_delay": reminder["check_delay"]
-        }
-
-        # Convert to JSON and add to Redis sorted set
-        reminder_json = json.dumps(reminder_data)
-
-        # The score is the timestamp when the reminder should trigger
-        result = redis_client.zadd(
-            "event_reminders",
-            {reminder_json: reminder_timestamp}
-        )
-        logger.info(f"Redis zadd result: {result}")
-
-    # Check what's in Redis after scheduling
-    all_reminders = redis_client.zrange("event_reminders", 0, -1, withscores=True)
-    logger.info(f"Total reminders in Redis after scheduling: {len(all_reminders)}")
-
-    # For testing/debugging, check for due reminders
-    due_reminders = []
-    for reminder_bytes, score in all_reminders:
-        if score <= current_timestamp:
-            due_reminders.append(reminder_bytes)
-
-    logger.info(f"Reminders due now: {len(due_reminders)}")
-    for r in due_reminders:
-        logger.info(f"Due reminder: {r}")
\ No newline at end of file
+        logger.info(f"Reminder {reminder['label']} time: {time.ctime(reminder_timestamp)}")
+        for worker_id in worker_ids:
+            # The score is the timestamp when the reminder should trigger
+            new_reminders[reminder_member(event_id, worker_id, reminder["label"])] = reminder_timestamp
+
+    removed = _replace_reminders(event_id, worker_ids, new_reminders)
+    logger.info(f"Replaced {removed} reminders with {len(new_reminders)} new ones for event {event_id}")
+
+
+def cancel_worker_reminders(event_id: int, worker_ids: List[int]):
+    """
+    Removes the pending reminders of these workers for the event.
+    """
+    if not worker_ids:
+        return
+    removed = _replace_reminders(event_id, worker_ids, {})
+    logger.info(f"Cancelled {removed} reminders for event {event_id}")
+
+
+def reschedule_event_reminders(event_id: int, old_start_time: datetime.datetime,
+                               new_start_time: datetime.datetime):
+    """
+    Moves all pending reminders of an event by as much as its start time moved, in one script
+    call however many workers are signed up. Reminders that end up in the past are sent right away.
+    """
+    delta = _event_timestamp(new_start_time) - _event_timestamp(old_start_time)
+    if not delta:
+        return
+    shifted = _shift_event_script(keys=[*_bucket_keys(), WAKEUP_KEY, _event_index_key(event_id)],
+                                  args=[*_bucket_args(), delta])
+    logger.info(f"Shifted {shifted} reminders of event {event_id} by {delta} seconds")
+
+
+def purge_event_reminders(event_id: int):
+    """
+    Removes every reminder of a deleted event.
+    """
+    removed = _remove_event_reminders_script(keys=[*_bucket_keys(), _event_index_key(event_id)],
+                                             args=_bucket_args())
+    logger.info(f"Purged {removed} reminders of event {event_id}")
+
+
+def remove_reminder(reminder: str):
+    """
+    Removes a single reminder member, e.g. once it has been dispatched, together with its index entry.
+    """
+    ack_reminders([reminder])
+
+
+def ack_reminders(reminders: List[str], approval_deadlines: Optional[Dict[int, float]] = None):
+    """
+    Removes dispatched reminders together with their index entries and records the approval
+    deadlines of the notifications they created, {notification_id: timestamp}, in one transaction:
+    either the reminders are gone and their follow-up is queued, or they stay claimed and are retried.
+    """
+    if not reminders and not approval_deadlines:
+        return
+    pipeline = redis_client.pipeline()
+    for reminder in reminders:
+        try:
+            event_id, _, _ = parse_reminder(reminder)
+        except (ValueError, KeyError):
+            pipeline.zrem(PROCESSING_KEY, reminder)
+            continue
+        _remove_event_reminders_script(keys=[*_bucket_keys(), _event_index_key(event_id)],
+                                       args=[*_bucket_args(), reminder], client=pipeline)
+    if approval_deadlines:
+        _queue_approval_checks(pipeline, approval_deadlines)
+    pipeline.execute()
+
+
+def claim_due_reminders(now: float, limit: int,
+                        claim_timeout: int = CLAIM_TIMEOUT_SECONDS) -> List[Tuple[str, float]]:
+    """
+    Atomically moves up to `limit` reminders due at `now` into the processing set and returns
+    them as (member, due timestamp) pairs, so concurrent dispatchers never get the same reminder.
+    Only buckets that started by `now` are read. Claims that expired without being acknowledged
+    with remove_reminder are due again and handed out first.
+    """
+    result = _claim_due_reminders_script(keys=_bucket_keys(),
+                                         args=[*_bucket_args(), now, limit, now + claim_timeout, EVENT_INDEX_PREFIX])
+    return [(result[i], float(result[i + 1])) for i in range(0, len(result), 2)]
+
+
+def pending_reminders(event_id: int) -> Dict[str, float]:
+    """
+    Returns the pending, unclaimed reminders of an event and when they are due.
+    """
+    index = redis_client.hgetall(_event_index_key(event_id))
+    pipeline = redis_client.pipeline(transaction=False)
+    for member, bucket in index.items():
+        pipeline.zscore(bucket, member)
+    return {member: score for member, score in zip(index, pipeline.execute()) if score is not None}
+
+
+def schedule_approval_checks(deadlines: Dict[int, float]):
+    """
+    Records when each notification must have been approved by, {notification_id: timestamp}.
+    """
+    if not deadlines:
+        return
+    pipeline = redis_client.pipeline(transaction=False)
+    _queue_approval_checks(pipeline, deadlines)
+    pipeline.execute()
+
+
+def _queue_approval_checks(pipeline, deadlines: Dict[int, float]):
+    pipeline.zadd(APPROVAL_CHECKS_KEY, deadlines)
+    # Let the scheduler recompute how long to sleep
+    pipeline.delete(WAKEUP_KEY)
+    pipeline.rpush(WAKEUP_KEY, "1")
+
+
+def claim_due(due_key: str, processing_key: str, now: float, limit: int,
+              claim_timeout: int = CLAIM_TIMEOUT_SECONDS) -> List[Tuple[str, float]]:
+    """
+    Atomically moves up to `limit` members of the due zset that are due at `now` into its
+    processing zset, like claim_due_reminders, and returns them as (member, due timestamp) pairs.
+    Claims that expired without being acknowledged are due again and handed out first.
+    """
+    result = _claim_due_script(keys=[due_key, processing_key], args=[now, limit, now + claim_timeout])
+    return [(result[i], float(result[i + 1])) for i in range(0, len(result), 2)]
+
+
+def claim_due_approval_checks(now: float, limit: int, claim_timeout: int = CLAIM_TIMEOUT_SECONDS) -> List[int]:
+    """
+    Atomically claims up to `limit` notifications whose approval deadline passed, like claim_due_reminders.
+    """
+    return [int(member) for member, _ in
+            claim_due(APPROVAL_CHECKS_KEY, APPROVAL_PROCESSING_KEY, now, limit, claim_timeout)]
+
+
+def ack_approval_checks(notification_ids: List[int]):
+    if notification_ids:
+        redis_client.zrem(APPROVAL_PROCESSING_KEY, *notification_ids)
+
+
+def next_reminder_due() -> Optional[float]:
+    """
+    Returns when the next reminder, approval check or HR digest is due, counting claims that
+    will expire, or None if nothing is pending.
+    """
+    pipeline = redis_client.pipeline(transaction=False)
+    _next_due_script(keys=_bucket_keys(), args=_bucket_args(), client=pipeline)
+    for key in (PROCESSING_KEY, APPROVAL_CHECKS_KEY, APPROVAL_PROCESSING_KEY,
+                HR_DIGESTS_DUE_KEY, HR_DIGESTS_PROCESSING_KEY):
+        pipeline.zrange(key, 0, 0, withscores=True)
+    earliest_bucketed, *others = pipeline.execute()
+    scores = [entries[0][1] for entries in others if entries]
+    if earliest_bucketed is not None:
+        scores.append(float(earliest_bucketed))
+    return min(scores) if scores else None
+
+
+def wait_for_wakeup(timeout: float) -> bool:
+    """
+    Blocks for up to `timeout` seconds or until an earlier reminder is scheduled. Returns True if woken early.
+    """
+    if timeout <= 0:
+        return False
+    return redis_client.blpop([WAKEUP_KEY], timeout=timeout) is not None
+
+
+def record_delivery_lags(lags: List[float]):
+    """
+    Adds the seconds between when reminders were due and when they were delivered to the lag statistics.
+    """
+    if not lags:
+        return
+    pipeline = redis_client.pipeline(transaction=False)
+    pipeline.hincrby(LAG_STATS_KEY, "count", len(lags))
+    pipeline.hincrbyfloat(LAG_STATS_KEY, "total", sum(lags))
+    for lag in lags:
+        bucket = next((f"le_{bound}" for bound in LAG_BUCKETS if lag <= bound), "le_inf")
+        pipeline.hincrby(LAG_STATS_KEY, bucket, 1)
+    _record_max_script(keys=[LAG_STATS_KEY], args=["max", max(lags)], client=pipeline)
+    pipeline.execute()
+
+
+def get_delivery_lag_stats() -> Dict:
+    stats = redis_client.hgetall(LAG_STATS_KEY)
+    count = int(stats.get("count", 0))
+    total = float(stats.get("total", 0))
+    return {
+        "count": count,
+        "mean_seconds": total / count if count else 0.0,
+        "max_seconds": float(stats.get("max", 0)),
+        "buckets": {f"le_{bound}": int(stats.get(f"le_{bound}", 0)) for bound in LAG_BUCKETS + ("inf",)},
+    }
+
+
+def _event_index_key(event_id: int) -> str:
+    return f"{EVENT_INDEX_PREFIX}:{event_id}"
+
+
+def _bucket_seconds() -> int:
+    if has_app_context():
+        return current_app.config.get("REMINDER_BUCKET_SECONDS", BUCKET_SECONDS)
+    return BUCKET_SECONDS
+
+
+def _bucket_keys() -> List[str]:
+    return [BUCKET_REGISTRY_KEY, PROCESSING_KEY]
+
+
+def _bucket_args() -> list:
+    return [_bucket_seconds(), BUCKET_PREFIX, EVENT_INDEX_GRACE_SECONDS]
+
+
+def _replace_reminders(event_id: int, worker_ids: List[int], new_reminders: Dict[str, float]) -> int:
+    # A worker has at most one reminder per label, so its old members are known without a lookup
+    stale = [reminder_member(event_id, worker_id, label) for worker_id in worker_ids for label in REMINDERS_BY_LABEL]
+    args = [*_bucket_args(), len(stale), *stale]
+    for member, score in new_reminders.items():
+        args.extend([score, member])
+    return _replace_reminders_script(keys=[*_bucket_keys(), WAKEUP_KEY, _event_index_key(event_id)], args=args)
@@ -0,0 +1,148 @@
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from redis.exceptions import RedisError
+
+from backend.redis.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_CHANNEL = "notifications:new"
+# Notifications buffered per open stream before it is closed as too slow
+STREAM_QUEUE_SIZE = 100
+# How long subscribe() waits for the process's Redis subscription to be ready
+SUBSCRIBE_TIMEOUT_SECONDS = 5
+RECONNECT_DELAY_SECONDS = 1
+
+
+def publish_notifications(notifications: List[Dict]) -> None:
+    """
+    Publishes created notifications (as returned by Notification.to_dict) to the open streams
+    of their users. Streams that miss one catch up from the database when they reconnect.
+    """
+    if not notifications:
+        return
+    try:
+        pipeline = redis_client.pipeline(transaction=False)
+        for notification in notifications:
+            pipeline.publish(NOTIFICATION_CHANNEL, json.dumps(notification))
+        pipeline.execute()
+    except RedisError as e:
+        logger.error(f"Failed to publish {len(notifications)} notifications: {e}")
+
+
+class Subscription:
+    """
+    The notifications of one user for one open stream. Closed by the multiplexer when the
+    stream can't keep up or the Redis subscription was lost, since it may have missed some.
+    """
+
+    def __init__(self, user_id: int, size: int = STREAM_QUEUE_SIZE):
+        self.user_id = user_id
+        self.closed = False
+        self._queue = queue.Queue(maxsize=size)
+
+    def get(self, timeout: float) -> Optional[Dict]:
+        """
+        Returns the next notification, or None if none arrived within `timeout` or the subscription closed.
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _offer(self, notification: Dict) -> bool:
+        try:
+            self._queue.put_nowait(notification)
+            return True
+        except queue.Full:
+            return False
+
+    def _close(self) -> None:
+        self.closed = True
+        # Wake up the stream waiting in get()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+
+class NotificationMultiplexer:
+    """
+    Fans notifications published on NOTIFICATION_CHANNEL out to the streams open in this process,
+    so any number of idle clients costs a single Redis subscription, held by a background thread
+    started with the first stream.
+    """
+
+    def __init__(self, channel: str = NOTIFICATION_CHANNEL):
+        self.channel = channel
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._listen, name="notification-multiplexer", daemon=True)
+                self._thread.start()
+        if not self._ready.wait(SUBSCRIBE_TIMEOUT_SECONDS):
+            logger.warning("Notification stream subscription isn't ready yet")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def _listen(self) -> None:
+        while True:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                self._ready.set()
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._deliver(json.loads(message["data"]))
+            except (RedisError, OSError) as e:
+                logger.warning(f"Notification stream subscription lost: {e}")
+                self._ready.clear()
+                self._close_all()
+                time.sleep(RECONNECT_DELAY_SECONDS)
+            finally:
+                pubsub.close()
+
+    def _deliver(self, notification: Dict) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(notification["user_id"], ()))
+        for subscription in subscriptions:
+            if not subscription._offer(notification):
+                self.unsubscribe(subscription)
+                subscription._close()
+
+    def _close_all(self) -> None:
+        # Streams may have missed notifications while disconnected, make them resume from the database
+        with self._lock:
+            subscriptions = [subscription for subscriptions in self._subscriptions.values()
+                             for subscription in subscriptions]
+            self._subscriptions.clear()
+        for subscription in subscriptions:
+            subscription._close()
+
+
+notification_multiplexer = NotificationMultiplexer()
@@ -1,21 +1,36 @@
 # notification_worker.py with pure timestamp approach
-import json
 import time
 import logging
+from collections import defaultdict
+from typing import Dict, List, Tuple
 
+from backend.db import db
 from backend.models.event_users import EventUsers
-from backend.redis.redis_client import redis_client
+from backend.redis.notification_scheduler import (
+    REMINDERS_BY_LABEL, ack_approval_checks, ack_reminders, approval_check_dedup_key, claim_due_approval_checks,
+    claim_due_reminders, parse_reminder, record_delivery_lags, reminder_dedup_key, reminder_message,
+)
+from backend.redis.hr_digest import ack_digests, application_message, claim_due_digests, digest_dedup_keys
+from backend.redis.unread_counter import reconcile_unread_counts as reconcile_counters
 from backend.stores.notification_store import NotificationStore
-from backend.models.notification import Notification
+from backend.stores.user_store import UserStore
 from backend.models.event import Event
-from backend.models.user import User
-from backend.models.roles import Role
+from backend.models.notification import Notification
+from backend.models.notification_dedup_key import NotificationDedupKey
+from backend.models.notification_partitions import archive_notifications
 from backend.core.celery_app import celery, app
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Reminders claimed and sent per batch, unless REMINDER_DISPATCH_BATCH_SIZE is configured
+DISPATCH_BATCH_SIZE = 100
+# Approval checks handled per transaction
+SWEEP_BATCH_SIZE = 500
+# HR digests sent per transaction
+DIGEST_BATCH_SIZE = 500
+
 
 @celery.task
 def process_scheduled_reminders():
@@ -24,97 +39,233 @@ def process_scheduled_reminders():
             # Just use raw timestamp - no datetime objects at all
             current_timestamp = time.time()
             logger.info(f"Processing scheduled reminders at timestamp: {current_timestamp}")
-            logger.info(f"This corresponds to: {time.ctime(current_timestamp)}")
+            batch_size = app.config.get("REMINDER_DISPATCH_BATCH_SIZE", DISPATCH_BATCH_SIZE)
 
-            # Retrieve all reminders
-            all_reminders = redis_client.zrange("event_reminders", 0, -1, withscores=True)
-            logger.info(f"Total reminders in Redis: {len(all_reminders)}")
+            # Claim due reminders in batches; other workers running this task get disjoint batches
+            dispatched = 0
+            while True:
+                due_reminders = claim_due_reminders(current_timestamp, batch_size)
+                if not due_reminders:
+                    break
+                lags = _dispatch_batch(due_reminders)
+                record_delivery_lags(lags)
+                dispatched += len(lags)
 
-            # Track due reminders
-            due_reminders_data = []
+            if not dispatched:
+                logger.info("No due reminders found.")
+                return "No due reminders"
+            logger.info(f"Dispatched {dispatched} reminders")
+        except Exception as e:
+            logger.error("Error in process_scheduled_reminders")
+            logger.exception(e)
+
+    return "done"
 
-            for reminder_bytes, score in all_reminders:
-                # Simple timestamp comparison
-                is_due = score <= current_timestamp
-                time_diff = current_timestamp - score
 
-                logger.info(f"Reminder with score {score}, due at: {time.ctime(score)}")
-                logger.info(f"Current timestamp: {current_timestamp}, Time difference: {time_diff} seconds")
-                logger.info(f"  Is due: {is_due}")
+def _dispatch_batch(due_reminders: List[Tuple[str, float]]) -> List[float]:
+    """
+    Sends a batch of claimed reminders with one event lookup, one INSERT of the notifications and
+    one Redis transaction that acknowledges the reminders and queues their approval checks.
+    Returns the delivery lag of every notification created.
 
-                # If the reminder is due, add it to our processing list
-                if is_due:
-                    due_reminders_data.append(reminder_bytes)
+    Each notification carries a dedup key, so if the batch fails after the INSERT committed, the
+    reminders are claimed again once their claims expire and only get their follow-up queued.
+    Malformed reminders and those of deleted events are dropped.
+    """
+    parsed = []
+    for reminder, due_at in due_reminders:
+        try:
+            parsed.append((reminder, due_at, *parse_reminder(reminder)))
+        except (ValueError, KeyError):
+            logger.error(f"Dropping malformed reminder: {reminder}")
+    events = Event.find_by_ids({event_id for _, _, event_id, _, _ in parsed})
 
-            logger.info(f"Due reminders count: {len(due_reminders_data)}")
+    rows = []
+    check_delays = {}
+    due_by_key = {}
+    for reminder, due_at, event_id, worker_id, label in parsed:
+        event = events.get(event_id)
+        if event is None:
+            logger.warning(f"Dropping reminder {reminder}, its event no longer exists")
+            continue
+        dedup_key = reminder_dedup_key(event_id, worker_id, label, event.start_datetime)
+        rows.append({"user_id": worker_id, "message": reminder_message(label, event.name)[:512],
+                     "event_id": event_id, "is_approved": False, "dedup_key": dedup_key})
+        check_delays[dedup_key] = REMINDERS_BY_LABEL.get(label, {}).get("check_delay", 0)
+        due_by_key[dedup_key] = due_at
 
-            if not due_reminders_data:
-                logger.info("No due reminders found.")
-                return "No due reminders"
+    try:
+        created, existing = Notification.bulk_create_once(rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    if existing:
+        logger.warning(f"{len(existing)} reminders were already sent by an earlier attempt")
 
-            for reminder in due_reminders_data:
-                try:
-                    data = json.loads(reminder)
-                    worker_id = data["worker_id"]
-                    event_id = data["event_id"]
-                    message = data["message"]
-                    check_delay = data.get("check_delay", 0)
-
-                    logger.info(f"Creating notification for worker {worker_id}, event {event_id}")
-
-                    # Create the notification now that it's time
-                    notif = NotificationStore.create_notification(
-                        worker_id,
-                        message,
-                        event_id=event_id,
-                        is_approved=False
-                    )
-
-                    logger.info(f"Created notification {notif['id']}")
-
-                    # Schedule the check for approval
-                    check_task = check_notification_approval.apply_async(args=[notif["id"]], countdown=check_delay)
-                    logger.info(f"Scheduled check_notification_approval task: {check_task.id}")
-
-                    # Remove this reminder from Redis
-                    removed = redis_client.zrem("event_reminders", reminder)
-                    logger.info(f"Removed from Redis: {removed}")
-                except Exception as e:
-                    logger.error(f"Error processing reminder: {reminder}")
-                    logger.exception(e)
+    now = time.time()
+    approval_deadlines = {notif_id: now + check_delays[dedup_key]
+                          for dedup_key, notif_id in {**existing, **created}.items()}
+    ack_reminders([reminder for reminder, _ in due_reminders], approval_deadlines)
+    return [max(now - due_by_key[dedup_key], 0.0) for dedup_key in created]
+
+
+@celery.task
+def sweep_approval_timeouts():
+    """
+    Handles every notification whose approval deadline passed, in batches.
+    """
+    with app.app_context():
+        try:
+            handled = 0
+            while True:
+                notification_ids = claim_due_approval_checks(time.time(), SWEEP_BATCH_SIZE)
+                if not notification_ids:
+                    break
+                _process_approval_timeouts(notification_ids)
+                ack_approval_checks(notification_ids)
+                handled += len(notification_ids)
+            logger.info(f"Swept {handled} approval checks")
         except Exception as e:
-            logger.error("Error in process_scheduled_reminders")
+            logger.error("Error in sweep_approval_timeouts")
             logger.exception(e)
+    return "done"
+
+
+def _process_approval_timeouts(notification_ids: List[int]):
+    """
+    Marks the notifications as read and, for those still unapproved, counts the missed approval
+    and alerts the HR managers of the event's company: one alert per HR manager and event,
+    listing every worker who didn't approve. Everything is written in one transaction, together
+    with a dedup key per notification, so a check that is reclaimed after its batch committed
+    (or handled by two workers at once) is skipped rather than counted and alerted twice.
+    """
+    try:
+        new_keys = NotificationDedupKey.claim([approval_check_dedup_key(notif_id) for notif_id in notification_ids])
+        notification_ids = [notif_id for notif_id in notification_ids
+                            if approval_check_dedup_key(notif_id) in new_keys]
+        unapproved = Notification.find_unapproved_with_context(notification_ids)
+
+        # (company_id, event) -> workers who didn't approve
+        missing_by_event = defaultdict(list)
+        for notif, event, worker in unapproved:
+            missing_by_event[(event.company_id, event)].append(worker)
+
+        alerts = []
+        for (company_id, event), workers in missing_by_event.items():
+            hr_managers = UserStore.get_company_hr_managers(company_id)
+            if not hr_managers:
+                logger.warning(f"No HR manager found for company {company_id}")
+                continue
+            names = ", ".join(f"{worker.first_name} {worker.family_name} (ID: {worker.id})" for worker in workers)
+            if len(workers) == 1:
+                hr_message = f"Worker: {names} has not approved their reminder for event {event.name} ({event.id})."
+            else:
+                hr_message = f"Workers: {names} have not approved their reminder for event {event.name} ({event.id})."
+            alerts.extend({"user_id": hr["id"], "message": hr_message[:512], "event_id": event.id, "is_approved": True}
+                          for hr in hr_managers)
+
+        Notification.bulk_mark_read(notification_ids)
+        EventUsers.increment_approval_counts([(notif.event_id, notif.user_id) for notif, _, _ in unapproved])
+        Notification.bulk_create(alerts)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    logger.info(f"{len(unapproved)} of {len(notification_ids)} notifications were not approved, "
+                f"created {len(alerts)} HR alerts")
 
+
+@celery.task
+def flush_hr_digests():
+    """
+    Sends every HR digest whose window closed as one notification per HR manager and event.
+    """
+    with app.app_context():
+        try:
+            flushed = 0
+            while True:
+                digests = claim_due_digests(time.time(), DIGEST_BATCH_SIZE)
+                if not digests:
+                    break
+                _send_digests(digests)
+                flushed += len(digests)
+            logger.info(f"Flushed {flushed} HR digests")
+        except Exception as e:
+            logger.error("Error in flush_hr_digests")
+            logger.exception(e)
+    return "done"
+
+
+def _send_digests(digests: List[Tuple[int, int, List[Dict]]]):
+    """
+    Creates the notifications of a batch of claimed digests with one INSERT, then acknowledges them.
+    A digest that fails stays claimed and is sent when its claim expires. Each notification carries
+    a dedup key, so a digest claimed again after its notification committed isn't sent twice; only
+    the applications it covered are acknowledged.
+    """
+    events = Event.find_by_ids({event_id for _, event_id, _ in digests})
+    keys = {(hr_manager_id, event_id): digest_dedup_keys(hr_manager_id, event_id, applicants)
+            for hr_manager_id, event_id, applicants in digests}
+    try:
+        taken = NotificationDedupKey.find_taken([key for digest_keys in keys.values() for key in digest_keys])
+        rows = []
+        acks = []
+        for hr_manager_id, event_id, applicants in digests:
+            digest_keys = keys[(hr_manager_id, event_id)]
+            sent = next((count for count, key in enumerate(digest_keys, 1) if key in taken), None)
+            if sent is not None:
+                acks.append((hr_manager_id, event_id, sent))
+                continue
+            acks.append((hr_manager_id, event_id, len(applicants)))
+            event = events.get(event_id)
+            if event is None or not applicants:
+                continue
+            rows.append({"user_id": hr_manager_id, "message": application_message(event.name, applicants),
+                         "event_id": event_id, "is_approved": True, "dedup_key": digest_keys[-1]})
+        Notification.bulk_create_once(rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    ack_digests(acks)
+
+
+@celery.task
+def reconcile_unread_counts():
+    """
+    Corrects unread notification counters in Redis that drifted from the database.
+    """
+    with app.app_context():
+        try:
+            corrected = reconcile_counters(Notification.count_unread_by_user)
+            logger.info(f"Corrected {corrected} unread notification counters")
+        except Exception as e:
+            logger.error("Error in reconcile_unread_counts")
+            logger.exception(e)
+    return "done"
+
+
+@celery.task
+def archive_old_notifications():
+    """
+    Creates upcoming partitions of the notifications table and drops those past the retention period.
+    """
+    with app.app_context():
+        try:
+            archive_notifications()
+        except Exception as e:
+            logger.error("Error in archive_old_notifications")
+            logger.exception(e)
     return "done"
 
 
 @celery.task
 def check_notification_approval(notification_id: int):
+    """Kept for checks enqueued before approval deadlines moved to the sweep."""
     with app.app_context():
         try:
-            logger.info(f"Checking approval for notification: {notification_id}")
-            notif = Notification.find_by_id(notification_id)
-            NotificationStore.update_notification(notif.id, {"is_read": True})
-            if notif and not notif.is_approved:
-                event = Event.find_by("id", notif.event_id)
-                if not event:
-                    logger.warning(f"Event {notif.event_id} not found")
-                    return
-
-                EventUsers.update_approval_count(notif.event_id, notif.user_id)
-                hr_manager = User.find_by({"company_id": event.company_id, "role": Role.HR_MANAGER})
-                if not hr_manager:
-                    logger.warning(f"No HR manager found for company {event.company_id}")
-                    return
-                event = Event.find_by("id", notif.event_id)
-                worker = User.find_by({"id": notif.user_id})
-                hr_message = f"Worker: {worker.first_name} {worker.family_name} (ID: {notif.user_id}) has not approved their reminder for event {event.name} ({notif.event_id})."
-                hr_notif = NotificationStore.create_notification(hr_manager.id, hr_message, event_id=notif.event_id)
-
-                logger.info(f"Created HR notification: {hr_notif['id']}")
-            else:
-                logger.info(f"Notification {notification_id} is already approved or doesn't exist")
+            _process_approval_timeouts([notification_id])
         except Exception as e:
             logger.error(f"Error checking approval for notification {notification_id}")
             logger.exception(e)
@@ -0,0 +1,42 @@
+import json
+import logging
+from typing import Dict, Optional
+
+from redis.exceptions import RedisError
+
+from backend.redis.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KEY_PREFIX = "worker_profile"
+PROFILE_CACHE_TTL_SECONDS = 60 * 60
+
+
+def _profile_key(worker_id: int) -> str:
+    return f"{PROFILE_KEY_PREFIX}:{worker_id}"
+
+
+def get_profile_summary(worker_id: int) -> Optional[Dict]:
+    """
+    Returns the cached profile summary (everything but the page of reviews), or None.
+    """
+    try:
+        value = redis_client.get(_profile_key(worker_id))
+    except RedisError as e:
+        logger.warning(f"Profile cache unavailable: {e}")
+        return None
+    return json.loads(value) if value else None
+
+
+def set_profile_summary(worker_id: int, summary: Dict) -> None:
+    try:
+        redis_client.set(_profile_key(worker_id), json.dumps(summary), ex=PROFILE_CACHE_TTL_SECONDS)
+    except RedisError as e:
+        logger.warning(f"Failed to cache profile of worker {worker_id}: {e}")
+
+
+def invalidate_profile_summary(worker_id: int) -> None:
+    try:
+        redis_client.delete(_profile_key(worker_id))
+    except RedisError as e:
+        logger.error(f"Failed to invalidate profile of worker {worker_id}: {e}")
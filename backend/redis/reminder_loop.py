@@ -0,0 +1,57 @@
+import logging
+import time
+from typing import Callable
+
+from backend.redis.notification_scheduler import next_reminder_due, wait_for_wakeup
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 30
+# Longest the ETA scheduler sleeps without looking at the reminders again
+MAX_SLEEP_SECONDS = 30
+# How often to look again while an enqueued dispatch hasn't claimed the due reminders yet
+REDISPATCH_CHECK_SECONDS = 1
+
+
+def run_poll_scheduler(enqueue: Callable[[], None], interval: float = POLL_INTERVAL_SECONDS,
+                       should_run: Callable[[], bool] = lambda: True):
+    """
+    Enqueues a dispatch every `interval` seconds whether or not anything is due.
+    """
+    while should_run():
+        try:
+            enqueue()
+        except Exception as e:
+            logger.error("Error in scheduled tasks")
+            logger.exception(e)
+        time.sleep(interval)
+
+
+def run_eta_scheduler(enqueue: Callable[[], None], max_sleep: float = MAX_SLEEP_SECONDS,
+                      should_run: Callable[[], bool] = lambda: True):
+    """
+    Enqueues a dispatch when the earliest pending reminder is due. Sleeps until then, for at most
+    `max_sleep` seconds, and wakes early when an earlier reminder is scheduled. A dispatch is
+    enqueued again if the due reminders haven't been claimed within `max_sleep` seconds.
+    """
+    enqueued_for = None
+    enqueued_at = 0.0
+    while should_run():
+        try:
+            next_due = next_reminder_due()
+            now = time.time()
+            if next_due is None:
+                timeout = max_sleep
+            elif next_due > now:
+                timeout = min(next_due - now, max_sleep)
+            elif next_due != enqueued_for or now - enqueued_at >= max_sleep:
+                enqueue()
+                enqueued_for, enqueued_at = next_due, now
+                continue
+            else:
+                timeout = REDISPATCH_CHECK_SECONDS
+            wait_for_wakeup(timeout)
+        except Exception as e:
+            logger.error("Error in reminder scheduler")
+            logger.exception(e)
+            time.sleep(REDISPATCH_CHECK_SECONDS)
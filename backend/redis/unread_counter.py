@@ -0,0 +1,108 @@
+import logging
+from typing import Callable, Dict, List, Optional
+
+from redis.exceptions import RedisError
+
+from backend.redis.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+UNREAD_KEY_PREFIX = "unread_notifications"
+UNREAD_TTL_SECONDS = 7 * 24 * 60 * 60
+RECONCILE_BATCH_SIZE = 500
+
+# Adds ARGV[i] to counter KEYS[i], but only if the counter exists: a missing one is
+# seeded from the database on its next read, and starting it from zero would undercount
+_adjust_script = redis_client.register_script("""
+for i = 1, #KEYS do
+    if redis.call('EXISTS', KEYS[i]) == 1 then
+        redis.call('INCRBY', KEYS[i], ARGV[i])
+    end
+end
+""")
+
+# ARGV[1] is the TTL, then (expected, actual) pairs for each key.
+# Sets counter KEYS[i] to its actual value unless it changed since `expected` was read,
+# so a notification created or read during reconciliation isn't lost.
+_reconcile_script = redis_client.register_script("""
+local corrected = 0
+for i = 1, #KEYS do
+    local expected = ARGV[2 * i]
+    local actual = ARGV[2 * i + 1]
+    local current = redis.call('GET', KEYS[i])
+    if current == expected and current ~= actual then
+        redis.call('SET', KEYS[i], actual, 'EX', ARGV[1])
+        corrected = corrected + 1
+    end
+end
+return corrected
+""")
+
+
+def _unread_key(user_id: int) -> str:
+    return f"{UNREAD_KEY_PREFIX}:{user_id}"
+
+
+def get_unread_count(user_id: int) -> Optional[int]:
+    """
+    Returns the user's unread notification count, or None if it isn't known yet.
+    """
+    try:
+        value = redis_client.get(_unread_key(user_id))
+    except RedisError as e:
+        logger.warning(f"Unread counter unavailable: {e}")
+        return None
+    return max(int(value), 0) if value is not None else None
+
+
+def seed_unread_count(user_id: int, count: int) -> None:
+    """
+    Stores the count read from the database, unless an up to date counter appeared meanwhile.
+    """
+    try:
+        redis_client.set(_unread_key(user_id), count, ex=UNREAD_TTL_SECONDS, nx=True)
+    except RedisError as e:
+        logger.warning(f"Failed to cache unread count of user {user_id}: {e}")
+
+
+def adjust_unread_counts(deltas: Dict[int, int]) -> None:
+    """
+    Applies {user_id: change} to the counters of users that have one.
+    """
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    try:
+        _adjust_script(keys=[_unread_key(user_id) for user_id in deltas], args=list(deltas.values()))
+    except RedisError as e:
+        # The next reconciliation corrects the counters
+        logger.error(f"Failed to update unread counters of users {list(deltas)}: {e}")
+
+
+def reconcile_unread_counts(count_unread: Callable[[List[int]], Dict[int, int]],
+                            batch_size: int = RECONCILE_BATCH_SIZE) -> int:
+    """
+    Compares every counter in Redis with `count_unread(user_ids)`, which returns the actual
+    counts from the database, and corrects those that drifted. Returns how many were corrected.
+    """
+    corrected = 0
+    keys = []
+    for key in redis_client.scan_iter(match=f"{UNREAD_KEY_PREFIX}:*", count=batch_size):
+        keys.append(key)
+        if len(keys) >= batch_size:
+            corrected += _reconcile_batch(keys, count_unread)
+            keys = []
+    if keys:
+        corrected += _reconcile_batch(keys, count_unread)
+    return corrected
+
+
+def _reconcile_batch(keys: List[str], count_unread: Callable[[List[int]], Dict[int, int]]) -> int:
+    expected = redis_client.mget(keys)
+    user_ids = [int(key.rsplit(":", 1)[1]) for key in keys]
+    actual = count_unread(user_ids)
+    args = [UNREAD_TTL_SECONDS]
+    for value, user_id in zip(expected, user_ids):
+        # A counter that expired meanwhile never matches, and is seeded again on its next read
+        args.extend([value if value is not None else "", actual.get(user_id, 0)])
+    return _reconcile_script(keys=keys, args=args)
@@ -2,13 +2,15 @@ from flask import request, jsonify, Blueprint
 from pydantic import ValidationError
 from datetime import datetime
 
-from backend.utils.decorators import load_user, permission_required
+from backend.utils.decorators import load_identity, permission_required
 from backend.models.event_users import WorkerStatus
 from backend.models.roles import Permission, Role, has_permission
 from backend.openai_utils import generate_event_description
 from backend.models.schemas import UpdateEvent
 from backend.stores import EventStore
 from backend.models.event import Event
+from backend.utils.pagination import parse_limit
+from backend.redis.feed_cache import feed_filters, get_feed_cache_stats
 
 event_blueprint = Blueprint('events', __name__)
 JOB_TITLES = ["cook", "cashier", "waiter", "constructor", "cleaner", "barman", "barista"]
@@ -31,7 +33,7 @@ def generate_description():
 
 
 @event_blueprint.route("/create_event", methods=["POST"])
-@load_user
+@load_identity
 def create_event(user):
     if not has_permission(user.role, Permission.MANAGE_EVENTS):
         return jsonify({"error": f"Unauthorized. {user.role} can't manage events"}), 403
@@ -62,7 +64,7 @@ def create_event(user):
 
 
 @event_blueprint.route('/<int:event_id>', methods=['GET'])
-@load_user
+@load_identity
 @permission_required(Permission.MANAGE_EVENTS)
 def get_event(user, event_id):
     if not has_permission(user.role, Permission.MANAGE_EVENTS):
@@ -80,7 +82,7 @@ def get_event(user, event_id):
 
 
 @event_blueprint.route("/<int:event_id>", methods=["PUT"])
-@load_user
+@load_identity
 def update_event(user, event_id):
     if not has_permission(user.role, Permission.MANAGE_EVENTS):
         return jsonify({"error": f"Unauthorized. {user.role} can't manage events"}), 403
@@ -104,7 +106,7 @@ def update_event(user, event_id):
 
 
 @event_blueprint.route('/<int:event_id>', methods=['DELETE'])
-@load_user
+@load_identity
 def delete_event(user, event_id):
     if not has_permission(user.role, Permission.MANAGE_EVENTS):
         return jsonify({"error": f"Unauthorized. {user.role} can't manage events"}), 403
@@ -112,7 +114,7 @@ def delete_event(user, event_id):
 
 
 @event_blueprint.route('/assign_worker/', methods=['POST'])
-@load_user
+@load_identity
 def assign_worker_route(user):
     if not has_permission(user.role, Permission.MANAGE_EVENTS):
         return jsonify({"error": f"Unauthorized. {user.role} can't manage events"}), 403
@@ -134,8 +136,23 @@ def assign_worker_route(user):
     return EventStore.assign_worker(event_id, worker_id, job_title, worker_status)
 
 
+@event_blueprint.route('/<int:event_id>/assign_workers', methods=['POST'])
+@load_identity
+def bulk_assign_workers_route(user, event_id):
+    if not has_permission(user.role, Permission.MANAGE_EVENTS):
+        return jsonify({"error": f"Unauthorized. {user.role} can't manage events"}), 403
+
+    data = request.get_json()
+    assignments = data.get("assignments") if data else None
+    if not assignments or not isinstance(assignments, list):
+        return jsonify({"error": "Invalid input, expected an array of assignments"
+                                 " (worker_id, job_title, status)."}), 400
+
+    return EventStore.bulk_assign_workers(event_id, assignments)
+
+
 @event_blueprint.route("/<int:event_id>/apply", methods=["POST"])
-@load_user
+@load_identity
 def apply_to_event(user, event_id):
     if not has_permission(user.role, Permission.APPLY_FOR_JOBS):
         return jsonify({"error": "Unauthorized"}), 403
@@ -147,17 +164,29 @@ def apply_to_event(user, event_id):
 
 
 @event_blueprint.route('/feed', methods=['GET'])
-@load_user
+@load_identity
 def get_feed(user):
     if user.role != Role.WORKER:
         return jsonify({"error": "Unauthorized"}), 403
-    filters = request.args.to_dict()
-    events = EventStore.get_available_events_for_worker(user.id, filters)
-    return jsonify(events), 200
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        page = EventStore.get_available_events_for_worker(user.id, feed_filters(request.args),
+                                                          limit=limit, cursor=request.args.get("cursor"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(page), 200
+
+
+@event_blueprint.route('/feed/stats', methods=['GET'])
+@load_identity
+def get_feed_stats(user):
+    if user.role != Role.ADMIN:
+        return jsonify({"error": "Unauthorized"}), 403
+    return jsonify(get_feed_cache_stats()), 200
 
 
 @event_blueprint.route('/my_events', methods=['GET'])
-@load_user
+@load_identity
 def my_events(user):
     if has_permission(user.role, Permission.MANAGE_APPLICATIONS):
         events = EventStore.get_events_by_recruiter(user.username)
@@ -171,7 +200,7 @@ def my_events(user):
 
 
 @event_blueprint.route("/<int:event_id>/feedback_worker", methods=["POST"])
-@load_user
+@load_identity
 def feedback_worker(user, event_id):
     if not has_permission(user.role, Permission.RATE_WORKERS):
         return jsonify({"error": "Unauthorized"}), 403
@@ -1,23 +1,90 @@
-from flask import Blueprint, request, jsonify
+import json
+import time
 
-from backend.models.roles import has_permission, Permission
+from flask import Blueprint, Response, current_app, request, jsonify
+
+from backend.models.roles import has_permission, Permission, Role
+from backend.redis.notification_scheduler import get_delivery_lag_stats
+from backend.redis.notification_stream import notification_multiplexer
 from backend.stores import EventUsersStore, UserStore
-from backend.utils.decorators import load_user
+from backend.utils.decorators import load_identity
+from backend.utils.pagination import parse_limit
 from backend.stores.notification_store import NotificationStore
 
 notifications_blueprint = Blueprint('notifications', __name__)
 
+# Notifications replayed to a stream resuming from an earlier id
+STREAM_REPLAY_LIMIT = 100
+
 
 @notifications_blueprint.route("/", methods=["GET"])
-@load_user
+@load_identity
 def get_notifications(user):
-    """Fetch current user's notifications."""
-    data = NotificationStore.get_user_notifications(user.id)
-    return jsonify(data), 200
+    """Fetch a page of the current user's unread notifications, newest first."""
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        page = NotificationStore.get_user_notifications(user.id, limit, request.args.get("cursor"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(page), 200
+
+
+@notifications_blueprint.route("/unread_count", methods=["GET"])
+@load_identity
+def get_unread_count(user):
+    """Number of unread notifications of the current user, for the notifications badge."""
+    return jsonify({"unread_count": NotificationStore.get_unread_count(user.id)}), 200
+
+
+@notifications_blueprint.route("/stream", methods=["GET"])
+@load_identity
+def stream_notifications(user):
+    """
+    Server-Sent Events stream of the current user's new notifications. A client resuming after
+    a disconnect passes the last id it got, as ?last_id= or the Last-Event-ID header, and first
+    receives what it missed. The stream ends after NOTIFICATION_STREAM_MAX_SECONDS and the
+    client reconnects.
+    """
+    last_id = request.args.get("last_id") or request.headers.get("Last-Event-ID")
+    if last_id is not None and not str(last_id).isdigit():
+        return jsonify({"error": "last_id must be a notification id"}), 400
+
+    # Subscribe before reading the missed ones so nothing falls in between
+    subscription = notification_multiplexer.subscribe(user.id)
+    try:
+        missed = NotificationStore.get_notifications_after(user.id, int(last_id), STREAM_REPLAY_LIMIT) \
+            if last_id is not None else []
+    except Exception:
+        notification_multiplexer.unsubscribe(subscription)
+        raise
+    heartbeat = current_app.config["NOTIFICATION_STREAM_HEARTBEAT_SECONDS"]
+    ends_at = time.monotonic() + current_app.config["NOTIFICATION_STREAM_MAX_SECONDS"]
+
+    def events():
+        replayed = {notification["id"] for notification in missed}
+        try:
+            yield f"retry: {heartbeat * 1000}\n\n"
+            for notification in missed:
+                yield _notification_event(notification)
+            while not subscription.closed and time.monotonic() < ends_at:
+                notification = subscription.get(timeout=heartbeat)
+                if notification is None:
+                    yield ": keep-alive\n\n"
+                elif notification["id"] not in replayed:
+                    yield _notification_event(notification)
+        finally:
+            notification_multiplexer.unsubscribe(subscription)
+
+    return Response(events(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+def _notification_event(notification: dict) -> str:
+    return f"id: {notification['id']}\nevent: notification\ndata: {json.dumps(notification)}\n\n"
 
 
 @notifications_blueprint.route("/", methods=["POST"])
-@load_user
+@load_identity
 def create_notification(user):
     """Create a new notification (e.g., for user to test)."""
     body = request.get_json()
@@ -28,8 +95,17 @@ def create_notification(user):
     return jsonify(new_note), 201
 
 
+@notifications_blueprint.route("/reminders/lag", methods=["GET"])
+@load_identity
+def get_reminder_lag(user):
+    """Delivery lag of reminders: seconds between when they were due and when they were sent."""
+    if user.role != Role.ADMIN:
+        return jsonify({"error": "Unauthorized"}), 403
+    return jsonify(get_delivery_lag_stats()), 200
+
+
 @notifications_blueprint.route("/mark_read", methods=["POST"])
-@load_user
+@load_identity
 def mark_notifications_as_read(user):
     data = request.get_json()
     notification_ids = data.get("notification_ids")
@@ -42,8 +118,21 @@ def mark_notifications_as_read(user):
     return jsonify({"message": f"Marked {updated_count} notifications as read"}), 200
 
 
+@notifications_blueprint.route("/mark_all_read", methods=["POST"])
+@load_identity
+def mark_all_notifications_as_read(user):
+    """Mark every notification up to up_to_id as read, typically the newest one the client has seen."""
+    data = request.get_json(silent=True) or {}
+    up_to_id = data.get("up_to_id")
+    if not isinstance(up_to_id, int) or isinstance(up_to_id, bool):
+        return jsonify({"error": "Invalid input, expected up_to_id, a notification ID"}), 400
+
+    updated_count = NotificationStore.mark_all_read_up_to(user.id, up_to_id)
+    return jsonify({"message": f"Marked {updated_count} notifications as read"}), 200
+
+
 @notifications_blueprint.route("/<int:notification_id>/approve", methods=["PUT"])
-@load_user
+@load_identity
 def approve_notification(user, notification_id):
     if not has_permission(user.role, Permission.APPLY_FOR_JOBS):
         return jsonify({"error": f"Unauthorized. {user.role} can't manage events"}), 403
@@ -12,11 +12,12 @@ from pydantic import ValidationError
 from typing import Tuple
 from datetime import timedelta
 
-from backend.utils.decorators import load_user
+from backend.utils.decorators import load_identity
 from backend.models.roles import Role
 from backend.stores import UserStore
 from backend.models.schemas import SignupRequest, LoginRequest
 from backend.utils.auth import check_password
+from backend.utils.pagination import parse_limit
 
 user_blueprint = Blueprint("users", __name__)
 ACCESS_EXPIRES = timedelta(hours=1)
@@ -29,14 +30,48 @@ def signup() -> Tuple[Response, int]:
     except ValidationError as e:
         return jsonify({"error": str(e)}), 400
 
-    user_exists_result = UserStore.user_exists(data)
-    if user_exists_result:
-        return jsonify({"message": user_exists_result}), 400
-
-    UserStore.create_user(data.model_dump())
+    # Taken usernames, emails and personal IDs are rejected by the unique constraints
+    result, status = UserStore.create_user(data.model_dump())
+    if status != 201:
+        return result, status
     return jsonify({"message": "User registered successfully"}), 201
 
 
+@user_blueprint.route("/bulk_signup", methods=["POST"])
+@load_identity
+def bulk_signup(user) -> Tuple[Response, int]:
+    if user.role not in (Role.ADMIN, Role.HR_MANAGER):
+        return jsonify({"error": "Unauthorized"}), 403
+
+    body = request.get_json()
+    users = body.get("users") if body else None
+    if not users or not isinstance(users, list):
+        return jsonify({"error": "Invalid input, expected an array of users"}), 400
+
+    valid_users = []
+    errors = []
+    for index, user_data in enumerate(users):
+        try:
+            signup = SignupRequest(**user_data)
+        except (ValidationError, TypeError) as e:
+            errors.append({"index": index, "error": str(e)})
+            continue
+        if user.role == Role.HR_MANAGER:
+            if signup.role != Role.WORKER:
+                errors.append({"index": index, "error": "HR managers can only import workers"})
+                continue
+            if signup.company_id and signup.company_id != user.company_id:
+                errors.append({"index": index, "error": "HR managers can only import workers of their own company"})
+                continue
+            # Workers imported by an HR manager belong to the manager's company
+            signup.company_id = user.company_id
+        valid_users.append(signup.model_dump())
+    if errors:
+        return jsonify({"errors": errors}), 400
+
+    return UserStore.bulk_create_users(valid_users)
+
+
 @user_blueprint.route("/signin", methods=["POST"])
 def signin() -> Tuple[Response, int]:
     try:
@@ -106,12 +141,18 @@ def delete_user() -> Tuple[Response, int]:
 
 
 @user_blueprint.route("/profile/<int:user_id>", methods=["GET"])
-@load_user
+@load_identity
 def get_profile(user, user_id):
+    try:
+        limit = parse_limit(request.args.get("limit"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    cursor = request.args.get("cursor")
+
     if user_id == 0:
         if user.role != Role.WORKER:
             return jsonify({"error": "Only workers can use this endpoint"}), 403
-        return UserStore.get_worker_profile(user.id)
+        return UserStore.get_worker_profile(user.id, limit, cursor)
     requested_user = UserStore.find_user("id", user_id)
     if not requested_user:
         return jsonify({"error": "User not found"}), 404
@@ -122,4 +163,4 @@ def get_profile(user, user_id):
     if user.role == Role.WORKER and user.id != user_id:
         return jsonify({"error": "Unauthorized"}), 403
 
-    return UserStore.get_worker_profile(user_id)
+    return UserStore.get_worker_profile(user_id, limit, cursor)
@@ -1,10 +1,228 @@
+"""
+Example data for development and performance testing.
+
+    python -m backend.setup_example_data                            # a few hand-written rows
+    python -m backend.setup_example_data --rows 1000000 --seed 7    # a synthetic dataset of about 1M rows
+
+The synthetic dataset has companies with their HR managers, recruiters and workers, events with
+jobs, applications, reviews and notifications, loaded with COPY in one transaction. The same seed
+and anchor date produce the same rows on an empty database, so a performance change can be
+measured before and after against the same data. Events start within half a year of the anchor
+and notifications were sent in the 120 days before it. Every generated user's password is
+"password".
+"""
+import argparse
+import csv
+import datetime
+import logging
+import random
+import tempfile
+from typing import Dict, TextIO
+
+from sqlalchemy import text
+
 from backend.db import db
 from backend.models.user import User
 from backend.models.event import Event
 from backend.models.roles import Role
 from backend.models.event_job import EventJob
-from backend.models.event_users import EventUsers
-from datetime import datetime
+from backend.models.event_users import EventUsers, WorkerStatus
+from backend.models.notification_partitions import create_partitions, month_start
+from backend.redis.feed_cache import invalidate_feed_cache
+from backend.utils.auth import hash_data
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Loaded in this order, so foreign keys always point at rows loaded before
+TABLE_COLUMNS = {
+    "users": ["id", "username", "email", "password_hash", "role", "birthdate", "phone_number", "first_name",
+              "family_name", "personal_id", "company_name", "company_id", "city", "rating", "rating_count",
+              "created_at", "updated_at"],
+    "events": ["id", "name", "description", "address", "city", "start_datetime", "end_datetime", "recruiter",
+               "status", "company_id", "created_at", "updated_at"],
+    "event_jobs": ["id", "event_id", "job_title", "slots", "openings"],
+    "event_users": ["event_id", "worker_id", "job_id", "status", "approval_status", "approval_count"],
+    "reviews": ["id", "worker_id", "commenter_id", "review_text", "timestamp", "event_id"],
+    "notifications": ["id", "user_id", "message", "is_read", "is_approved", "event_id", "created_at", "updated_at"],
+}
+# Tables whose rows get ids from a sequence
+SEQUENCE_TABLES = ["users", "events", "event_jobs", "reviews", "notifications"]
+
+FIRST_NAMES = ["Noa", "Yossi", "Maya", "Omer", "Tamar", "Itay", "Shira", "Daniel", "Yael", "Amit", "Lior", "Roni",
+               "Avi", "Michal", "Eitan", "Dana", "Nadav", "Hila", "Guy", "Adi"]
+FAMILY_NAMES = ["Cohen", "Levi", "Mizrahi", "Peretz", "Biton", "Dahan", "Avraham", "Friedman", "Malka", "Azoulay",
+                "Katz", "Yosef", "David", "Amar", "Ohana", "Hadad", "Gabay", "Ben David", "Shapiro", "Klein"]
+CITIES = ["Tel Aviv", "Jerusalem", "Haifa", "Rishon LeZion", "Petah Tikva", "Ashdod", "Netanya", "Beersheba",
+          "Holon", "Ramat Gan", "Herzliya", "Eilat"]
+STREETS = ["Herzl", "Rothschild", "Ben Yehuda", "Dizengoff", "Jabotinsky", "Weizmann", "HaNasi", "Allenby"]
+EVENT_KINDS = ["Wedding", "Bar Mitzvah", "Conference", "Gala dinner", "Product launch", "Festival", "Birthday",
+               "Company party"]
+JOB_TITLES = ["Waiter", "Bartender", "Cook", "Dishwasher", "Host", "Security", "Cleaner", "Usher", "DJ assistant"]
+REVIEW_TEXTS = ["Great work, would hire again.", "Punctual and professional.", "Helpful with the guests.",
+                "Arrived late but worked hard.", "Needed a lot of guidance.", "Excellent attitude all evening."]
+
+NOTIFICATION_DAYS = 120
+EVENT_DAYS = 180
+
+
+def plan_counts(rows: int) -> Dict[str, int]:
+    """
+    Splits about `rows` rows between the tables; jobs come to about 5% of them.
+    """
+    companies = max(rows // 5000, 1)
+    return {
+        "companies": companies,
+        "hr_managers": companies * 2,
+        "recruiters": companies * 5,
+        "workers": max(rows * 5 // 100, 10),
+        "events": max(rows * 2 // 100, 2),
+        "applications": rows * 45 // 100,
+        "reviews": rows * 10 // 100,
+        "notifications": rows * 30 // 100,
+    }
+
+
+def generate_dataset(rows: int, seed: int, anchor: datetime.datetime, first_ids: Dict[str, int],
+                     files: Dict[str, TextIO], password_hash: str) -> Dict[str, int]:
+    """
+    Writes the rows of every table in TABLE_COLUMNS as CSV to `files`, giving each table's rows ids from
+    `first_ids` on. Returns the number of rows written per table.
+    """
+    rng = random.Random(seed)
+    counts = plan_counts(rows)
+    writers = {table: csv.writer(files[table]) for table in TABLE_COLUMNS}
+    written = dict.fromkeys(TABLE_COLUMNS, 0)
+    next_ids = dict(first_ids)
+
+    def write(table: str, row: list) -> None:
+        writers[table].writerow(row)
+        written[table] += 1
+
+    def new_id(table: str) -> int:
+        next_ids[table] += 1
+        return next_ids[table] - 1
+
+    def add_user(role: Role, company: int) -> tuple:
+        user_id = new_id("users")
+        first, family = rng.choice(FIRST_NAMES), rng.choice(FAMILY_NAMES)
+        username = f"{first.lower()}.{family.lower().replace(' ', '')}.{user_id}"
+        birthdate = datetime.date(rng.randint(1960, 2006), rng.randint(1, 12), rng.randint(1, 28))
+        joined = anchor - datetime.timedelta(days=rng.randint(1, 3 * 365))
+        rating_count = rng.randint(0, 40) if role == Role.WORKER else 0
+        rating = round(rng.uniform(2.5, 5.0), 2) if rating_count else 0.0
+        write("users", [user_id, username, f"{username}@example.com", password_hash, role.name,
+                        birthdate.strftime("%d/%m/%Y"), f"05{rng.randint(0, 99_999_999):08d}", first, family,
+                        f"{user_id:09d}", f"Company {company}", str(company), rng.choice(CITIES), rating,
+                        rating_count, joined, joined])
+        return user_id, username
+
+    for company in range(1, counts["companies"] + 1):
+        for _ in range(2):
+            add_user(Role.HR_MANAGER, company)
+    hr_managers = list(range(first_ids["users"], next_ids["users"]))
+    recruiters = {company: [add_user(Role.RECRUITER, company) for _ in range(5)]
+                  for company in range(1, counts["companies"] + 1)}
+    workers = [add_user(Role.WORKER, rng.randint(1, counts["companies"]))[0] for _ in range(counts["workers"])]
+
+    # Applications are spread evenly over the events
+    per_event, extra = divmod(counts["applications"], counts["events"])
+    past_events = []
+    event_names = []
+    for index in range(counts["events"]):
+        event_id = new_id("events")
+        company = rng.randint(1, counts["companies"])
+        recruiter_id, recruiter = rng.choice(recruiters[company])
+        city = rng.choice(CITIES)
+        name = f"{rng.choice(EVENT_KINDS)} in {city}"
+        start = anchor + datetime.timedelta(days=rng.randint(-EVENT_DAYS, EVENT_DAYS), hours=rng.randint(8, 20))
+        is_past = start < anchor
+        created = min(start - datetime.timedelta(days=rng.randint(7, 60)), anchor)
+        write("events", [event_id, name, f"{name}, staffed through Company {company}.",
+                         f"{rng.choice(STREETS)} {rng.randint(1, 200)}", city, start,
+                         start + datetime.timedelta(hours=rng.randint(3, 8)), recruiter,
+                         "finished" if is_past else "planned", str(company), created, created])
+        event_names.append((event_id, name))
+        if is_past:
+            past_events.append((event_id, recruiter_id))
+
+        jobs = [[new_id("event_jobs"), title, rng.randint(2, 30)]
+                for title in rng.sample(JOB_TITLES, rng.randint(1, 4))]
+        taken = dict.fromkeys((job_id for job_id, _, _ in jobs), 0)
+        applicants = per_event + (1 if index < extra else 0)
+        for worker_id in rng.sample(workers, min(applicants, len(workers))):
+            job_id, _, slots = rng.choice(jobs)
+            chance = rng.random()
+            if chance < (0.7 if is_past else 0.4) and taken[job_id] < slots:
+                status = WorkerStatus.DONE if is_past else WorkerStatus.APPROVED
+                taken[job_id] += 1
+            elif chance < 0.85:
+                status = WorkerStatus.BACKUP
+            else:
+                status = WorkerStatus.PENDING
+            approved = status in (WorkerStatus.APPROVED, WorkerStatus.DONE) and rng.random() < 0.8
+            write("event_users", [event_id, worker_id, job_id, status.name, approved, int(approved)])
+        for job_id, title, slots in jobs:
+            write("event_jobs", [job_id, event_id, title, slots, slots - taken[job_id]])
+
+    for _ in range(counts["reviews"] if past_events else 0):
+        event_id, recruiter_id = rng.choice(past_events)
+        write("reviews", [new_id("reviews"), rng.choice(workers), recruiter_id, rng.choice(REVIEW_TEXTS),
+                          anchor - datetime.timedelta(minutes=rng.randint(1, EVENT_DAYS * 24 * 60)), event_id])
+
+    for _ in range(counts["notifications"]):
+        event_id, name = rng.choice(event_names)
+        sent = anchor - datetime.timedelta(seconds=rng.randint(1, NOTIFICATION_DAYS * 24 * 3600))
+        # Older notifications are more likely to have been read
+        is_read = rng.random() < (0.9 if anchor - sent > datetime.timedelta(days=14) else 0.4)
+        if rng.random() < 0.8:
+            user_id = rng.choice(workers)
+            message = f"Your application for {name} was {rng.choice(['approved', 'received'])}."
+        else:
+            user_id = rng.choice(hr_managers)
+            message = f"{rng.randint(1, 12)} workers applied to {name}."
+        write("notifications", [new_id("notifications"), user_id, message, is_read, True, event_id, sent, sent])
+    return written
+
+
+def load_dataset(rows: int, seed: int, anchor: datetime.datetime) -> Dict[str, int]:
+    """
+    Generates the synthetic dataset and loads it after the rows already in the database.
+    Returns the number of rows loaded per table.
+    """
+    connection = db.session.connection()
+    first_ids = {table: connection.execute(text(f"SELECT coalesce(max(id), 0) + 1 FROM {table}")).scalar()
+                 for table in SEQUENCE_TABLES}
+    # Months of the generated notifications; any without a partition would fill the default one
+    first_month = month_start(anchor - datetime.timedelta(days=NOTIFICATION_DAYS))
+    create_partitions(connection, first_month, NOTIFICATION_DAYS // 28 + 2)
+    db.session.commit()
+
+    files = {table: tempfile.TemporaryFile(mode="w+", newline="") for table in TABLE_COLUMNS}
+    try:
+        counts = generate_dataset(rows, seed, anchor, first_ids, files, hash_data("password"))
+        raw = db.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            for table, columns in TABLE_COLUMNS.items():
+                files[table].seek(0)
+                cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", files[table])
+                logger.info(f"Loaded {counts[table]} rows into {table}")
+            for table in SEQUENCE_TABLES:
+                cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                               f"(SELECT coalesce(max(id), 0) + 1 FROM {table}), false)")
+            raw.commit()
+            for table in TABLE_COLUMNS:
+                cursor.execute(f"ANALYZE {table}")
+            raw.commit()
+        finally:
+            raw.close()
+    finally:
+        for file in files.values():
+            file.close()
+    # The feed is cached; caches of single users and companies don't exist yet for new ones
+    invalidate_feed_cache()
+    return counts
 
 
 def setup_example_data():
@@ -67,18 +285,18 @@ def setup_example_data():
     event1 = Event(
         name="Event by Recruiter 1",
         description="An event created by recruiter1.",
-        location="Location A",
-        start_datetime=datetime.fromisoformat("2024-12-01T10:00:00"),
-        end_datetime=datetime.fromisoformat("2024-12-01T14:00:00"),
+        city="Location A",
+        start_datetime=datetime.datetime.fromisoformat("2024-12-01T10:00:00"),
+        end_datetime=datetime.datetime.fromisoformat("2024-12-01T14:00:00"),
         recruiter="recruiter1",
         status="planned"
     )
     event2 = Event(
         name="Event by Recruiter 2",
         description="An event created by recruiter2.",
-        location="Location B",
-        start_datetime=datetime.fromisoformat("2024-12-02T10:00:00"),
-        end_datetime=datetime.fromisoformat("2024-12-02T14:00:00"),
+        city="Location B",
+        start_datetime=datetime.datetime.fromisoformat("2024-12-02T10:00:00"),
+        end_datetime=datetime.datetime.fromisoformat("2024-12-02T14:00:00"),
         recruiter="recruiter2",
         status="planned"
     )
@@ -92,8 +310,8 @@ def setup_example_data():
     job2 = EventJob.create_event_job(event_id=event2.id, job_title="Waiter", slots=3)
 
     # Assign workers to jobs in events
-    assignment1 = EventUsers(event_id=event1.id, worker_id=worker1.personal_id, job_id=job1.id)
-    assignment2 = EventUsers(event_id=event2.id, worker_id=worker2.personal_id, job_id=job2.id)
+    assignment1 = EventUsers(event_id=event1.id, worker_id=worker1.id, job_id=job1.id)
+    assignment2 = EventUsers(event_id=event2.id, worker_id=worker2.id, job_id=job2.id)
 
     db.session.add_all([assignment1, assignment2])
     db.session.commit()
@@ -101,5 +319,25 @@ def setup_example_data():
     print("Example data setup complete.")
 
 
+def main():
+    from backend.core.app_factory import create_app
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, help="generate a synthetic dataset of about this many rows "
+                                                 "(1000 to 10000000) instead of the hand-written example")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--anchor", type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        help="date the generated events and notifications are placed around, YYYY-MM-DD "
+                             "(default: today)")
+    args = parser.parse_args()
+
+    with create_app().app_context():
+        if args.rows is None:
+            setup_example_data()
+        else:
+            counts = load_dataset(args.rows, args.seed, datetime.datetime.combine(args.anchor, datetime.time()))
+            print(f"Loaded {sum(counts.values())} rows: {counts}")
+
+
 if __name__ == "__main__":
-    setup_example_data()
+    main()
@@ -1,17 +1,24 @@
 import datetime
-from typing import Optional, Dict, Tuple, List
+from typing import Optional, Dict, Tuple, List, Set
 from flask import jsonify, Response
 from sqlalchemy.exc import SQLAlchemyError
 
+from backend.db import db
+from backend.models.notification import Notification
 from backend.models.reviews import Review
 from backend.models.user import User
 from backend.models.event import Event
 from backend.models.event_users import EventUsers, WorkerStatus
 from backend.models.event_job import EventJob
 from backend.models.roles import Role
+from backend.redis.feed_cache import (FEED_CACHE_HEAD_SIZE, acquire_feed_rebuild, feed_filters, get_shared_feed,
+                                      invalidate_feed_cache, set_shared_feed)
+from backend.redis.hr_digest import application_message, buffer_application, digest_window_seconds
+from backend.redis.notification_scheduler import cancel_worker_reminders, schedule_reminders_for_workers
 from backend.stores import UserStore
 from backend.stores.event_users_store import EventUsersStore
 from backend.stores.notification_store import NotificationStore
+from backend.utils.pagination import DEFAULT_PAGE_SIZE, InvalidCursor, decode_cursor, encode_cursor
 
 
 class EventStore:
@@ -31,23 +38,85 @@ class EventStore:
 
             for job_title, slots in data["jobs"].items():
                 EventJob.create_event_job(event_id=event.id, job_title=job_title, slots=slots)
+            invalidate_feed_cache()
             return event
 
         except Exception as e:
             raise e
 
     @staticmethod
-    def get_available_events_for_worker(worker_id: int, filters: Dict) -> List[Dict]:
+    def get_available_events_for_worker(worker_id: int, filters: Dict, limit: int = DEFAULT_PAGE_SIZE,
+                                        cursor: Optional[str] = None) -> Dict:
         """
-        Returns a list of future events that the worker can apply to, excluding events they're already signed up for.
+        Returns a page of future events that the worker can apply to, excluding events they're already signed up for.
+        `next_cursor` is None on the last page.
+
+        The head of the list of open future events is shared by all workers and cached in Redis, so a
+        cache hit only costs the query for the worker's own event ids. Pages past the cached head, and
+        requests that miss while another one rebuilds the entry, use the keyset query.
         """
         try:
-            events = Event.get_future_events_excluding_signed(worker_id, filters)
-            return [event.to_dict() for event in events]
+            filters = feed_filters(filters)
+            after = None
+            if cursor:
+                start, event_id = decode_cursor(cursor, 2)
+                try:
+                    after = (datetime.datetime.fromisoformat(start), int(event_id))
+                except (TypeError, ValueError):
+                    raise InvalidCursor("Invalid cursor")
+
+            version, head = get_shared_feed(filters)
+            if version is not None and head is None and acquire_feed_rebuild(version, filters):
+                events = Event.get_future_events_excluding_signed(None, filters, limit=FEED_CACHE_HEAD_SIZE + 1)
+                head = {"events": Event.to_dict_many(events[:FEED_CACHE_HEAD_SIZE]),
+                        "complete": len(events) <= FEED_CACHE_HEAD_SIZE}
+                set_shared_feed(version, filters, head["events"], head["complete"])
+
+            if head is None:
+                events = Event.get_future_events_excluding_signed(worker_id, filters, limit=limit + 1, after=after)
+                event_dicts = Event.to_dict_many(events)
+            else:
+                signed_event_ids = EventUsers.get_event_ids_by_worker(worker_id)
+                event_dicts = EventStore._page_shared_feed(head["events"], signed_event_ids, limit + 1, after)
+                if len(event_dicts) <= limit and not head["complete"]:
+                    # The page runs past the cached head; continue after its last event
+                    last = head["events"][-1]
+                    head_end = (datetime.datetime.fromisoformat(last["start_datetime"]), last["id"])
+                    events = Event.get_future_events_excluding_signed(
+                        worker_id, filters, limit=limit + 1 - len(event_dicts),
+                        after=max(after, head_end) if after else head_end
+                    )
+                    event_dicts += Event.to_dict_many(events)
+
+            has_more = len(event_dicts) > limit
+            event_dicts = event_dicts[:limit]
+            next_cursor = None
+            if has_more:
+                last = event_dicts[-1]
+                next_cursor = encode_cursor(last["start_datetime"], last["id"])
+            return {"events": event_dicts, "next_cursor": next_cursor}
 
         except Exception as e:
             raise e
 
+    @staticmethod
+    def _page_shared_feed(shared_feed: List[Dict], signed_event_ids: Set[int], size: int,
+                          after: Optional[Tuple[datetime.datetime, int]]) -> List[Dict]:
+        """
+        Cuts a page out of the cached feed head (ordered by start_datetime, id), dropping events
+        that already started since it was cached and events the worker signed up for.
+        """
+        now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        page = []
+        for event in shared_feed:
+            key = (datetime.datetime.fromisoformat(event["start_datetime"]), event["id"])
+            if key[0] <= now or (after and key <= after) or event["id"] in signed_event_ids:
+                continue
+            page.append(event)
+            if len(page) == size:
+                break
+        return page
+
     @staticmethod
     def update_event(event_id: int, new_data: Dict) -> Tuple:
         existing_event = Event.find_by("id", event_id)
@@ -100,15 +169,21 @@ class EventStore:
             # Just mark them as PENDING in the relationship
             EventUsersStore.assign_worker(event_id, worker_id, job.id, WorkerStatus.PENDING)
 
-            # Notify the HR manager
-            hr_user = User.find_by({"company_id": worker.company_id, "role": Role.HR_MANAGER})
-            if hr_user:
-                full_name = f"{worker.first_name} {worker.family_name}"
-                city = worker.city if worker.city else "Unknown city"
-                age = datetime.datetime.now().year - datetime.datetime.strptime(worker.birthdate, "%d/%m/%Y").year
-
-                message = f"{full_name}, from {city}, age {age}, requests to join {event.name}."
-                NotificationStore.create_notification(hr_user.id, message, event_id=event_id)
+            # Notify the company's HR managers, in a digest of the applications of the next few minutes
+            hr_managers = UserStore.get_company_hr_managers(worker.company_id)
+            if hr_managers:
+                applicant = {
+                    "name": f"{worker.first_name} {worker.family_name}",
+                    "city": worker.city if worker.city else "Unknown city",
+                    "age": datetime.datetime.now().year - datetime.datetime.strptime(worker.birthdate, "%d/%m/%Y").year,
+                }
+                hr_manager_ids = [hr["id"] for hr in hr_managers]
+                if not digest_window_seconds() or not buffer_application(hr_manager_ids, event_id, applicant):
+                    message = application_message(event.name, [applicant])
+                    NotificationStore.create_notifications([
+                        {"user_id": hr_manager_id, "message": message, "event_id": event_id, "is_approved": True}
+                        for hr_manager_id in hr_manager_ids
+                    ])
 
             return jsonify({"message": "Successfully applied (pending)"}), 201
         except Exception as e:
@@ -133,22 +208,118 @@ class EventStore:
                 return jsonify({"error": f"Job '{job_title}' not found in this event"}), 404
 
             # Update or create the worker-event relation with proper handling of openings.
-            EventUsersStore.assign_worker(event_id, worker_id, job.id, worker_status)
+            try:
+                EventUsersStore.assign_worker(event_id, worker_id, job.id, worker_status)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 409
 
             # Send worker a notification
-            if worker_status == WorkerStatus.APPROVED:
-                note_msg = f"You have been accepted for event '{event.name}'."
-            elif worker_status == WorkerStatus.BACKUP:
-                note_msg = f"You have been assigned as backup for event '{event.name}'."
-            else:
-                note_msg = f"Your status for event '{event.name}' is now {worker_status.name}."
-
+            note_msg = EventStore._worker_status_message(event, worker_status)
             NotificationStore.create_notification(worker.id, note_msg, event_id)
 
             return jsonify({"message": f"Worker status set to {worker_status.name}"}), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
+    @staticmethod
+    def bulk_assign_workers(event_id: int, assignments: List[Dict]):
+        """
+        Sets the status and job of many workers of one event at once.
+        Every entry is validated with set-based queries before anything is written; then all
+        status and openings changes and the worker notifications are written in one transaction,
+        and the reminders of newly approved workers are scheduled (and those of workers who lost
+        their approval cancelled) in one Redis pipeline each.
+        """
+        try:
+            event = Event.find_by("id", event_id)
+            if not event:
+                return jsonify({"error": "Event not found"}), 404
+
+            worker_ids = [EventStore._parse_worker_id(entry.get("worker_id")) for entry in assignments]
+            workers = {worker.id: worker for worker in
+                       User.query.filter(User.id.in_([worker_id for worker_id in worker_ids if worker_id])).all()}
+            jobs = {job.job_title: job for job in EventJob.query.filter_by(event_id=event_id).all()}
+
+            errors = []
+            parsed = []
+            seen_worker_ids = set()
+            for index, (entry, worker_id) in enumerate(zip(assignments, worker_ids)):
+                job_title = entry.get("job_title")
+                status = entry.get("status")
+                if not all([entry.get("worker_id"), job_title, status]):
+                    errors.append({"index": index, "error": "Missing required fields (worker_id, job_title, status)."})
+                    continue
+                if worker_id is None:
+                    errors.append({"index": index, "error": f"Invalid worker_id '{entry.get('worker_id')}'."})
+                    continue
+                try:
+                    worker_status = WorkerStatus(str(status).upper())
+                except ValueError:
+                    errors.append({"index": index, "error": f"Invalid status '{status}'."})
+                    continue
+                worker = workers.get(worker_id)
+                if not worker:
+                    errors.append({"index": index, "error": f"Worker {worker_id} not found"})
+                elif worker.role != Role.WORKER:
+                    errors.append({"index": index, "error": f"User {worker_id} is not a worker"})
+                elif job_title not in jobs:
+                    errors.append({"index": index, "error": f"Job '{job_title}' not found in this event"})
+                elif worker_id in seen_worker_ids:
+                    errors.append({"index": index, "error": f"Worker {worker_id} appears more than once"})
+                else:
+                    parsed.append((worker_id, jobs[job_title].id, worker_status))
+                seen_worker_ids.add(worker_id)
+            if errors:
+                return jsonify({"errors": errors}), 400
+
+            try:
+                reserved_worker_ids, released_worker_ids = EventUsers.bulk_assign(event_id, parsed)
+                Notification.bulk_create([
+                    {"user_id": worker_id,
+                     "message": EventStore._worker_status_message(event, worker_status),
+                     "event_id": event_id,
+                     "is_approved": True}
+                    for worker_id, _, worker_status in parsed
+                ])
+                db.session.commit()
+            except ValueError as e:
+                db.session.rollback()
+                return jsonify({"error": str(e)}), 409
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                raise e
+
+            invalidate_feed_cache()
+            schedule_reminders_for_workers(event_id, reserved_worker_ids, event.start_datetime)
+            cancel_worker_reminders(event_id, released_worker_ids)
+
+            return jsonify({
+                "message": f"Updated {len(parsed)} workers",
+                "results": [{"worker_id": worker_id, "status": worker_status.name}
+                            for worker_id, _, worker_status in parsed]
+            }), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    @staticmethod
+    def _parse_worker_id(value) -> Optional[int]:
+        """
+        Accepts a positive worker id given as a JSON number or a string of digits; None otherwise.
+        """
+        if isinstance(value, str) and value.isdecimal():
+            value = int(value)
+        if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+            return value
+        return None
+
+    @staticmethod
+    def _worker_status_message(event: Event, worker_status: WorkerStatus) -> str:
+        if worker_status == WorkerStatus.APPROVED:
+            return f"You have been accepted for event '{event.name}'."
+        if worker_status == WorkerStatus.BACKUP:
+            return f"You have been assigned as backup for event '{event.name}'."
+        return f"Your status for event '{event.name}' is now {worker_status.name}."
+
     @staticmethod
     def get_event_by(field: str, value: any) -> Optional[Event]:
         return Event.find_by(field, value)
@@ -160,7 +331,7 @@ class EventStore:
         """
         try:
             events = Event.query.all()
-            return [event.to_dict() for event in events]
+            return Event.to_dict_many(events)
         except Exception as e:
             raise e
 
@@ -171,7 +342,7 @@ class EventStore:
         """
         try:
             events = Event.query.filter_by(recruiter=recruiter_username).all()
-            return [event.to_dict() for event in events]
+            return Event.to_dict_many(events)
         except Exception as e:
             raise e
 
@@ -182,10 +353,10 @@ class EventStore:
         """
         try:
             events = Event.get_events_by_worker(worker_id)  # Fetch worker's events
+            event_dicts = Event.to_dict_many([event for event, _, _ in events])
             event_list = []
 
-            for event, status, job_title in events:
-                event_dict = event.to_dict()
+            for (event, status, job_title), event_dict in zip(events, event_dicts):
                 event_dict["job_title"] = job_title
                 event_dict["worker_status"] = status.value if isinstance(status, WorkerStatus) else status
                 event_list.append(event_dict)
@@ -1,6 +1,11 @@
 # stores/notification_store.py
+import datetime
 from typing import List, Dict, Optional
+
+from backend.db import db
 from backend.models.notification import Notification
+from backend.redis.unread_counter import get_unread_count, seed_unread_count
+from backend.utils.pagination import DEFAULT_PAGE_SIZE, InvalidCursor, decode_cursor, encode_cursor
 
 
 class NotificationStore:
@@ -17,10 +22,57 @@ class NotificationStore:
         }
 
     @staticmethod
-    def get_user_notifications(user_id: int) -> List[Dict]:
-        notifications = Notification.query.filter_by(user_id=user_id, is_read=False).all()
-        print(f"Found {len(notifications)} notifications for user {user_id}")
-        return [n.to_dict() for n in notifications]
+    def create_notifications(notifications: List[Dict]) -> List[Dict]:
+        """
+        Creates many notifications with a single INSERT and commits them.
+        Each dict holds user_id and message, and optionally event_id and is_approved.
+        """
+        try:
+            created = Notification.bulk_create(notifications)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise e
+        return [n.to_dict() for n in created]
+
+    @staticmethod
+    def get_user_notifications(user_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Dict:
+        """
+        Returns a page of the user's unread notifications, newest first.
+        `next_cursor` is None on the last page. Raises InvalidCursor for a malformed cursor.
+        """
+        before = None
+        if cursor:
+            created_at, notification_id = decode_cursor(cursor, 2)
+            try:
+                before = (datetime.datetime.fromisoformat(created_at), int(notification_id))
+            except (TypeError, ValueError):
+                raise InvalidCursor("Invalid cursor")
+
+        notifications = Notification.get_unread_page(user_id, limit + 1, before)
+        has_more = len(notifications) > limit
+        notifications = notifications[:limit]
+        next_cursor = None
+        if has_more:
+            last = notifications[-1]
+            next_cursor = encode_cursor(last.created_at.isoformat(), last.id)
+        return {"notifications": [n.to_dict() for n in notifications], "next_cursor": next_cursor}
+
+    @staticmethod
+    def get_unread_count(user_id: int) -> int:
+        """
+        Returns the number of unread notifications of the user from its Redis counter,
+        counting them in the database only when the counter doesn't exist yet.
+        """
+        count = get_unread_count(user_id)
+        if count is None:
+            count = Notification.count_unread(user_id)
+            seed_unread_count(user_id, count)
+        return count
+
+    @staticmethod
+    def get_notifications_after(user_id: int, last_id: int, limit: int) -> List[Dict]:
+        return [n.to_dict() for n in Notification.find_for_user_after(user_id, last_id, limit)]
 
     @staticmethod
     def update_notification(notification_id: int, update_data: dict) -> dict:
@@ -40,4 +92,8 @@ class NotificationStore:
         """
         Calls the Notification model method to mark notifications as read.
         """
-        return Notification.mark_notification_as_read(notification_ids, user_id)
\ No newline at end of file
+        return Notification.mark_notification_as_read(notification_ids, user_id)
+
+    @staticmethod
+    def mark_all_read_up_to(user_id: int, up_to_id: int) -> int:
+        return Notification.mark_all_read_up_to(user_id, up_to_id)
\ No newline at end of file
@@ -1,59 +1,137 @@
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from flask import jsonify, Response
-from typing import Dict, Tuple, Optional
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, Tuple, Optional, List
 
-from backend.models.event import Event
+from backend.db import db
 from backend.models.roles import Role
 from backend.utils.auth import hash_data
 from backend.models.reviews import Review
 from backend.models.user import User
+from backend.redis.company_directory import get_cached_hr_managers, invalidate_hr_managers, set_cached_hr_managers
+from backend.redis.profile_cache import get_profile_summary, set_profile_summary
+from backend.utils.identity_cache import identity_cache
+from backend.utils.pagination import DEFAULT_PAGE_SIZE, InvalidCursor, decode_cursor, encode_cursor
+
+# Messages for User.UNIQUE_FIELDS
+UNIQUE_FIELD_MESSAGES = {
+    "username": "Username already exists",
+    "email": "Email already exists",
+    "personal_id": "Personal ID already exists"
+}
+HASH_WORKERS = 8
+
+
+def _is_hr_manager(role) -> bool:
+    try:
+        return role is not None and Role(role) == Role.HR_MANAGER
+    except ValueError:
+        return False
 
 
 class UserStore:
     @staticmethod
     def create_user(data: Dict) -> Tuple[Response, int]:
+        """
+        Creates the user, relying on the unique constraints to reject taken usernames, emails
+        and personal IDs; the conflicting fields are only looked up when the insert fails.
+        """
         try:
             if "password" in data:
                 data["password_hash"] = hash_data(data.pop("password"))
 
             user = User(**data)
             user.save_to_db()
+            if _is_hr_manager(user.role):
+                invalidate_hr_managers(user.company_id)
             return jsonify({"message": "User created successfully"}), 201
+        except IntegrityError:
+            db.session.rollback()
+            conflicts = UserStore.find_conflicts(data)
+            return jsonify({"message": ", ".join(conflicts) or "User already exists"}), 400
         except Exception as e:
+            db.session.rollback()
             return jsonify({"error": str(e)}), 500
 
+    @staticmethod
+    def bulk_create_users(users: List[Dict]) -> Tuple[Response, int]:
+        """
+        Creates many users in a single transaction. Duplicates inside the batch and values
+        already taken in the database are reported per row, found with one query, and
+        nothing is created unless every row is valid.
+        """
+        errors = []
+        seen = {field: set() for field in User.UNIQUE_FIELDS}
+        for index, data in enumerate(users):
+            for field in User.UNIQUE_FIELDS:
+                value = data.get(field)
+                # Rows that leave out the optional personal_id don't clash with each other
+                if not value:
+                    continue
+                if value in seen[field]:
+                    errors.append({"index": index, "error": f"{UNIQUE_FIELD_MESSAGES[field]} in this batch"})
+                seen[field].add(value)
+
+        taken = User.find_taken_values(seen)
+        for index, data in enumerate(users):
+            for field in User.UNIQUE_FIELDS:
+                if data.get(field) and data[field] in taken[field]:
+                    errors.append({"index": index, "error": UNIQUE_FIELD_MESSAGES[field]})
+        if errors:
+            return jsonify({"errors": errors}), 400
+
+        # Password hashing is deliberately slow; hashlib releases the GIL, so hash in parallel
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+            password_hashes = list(executor.map(hash_data, (data.pop("password") for data in users)))
+        for data, password_hash in zip(users, password_hashes):
+            data["password_hash"] = password_hash
+
+        try:
+            User.bulk_create(users)
+        except IntegrityError:
+            return jsonify({"error": "Some users were created concurrently, nothing was imported"}), 409
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+        invalidate_hr_managers(*(data.get("company_id") for data in users if _is_hr_manager(data.get("role"))))
+        return jsonify({"message": f"Created {len(users)} users"}), 201
+
     @staticmethod
     def update_user(user_id: int, data: Dict) -> Tuple[Response, int]:
         try:
             user = User.find_by({"id": user_id})
             if not user:
                 return jsonify({"error": "User not found"}), 404
+            old_company_id, was_hr_manager = user.company_id, _is_hr_manager(user.role)
+            identity_cache.invalidate(user.username)
             user.update_user(data)
+            identity_cache.invalidate(user.username)
+            if was_hr_manager or _is_hr_manager(user.role):
+                invalidate_hr_managers(old_company_id, user.company_id)
             return jsonify({"message": "User updated successfully"}), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
     @staticmethod
-    def user_exists(data):
-        fields_to_check = ["username", "email", "personal_id"]
-        messages = {
-            "username": "Username already exists",
-            "email": "Email already exists",
-            "personal_id": "Personal ID already exists"
-        }
-
-        for field in fields_to_check:
-            existing_user = UserStore.find_user(field, getattr(data, field))
-            if existing_user:
-                return messages[field]
+    def find_conflicts(data: Dict) -> List[str]:
+        """
+        Checks username, email and personal_id with one indexed query and
+        returns a message for every field that is already taken.
+        """
+        taken = User.find_taken_values({field: [data[field]] for field in User.UNIQUE_FIELDS if data.get(field)})
+        return [UNIQUE_FIELD_MESSAGES[field] for field in User.UNIQUE_FIELDS if taken.get(field)]
 
     @staticmethod
     def delete_user(field: str, value: str) -> Tuple[Response, int]:
         try:
-            success = User.delete_by(field, value)
-            if success:
-                return jsonify({"message": "User deleted successfully"}), 200
-            return jsonify({"error": "User not found"}), 404
+            user = User.find_by({field: value})
+            if not user:
+                return jsonify({"error": "User not found"}), 404
+            user.delete()
+            identity_cache.invalidate(user.username)
+            if _is_hr_manager(user.role):
+                invalidate_hr_managers(user.company_id)
+            return jsonify({"message": "User deleted successfully"}), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
@@ -62,44 +140,86 @@ class UserStore:
         return User.find_by({field: value})
 
     @staticmethod
-    def get_worker_profile(worker_id: int):
+    def get_company_hr_managers(company_id: str) -> List[Dict]:
+        """
+        Returns the HR managers of a company as {id, name, phone} dicts, served from the
+        company directory cache. Changes to HR managers go through UserStore, which invalidates it.
+        """
+        hr_managers = get_cached_hr_managers(company_id)
+        if hr_managers is None:
+            hr_managers = [
+                {"id": hr.id, "name": f"{hr.first_name} {hr.family_name}", "phone": hr.phone_number}
+                for hr in User.find_all_by({"company_id": company_id, "role": Role.HR_MANAGER})
+            ]
+            set_cached_hr_managers(company_id, hr_managers)
+        return hr_managers
 
+    @staticmethod
+    def get_worker_profile(worker_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None):
+        """
+        Returns the worker's profile with one page of reviews, newest first.
+        The rest of the profile (including the review count) is cached until the
+        worker is updated, rated or reviewed; the company's HR manager comes from the
+        company directory, so changes to HR managers show up right away.
+        """
         try:
-            worker = User.find_by({"id": worker_id})
-            if not worker:
-                return {"error": "Worker not found"}
-
-            # Get worker reviews
-            reviews = Review.find_by({"worker_id": worker_id})
+            before = None
+            if cursor:
+                timestamp, review_id = decode_cursor(cursor, 2)
+                try:
+                    before = (datetime.datetime.fromisoformat(timestamp), int(review_id))
+                except (TypeError, ValueError):
+                    raise InvalidCursor("Invalid cursor")
+
+            summary = get_profile_summary(worker_id)
+            if summary is None:
+                worker = User.find_by({"id": worker_id})
+                if not worker:
+                    return jsonify({"error": "Worker not found"}), 404
+                summary = UserStore._worker_profile_summary(worker)
+                set_profile_summary(worker_id, summary)
+
+            # Get a page of worker reviews, with commenters and events loaded in the same query
+            reviews = Review.get_page_for_worker(worker_id, limit + 1, before)
+            has_more = len(reviews) > limit
+            reviews = reviews[:limit]
             reviews_list = [
                 {
                     "reviewer_name": f"{r.commenter.first_name} {r.commenter.family_name}" if r.commenter else "Unknown",
                     "review_text": r.review_text,
                     "timestamp": r.timestamp.isoformat(),
                     "event_id": r.event_id,
-                    "event_name": Event.find_by("id", r.event_id).name
+                    "event_name": r.event.name if r.event else None
                 } for r in reviews
-            ] if reviews else []
+            ]
+            next_cursor = encode_cursor(reviews[-1].timestamp.isoformat(), reviews[-1].id) if has_more else None
+            hr_managers = UserStore.get_company_hr_managers(summary["company_id"])
 
+        except InvalidCursor as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             return jsonify({"error": f"Failed to fetch reviews: {str(e)}"}), 500
 
-        # Prepare response data
-        hr = User.find_by({"company_id": worker.company_id, "role": Role.HR_MANAGER})
+        hr = hr_managers[0] if hr_managers else None
         profile_data = {
+            **summary,
+            "hr_manager_name": hr["name"] if hr else None,
+            "hr_manager_phone": hr["phone"] if hr else None,
+            "reviews": reviews_list,
+            "next_cursor": next_cursor
+        }
+        return jsonify(profile_data), 200
+
+    @staticmethod
+    def _worker_profile_summary(worker: User) -> Dict:
+        return {
             "full_name": f"{worker.first_name} {worker.family_name}",
             "city": worker.city,
             "phone": worker.phone_number,
             "email": worker.email,
             "age": datetime.datetime.now().year - datetime.datetime.strptime(worker.birthdate, "%d/%m/%Y").year,
             "rating": worker.rating,
-            "reviews": reviews_list,
+            "reviews_total": Review.count_for_worker(worker.id),
             "company_name": worker.company_name,
-            "company_id": worker.company_id,
-            "hr_manager_name": f"{hr.first_name} {hr.family_name}",
-            "hr_manager_phone": hr.phone_number
+            "company_id": worker.company_id
         }
-
-        return jsonify(profile_data), 200
-
-
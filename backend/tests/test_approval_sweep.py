@@ -0,0 +1,123 @@
+import unittest
+import datetime
+import time
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.event import Event
+from backend.models.event_job import EventJob
+from backend.models.event_users import EventUsers, WorkerStatus
+from backend.models.notification import Notification
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.redis.company_directory import invalidate_hr_managers
+from backend.redis.notification_scheduler import (
+    APPROVAL_CHECKS_KEY, APPROVAL_PROCESSING_KEY, claim_due_approval_checks, schedule_approval_checks,
+)
+from backend.redis.notification_worker import _process_approval_timeouts
+from backend.redis.redis_client import redis_client
+from backend.utils.query_counter import count_queries
+
+COMPANY_ID = "sweep_company"
+WORKERS = 5
+
+
+class TestApprovalSweep(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+        invalidate_hr_managers(COMPANY_ID)
+
+        def user(i, role):
+            return User(username=f"sweep_{role.value}_{i}", email=f"sweep_{role.value}_{i}@example.com",
+                        password_hash="hashed_password", role=role, first_name="Sweep", family_name=f"User{i}",
+                        personal_id=f"{role.value}-{i}", company_id=COMPANY_ID)
+
+        cls.hr_managers = [user(i, Role.HR_MANAGER) for i in range(2)]
+        cls.workers = [user(i, Role.WORKER) for i in range(WORKERS)]
+        start = datetime.datetime.now() + datetime.timedelta(hours=2)
+        cls.event = Event(name="Sweep Event", description="Event for approval sweeps", city="Ashdod",
+                          start_datetime=start, end_datetime=start + datetime.timedelta(hours=4),
+                          recruiter="sweep_recruiter", company_id=COMPANY_ID)
+        db.session.add_all(cls.hr_managers + cls.workers + [cls.event])
+        db.session.flush()
+        job = EventJob(event_id=cls.event.id, job_title="cook", slots=WORKERS, openings=0)
+        db.session.add(job)
+        db.session.flush()
+        db.session.add_all(EventUsers(event_id=cls.event.id, worker_id=worker.id, job_id=job.id,
+                                      status=WorkerStatus.APPROVED.value, approval_count=0)
+                           for worker in cls.workers)
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        invalidate_hr_managers(COMPANY_ID)
+        redis_client.delete(APPROVAL_CHECKS_KEY, APPROVAL_PROCESSING_KEY)
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def tearDown(self):
+        # Every test starts without notifications or missed approvals
+        Notification.query.filter(Notification.event_id == self.event.id).delete()
+        EventUsers.query.filter_by(event_id=self.event.id).update({"approval_count": 0})
+        db.session.commit()
+
+    def test_sweep_counts_misses_and_alerts_each_hr_manager_once(self):
+        reminders = Notification.bulk_create([
+            {"user_id": worker.id, "message": "Reminder", "event_id": self.event.id, "is_approved": i == 0}
+            for i, worker in enumerate(self.workers)
+        ])
+        db.session.commit()
+        now = time.time()
+        schedule_approval_checks({notif.id: now - 1 for notif in reminders})
+
+        notification_ids = claim_due_approval_checks(now, 100)
+        self.assertEqual(sorted(notification_ids), sorted(notif.id for notif in reminders))
+        with count_queries() as counter:
+            _process_approval_timeouts(notification_ids)
+        # Dedup keys, notifications with context, HR directory, mark read, approval counts, alerts, commit
+        self.assertLessEqual(counter["count"], 7)
+
+        counts = {row.worker_id: row.approval_count for row in EventUsers.query.filter_by(event_id=self.event.id)}
+        self.assertEqual(counts[self.workers[0].id], 0)
+        self.assertTrue(all(counts[worker.id] == 1 for worker in self.workers[1:]))
+        self.assertTrue(all(n.is_read for n in Notification.query.filter(Notification.id.in_(notification_ids))))
+
+        alerts = Notification.query.filter(
+            Notification.user_id.in_([hr.id for hr in self.hr_managers])).all()
+        self.assertEqual(sorted(alert.user_id for alert in alerts), sorted(hr.id for hr in self.hr_managers))
+        for alert in alerts:
+            self.assertTrue(alert.message.startswith("Workers: "))
+            self.assertEqual(alert.message.count("(ID: "), WORKERS - 1)
+
+    def test_reclaimed_checks_are_not_counted_twice(self):
+        reminders = Notification.bulk_create([
+            {"user_id": worker.id, "message": "Reminder", "event_id": self.event.id, "is_approved": False}
+            for worker in self.workers[:2]
+        ])
+        db.session.commit()
+        notification_ids = [notif.id for notif in reminders]
+        hr_ids = [hr.id for hr in self.hr_managers]
+
+        def state():
+            db.session.expire_all()
+            counts = {row.worker_id: row.approval_count for row in EventUsers.query.filter_by(event_id=self.event.id)}
+            return counts, Notification.query.filter(Notification.user_id.in_(hr_ids)).count()
+
+        before_counts, before_alerts = state()
+        _process_approval_timeouts(notification_ids)
+        counts, alerts = state()
+        self.assertEqual([counts[worker.id] - before_counts[worker.id] for worker in self.workers[:2]], [1, 1])
+        self.assertEqual(alerts - before_alerts, len(self.hr_managers))
+
+        # The claim expired before the ack, so the same checks come around again
+        _process_approval_timeouts(notification_ids)
+        self.assertEqual(state(), (counts, alerts))
+
+
+if __name__ == "__main__":
+    unittest.main()
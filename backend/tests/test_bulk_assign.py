@@ -0,0 +1,127 @@
+import unittest
+import datetime
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.event import Event
+from backend.models.event_job import EventJob
+from backend.models.event_users import EventUsers, WorkerStatus
+from backend.models.notification import Notification
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.redis.notification_scheduler import parse_reminder, pending_reminders, purge_event_reminders
+from backend.stores import EventStore
+
+
+class TestBulkAssign(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        cls.workers = [
+            User(
+                username=f"bulk_worker_{i}",
+                email=f"bulk_worker_{i}@example.com",
+                password_hash="hashed_password",
+                role=Role.WORKER,
+                first_name="Bulk",
+                family_name=f"Worker{i}",
+                personal_id=f"{730000000 + i}",
+            )
+            for i in range(3)
+        ]
+        db.session.add_all(cls.workers)
+        db.session.commit()
+        cls.worker_ids = [worker.id for worker in cls.workers]
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        start = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=3)
+        event = Event(
+            name="Bulk Event",
+            description="Event for bulk assignments",
+            city="Haifa",
+            start_datetime=start,
+            end_datetime=start + datetime.timedelta(hours=4),
+            recruiter="bulk_recruiter",
+        )
+        db.session.add(event)
+        db.session.commit()
+        self.event_id = event.id
+        self.job_id = EventJob.create_event_job(event_id=self.event_id, job_title="waiter", slots=1).id
+
+    def tearDown(self):
+        purge_event_reminders(self.event_id)
+
+    def _assign(self, *entries):
+        response, status = EventStore.bulk_assign_workers(self.event_id, [
+            {"worker_id": worker_id, "job_title": "waiter", "status": status} for worker_id, status in entries
+        ])
+        db.session.expire_all()
+        return response.get_json(), status
+
+    def _openings(self) -> int:
+        return db.session.get(EventJob, self.job_id).openings
+
+    def _workers_with_reminders(self) -> set:
+        return {parse_reminder(member)[1] for member in pending_reminders(self.event_id)}
+
+    def test_overbooking_writes_nothing(self):
+        body, status = self._assign((self.worker_ids[0], "approved"), (self.worker_ids[1], "approved"))
+
+        self.assertEqual(status, 409)
+        self.assertIn("Not enough openings", body["error"])
+        self.assertEqual(self._openings(), 1)
+        self.assertEqual(EventUsers.query.filter_by(event_id=self.event_id).count(), 0)
+        self.assertEqual(Notification.query.filter_by(event_id=self.event_id).count(), 0)
+        self.assertEqual(self._workers_with_reminders(), set())
+
+    def test_batch_can_free_and_fill_the_same_slot(self):
+        first, second = self.worker_ids[:2]
+        self.assertEqual(self._assign((first, "approved"))[1], 200)
+        self.assertEqual(self._openings(), 0)
+
+        body, status = self._assign((first, "backup"), (second, "approved"))
+
+        self.assertEqual(status, 200, body)
+        self.assertEqual(self._openings(), 0)
+        statuses = {row.worker_id: WorkerStatus(row.status)
+                    for row in EventUsers.query.filter_by(event_id=self.event_id)}
+        self.assertEqual(statuses, {first: WorkerStatus.BACKUP, second: WorkerStatus.APPROVED})
+
+    def test_losing_approval_cancels_reminders(self):
+        first, second = self.worker_ids[:2]
+        self._assign((first, "approved"))
+        self.assertEqual(self._workers_with_reminders(), {first})
+
+        self._assign((first, "pending"), (second, "approved"))
+
+        self.assertEqual(self._workers_with_reminders(), {second})
+
+    def test_worker_ids_are_normalized(self):
+        body, status = self._assign((str(self.worker_ids[0]), "approved"))
+
+        self.assertEqual(status, 200, body)
+        self.assertEqual(body["results"][0]["worker_id"], self.worker_ids[0])
+        self.assertEqual(self._workers_with_reminders(), {self.worker_ids[0]})
+
+    def test_invalid_worker_ids_are_rejected(self):
+        body, status = self._assign(("abc", "approved"), (1.5, "approved"), (True, "approved"),
+                                    (self.worker_ids[2], "approved"))
+
+        self.assertEqual(status, 400)
+        self.assertEqual([error["index"] for error in body["errors"]], [0, 1, 2])
+        self.assertEqual(body["errors"][0]["error"], "Invalid worker_id 'abc'.")
+        self.assertEqual(EventUsers.query.filter_by(event_id=self.event_id).count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
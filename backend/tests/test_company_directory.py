@@ -0,0 +1,67 @@
+import unittest
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.redis.company_directory import invalidate_hr_managers
+from backend.stores import UserStore
+from backend.utils.query_counter import count_queries
+
+COMPANY_ID = "directory_company"
+
+
+class TestCompanyDirectory(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        for i in range(2):
+            db.session.add(User(
+                username=f"directory_hr_{i}",
+                email=f"directory_hr_{i}@example.com",
+                password_hash="hashed_password",
+                role=Role.HR_MANAGER,
+                first_name="Directory",
+                family_name=f"Hr{i}",
+                personal_id=f"55500000{i}",
+                company_id=COMPANY_ID,
+            ))
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        invalidate_hr_managers(COMPANY_ID)
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        invalidate_hr_managers(COMPANY_ID)
+
+    def test_returns_every_hr_manager_and_caches_them(self):
+        with count_queries() as counter:
+            hr_managers = UserStore.get_company_hr_managers(COMPANY_ID)
+        self.assertEqual(counter["count"], 1)
+        self.assertEqual([hr["name"] for hr in hr_managers], ["Directory Hr0", "Directory Hr1"])
+
+        with count_queries() as counter:
+            self.assertEqual(UserStore.get_company_hr_managers(COMPANY_ID), hr_managers)
+        self.assertEqual(counter["count"], 0)
+
+    def test_role_change_invalidates_directory(self):
+        self.assertEqual(len(UserStore.get_company_hr_managers(COMPANY_ID)), 2)
+        hr = User.find_by({"username": "directory_hr_1"})
+        UserStore.update_user(hr.id, {"role": Role.WORKER})
+        try:
+            self.assertEqual(len(UserStore.get_company_hr_managers(COMPANY_ID)), 1)
+        finally:
+            UserStore.update_user(hr.id, {"role": Role.HR_MANAGER})
+        self.assertEqual(len(UserStore.get_company_hr_managers(COMPANY_ID)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
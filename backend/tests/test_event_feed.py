@@ -0,0 +1,129 @@
+import unittest
+import datetime
+from unittest.mock import patch
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.event import Event
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.redis.feed_cache import acquire_feed_rebuild, get_shared_feed, invalidate_feed_cache
+from backend.stores import EventStore
+from backend.utils.pagination import InvalidCursor
+
+
+class TestEventFeedPagination(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        cls.worker = User(
+            username="feed_worker",
+            email="feed_worker@example.com",
+            password_hash="hashed_password",
+            role=Role.WORKER,
+            first_name="Feed",
+            family_name="Worker",
+            personal_id="192837465",
+        )
+        db.session.add(cls.worker)
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        # Move events of previous tests into the past so every test starts with an empty feed
+        Event.query.filter(Event.recruiter == "feed_recruiter").update({"start_datetime": datetime.datetime(2000, 1, 1)})
+        db.session.commit()
+        invalidate_feed_cache()
+
+    def _create_event(self, name: str, days_ahead: int, openings: int = 2) -> Event:
+        start = datetime.datetime.now() + datetime.timedelta(days=days_ahead)
+        return EventStore.create_event({
+            "name": name,
+            "description": "Feed event",
+            "city": "Haifa",
+            "address": "Herzl 1",
+            "start_datetime": start,
+            "end_datetime": start + datetime.timedelta(hours=3),
+            "recruiter": "feed_recruiter",
+            "company_id": "0",
+            "jobs": {"cook": openings, "waiter": openings},
+        })
+
+    def _fetch_all(self, limit: int, between_pages=None) -> list:
+        ids = []
+        cursor = None
+        while True:
+            page = EventStore.get_available_events_for_worker(self.worker.id, {}, limit=limit, cursor=cursor)
+            self.assertLessEqual(len(page["events"]), limit)
+            ids.extend(event["id"] for event in page["events"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                return ids
+            if between_pages:
+                between_pages()
+                between_pages = None
+
+    def test_pages_cover_feed_in_order_without_repeats(self):
+        events = [self._create_event(f"Feed {i}", days_ahead=i + 1) for i in range(7)]
+        self._create_event("Full event", days_ahead=3, openings=0)
+        self._create_event("Past event", days_ahead=-2)
+
+        ids = self._fetch_all(limit=3)
+
+        self.assertEqual(ids, [event.id for event in events])
+
+    def test_insert_between_pages_does_not_skip_or_repeat(self):
+        events = [self._create_event(f"Stable {i}", days_ahead=i + 1) for i in range(5)]
+
+        later = []
+        ids = self._fetch_all(limit=2, between_pages=lambda: later.append(self._create_event("Late", days_ahead=30)))
+
+        self.assertEqual(ids, [event.id for event in events] + [later[0].id])
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_pages_past_cached_head_come_from_database(self):
+        events = [self._create_event(f"Head {i}", days_ahead=i + 1) for i in range(7)]
+
+        with patch("backend.stores.event_store.FEED_CACHE_HEAD_SIZE", 3):
+            ids = self._fetch_all(limit=2)
+
+        self.assertEqual(ids, [event.id for event in events])
+        _, head = get_shared_feed({})
+        self.assertEqual([event["id"] for event in head["events"]], ids[:3])
+        self.assertFalse(head["complete"])
+
+    def test_cache_key_ignores_unrecognized_args(self):
+        self._create_event("Keyed", days_ahead=1)
+        EventStore.get_available_events_for_worker(self.worker.id, {"utm_source": "mail"}, limit=2)
+
+        self.assertIsNotNone(get_shared_feed({})[1])
+        self.assertIsNotNone(get_shared_feed({"location": "", "other": "1"})[1])
+        self.assertIsNone(get_shared_feed({"location": "Haifa"})[1])
+
+    def test_miss_during_rebuild_reads_database(self):
+        events = [self._create_event(f"Rebuild {i}", days_ahead=i + 1) for i in range(3)]
+        version, _ = get_shared_feed({})
+        # Another request is rebuilding the entry
+        self.assertTrue(acquire_feed_rebuild(version, {}))
+
+        ids = self._fetch_all(limit=2)
+
+        self.assertEqual(ids, [event.id for event in events])
+        self.assertIsNone(get_shared_feed({})[1])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            EventStore.get_available_events_for_worker(self.worker.id, {}, limit=2, cursor="not-a-cursor")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import datetime
+
+from flask import Flask
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.event import Event
+from backend.models.event_job import EventJob
+from backend.models.event_users import EventUsers, WorkerStatus
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.stores import EventStore
+from backend.utils.query_counter import QUERY_COUNT_HEADER, count_queries, init_query_counter
+
+
+class TestEventListQueries(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        cls.worker = User(
+            username="query_worker",
+            email="query_worker@example.com",
+            password_hash="hashed_password",
+            role=Role.WORKER,
+            first_name="Query",
+            family_name="Worker",
+            personal_id="987654321",
+        )
+        db.session.add(cls.worker)
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def _create_events(self, count: int):
+        start = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=1)
+        for i in range(count):
+            event = Event(
+                name=f"Query Event {i}",
+                description="Event for query counting",
+                city="Tel Aviv",
+                start_datetime=start,
+                end_datetime=start + datetime.timedelta(hours=4),
+                recruiter="query_recruiter",
+            )
+            db.session.add(event)
+            db.session.flush()
+            cook = EventJob(event_id=event.id, job_title="cook", slots=3, openings=3)
+            waiter = EventJob(event_id=event.id, job_title="waiter", slots=2, openings=2)
+            db.session.add_all([cook, waiter])
+            db.session.flush()
+            db.session.add(EventUsers(event_id=event.id, worker_id=self.worker.id, job_id=cook.id,
+                                      status=WorkerStatus.PENDING.value))
+        db.session.commit()
+
+    def _count(self, fn, *args) -> int:
+        with count_queries() as counter:
+            fn(*args)
+        return counter["count"]
+
+    def test_list_endpoints_use_fixed_number_of_queries(self):
+        self._create_events(2)
+        few = {
+            "all": self._count(EventStore.get_all_events),
+            "recruiter": self._count(EventStore.get_events_by_recruiter, "query_recruiter"),
+            "worker": self._count(EventStore.get_events_for_worker, self.worker.id),
+        }
+
+        self._create_events(20)
+        many = {
+            "all": self._count(EventStore.get_all_events),
+            "recruiter": self._count(EventStore.get_events_by_recruiter, "query_recruiter"),
+            "worker": self._count(EventStore.get_events_for_worker, self.worker.id),
+        }
+
+        self.assertEqual(few, many)
+        self.assertLessEqual(many["all"], 2)
+        self.assertEqual(len(EventStore.get_events_by_recruiter("query_recruiter")), 22)
+
+    def test_to_dict_many_matches_to_dict(self):
+        self._create_events(3)
+        events = Event.query.filter_by(recruiter="query_recruiter").all()
+        self.assertEqual(Event.to_dict_many(events), [event.to_dict() for event in events])
+
+    def test_query_count_header_is_opt_in(self):
+        self.assertNotIn(QUERY_COUNT_HEADER, self.app.test_client().get("/events/").headers)
+
+        app = Flask(__name__)
+        app.config["QUERY_COUNT_HEADER_ENABLED"] = True
+        init_query_counter(app)
+        self.assertEqual(app.test_client().get("/missing").headers[QUERY_COUNT_HEADER], "0")
+
+
+if __name__ == "__main__":
+    unittest.main()
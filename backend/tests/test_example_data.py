@@ -0,0 +1,70 @@
+import unittest
+import datetime
+import io
+
+from sqlalchemy import text
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.event_job import EventJob
+from backend.models.notification import Notification
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.setup_example_data import TABLE_COLUMNS, generate_dataset, load_dataset
+
+ANCHOR = datetime.datetime(2026, 3, 15)
+FIRST_IDS = {table: 1 for table in TABLE_COLUMNS}
+
+
+def generate(rows, seed):
+    files = {table: io.StringIO() for table in TABLE_COLUMNS}
+    counts = generate_dataset(rows, seed, ANCHOR, FIRST_IDS, files, "hash")
+    return counts, {table: file.getvalue() for table, file in files.items()}
+
+
+class TestExampleData(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def test_same_seed_generates_the_same_rows(self):
+        counts, rows = generate(5000, seed=3)
+        self.assertEqual(generate(5000, seed=3), (counts, rows))
+        self.assertNotEqual(generate(5000, seed=4)[1], rows)
+        self.assertAlmostEqual(sum(counts.values()), 5000, delta=500)
+
+    def test_dataset_loads_after_existing_rows(self):
+        existing = User(username="example_existing", email="example_existing@example.com",
+                        password_hash="hashed_password", role=Role.WORKER, first_name="Existing",
+                        family_name="Worker", personal_id="example-1")
+        db.session.add(existing)
+        db.session.commit()
+        before = {table: self._count(table) for table in TABLE_COLUMNS}
+
+        counts = load_dataset(2000, seed=1, anchor=ANCHOR)
+
+        for table, count in counts.items():
+            self.assertEqual(self._count(table) - before[table], count, table)
+        self.assertEqual(EventJob.query.filter(EventJob.openings < 0).count(), 0)
+        hr_manager = User.query.filter(User.role == Role.HR_MANAGER, User.id > existing.id).first()
+        self.assertTrue(hr_manager.check_password("password"))
+        # Ids continue after the loaded rows
+        last_id = db.session.execute(text("SELECT max(id) FROM notifications")).scalar()
+        created = Notification.create_notification(hr_manager.id, "After the load")
+        self.assertEqual(created.id, last_id + 1)
+
+    def _count(self, table):
+        return db.session.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+
+
+if __name__ == "__main__":
+    unittest.main()
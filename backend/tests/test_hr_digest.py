@@ -0,0 +1,141 @@
+import unittest
+import datetime
+import json
+import time
+from unittest.mock import patch
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.event import Event
+from backend.models.event_job import EventJob
+from backend.models.notification import Notification
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.redis.company_directory import invalidate_hr_managers
+from backend.redis.hr_digest import (
+    MAX_MESSAGE_LENGTH, application_message, buffer_application, claim_due_digests, _buffer_key,
+)
+from backend.redis.notification_scheduler import HR_DIGESTS_DUE_KEY, HR_DIGESTS_PROCESSING_KEY
+from backend.redis.notification_worker import _send_digests
+from backend.redis.redis_client import redis_client
+from backend.stores.event_store import EventStore
+
+COMPANY_ID = "digest_company"
+WORKERS = 30
+
+
+class TestHRDigest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+        invalidate_hr_managers(COMPANY_ID)
+
+        def user(i, role):
+            return User(username=f"digest_{role.value}_{i}", email=f"digest_{role.value}_{i}@example.com",
+                        password_hash="hashed_password", role=role, first_name="Digest", family_name=f"User{i}",
+                        personal_id=f"digest-{role.value}-{i}", company_id=COMPANY_ID, city="Acre",
+                        birthdate="01/01/2000")
+
+        cls.hr_managers = [user(i, Role.HR_MANAGER) for i in range(2)]
+        cls.workers = [user(i, Role.WORKER) for i in range(WORKERS + 1)]
+        start = datetime.datetime.now() + datetime.timedelta(days=2)
+        cls.event = Event(name="Digest Event", description="Event for HR digests", city="Acre",
+                          start_datetime=start, end_datetime=start + datetime.timedelta(hours=4),
+                          recruiter="digest_recruiter", company_id=COMPANY_ID)
+        db.session.add_all(cls.hr_managers + cls.workers + [cls.event])
+        db.session.flush()
+        db.session.add(EventJob(event_id=cls.event.id, job_title="waiter", slots=WORKERS, openings=WORKERS))
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        invalidate_hr_managers(COMPANY_ID)
+        redis_client.delete(HR_DIGESTS_DUE_KEY, HR_DIGESTS_PROCESSING_KEY,
+                            *[_buffer_key(hr.id, cls.event.id) for hr in cls.hr_managers])
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def _hr_notifications(self):
+        return Notification.query.filter(
+            Notification.user_id.in_([hr.id for hr in self.hr_managers]),
+            Notification.event_id == self.event.id,
+        ).all()
+
+    def test_burst_of_applications_is_sent_as_one_digest_per_hr_manager(self):
+        for worker in self.workers[:WORKERS]:
+            _, status = EventStore.apply_to_event(self.event.id, worker.id, "waiter")
+            self.assertEqual(status, 201)
+        self.assertEqual(self._hr_notifications(), [])
+
+        # Nothing is due before the window closes
+        self.assertEqual(claim_due_digests(time.time(), 100), [])
+        digests = claim_due_digests(time.time() + self.app.config["HR_DIGEST_WINDOW_SECONDS"] + 1, 100)
+        self.assertEqual(sorted(hr_id for hr_id, _, _ in digests), sorted(hr.id for hr in self.hr_managers))
+        self.assertTrue(all(len(applicants) == WORKERS for _, _, applicants in digests))
+
+        # An application arriving while the digest is sent goes into the next one
+        late = {"name": "Late Applicant", "city": "Acre", "age": 25}
+        buffer_application([self.hr_managers[0].id], self.event.id, late)
+        _send_digests(digests)
+
+        notifications = self._hr_notifications()
+        self.assertEqual(len(notifications), len(self.hr_managers))
+        self.assertTrue(all(n.message.startswith(f"{WORKERS} workers request to join Digest Event")
+                            for n in notifications))
+        self.assertEqual(self._buffered(self.hr_managers[0].id), [late])
+        self.assertEqual(redis_client.zcard(HR_DIGESTS_PROCESSING_KEY), 0)
+
+    def test_digest_claimed_again_after_a_failed_ack_is_not_resent(self):
+        hr_manager = self.hr_managers[0]
+        redis_client.delete(_buffer_key(hr_manager.id, self.event.id), HR_DIGESTS_DUE_KEY, HR_DIGESTS_PROCESSING_KEY)
+        first = {"name": "First Applicant", "city": "Acre", "age": 30}
+        buffer_application([hr_manager.id], self.event.id, first)
+        window = self.app.config["HR_DIGEST_WINDOW_SECONDS"]
+        digests = claim_due_digests(time.time() + window + 1, 100)
+        before = len(self._hr_notifications())
+
+        with patch("backend.redis.notification_worker.ack_digests", side_effect=RuntimeError("Redis went away")):
+            with self.assertRaises(RuntimeError):
+                _send_digests(digests)
+        self.assertEqual(len(self._hr_notifications()), before + 1)
+
+        # The claim expires with the buffer untouched, and another application arrives meanwhile
+        second = {"name": "Second Applicant", "city": "Acre", "age": 31}
+        buffer_application([hr_manager.id], self.event.id, second)
+        digests = claim_due_digests(time.time() + window + 3600, 100)
+        self.assertEqual([len(applicants) for _, _, applicants in digests], [2])
+        _send_digests(digests)
+
+        self.assertEqual(len(self._hr_notifications()), before + 1)
+        self.assertEqual(self._buffered(hr_manager.id), [second])
+        redis_client.delete(_buffer_key(hr_manager.id, self.event.id), HR_DIGESTS_DUE_KEY)
+
+    def _buffered(self, hr_manager_id: int) -> list:
+        entries = [json.loads(entry) for entry in redis_client.lrange(_buffer_key(hr_manager_id, self.event.id), 0, -1)]
+        return [{key: value for key, value in entry.items() if key != "id"} for entry in entries]
+
+    def test_without_a_window_hr_managers_are_notified_right_away(self):
+        self.app.config["HR_DIGEST_WINDOW_SECONDS"] = 0
+        try:
+            before = len(self._hr_notifications())
+            EventStore.apply_to_event(self.event.id, self.workers[WORKERS].id, "waiter")
+        finally:
+            self.app.config["HR_DIGEST_WINDOW_SECONDS"] = 5 * 60
+        notifications = self._hr_notifications()
+        self.assertEqual(len(notifications), before + len(self.hr_managers))
+        self.assertIn("Digest User30, from Acre", notifications[-1].message)
+
+    def test_long_digests_are_truncated(self):
+        applicants = [{"name": f"Applicant Number{i}", "city": "Beersheba", "age": 30} for i in range(200)]
+        message = application_message("Huge Event", applicants)
+        self.assertLessEqual(len(message), MAX_MESSAGE_LENGTH)
+        self.assertTrue(message.startswith("200 workers request to join Huge Event: Applicant Number0"))
+        self.assertRegex(message, r" and \d+ more\.$")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+
+from flask import jsonify
+from flask_jwt_extended import create_access_token
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.redis.redis_client import redis_client
+from backend.stores import UserStore
+from backend.utils.decorators import load_identity
+from backend.utils.identity_cache import IdentityCache, identity_cache
+from backend.utils.query_counter import count_queries
+
+
+class TestIdentityCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        # Identities are dicts, which newer flask-jwt-extended releases reject as "sub" unless told otherwise
+        cls.app.config["JWT_VERIFY_SUB"] = False
+
+        @cls.app.route("/identity_probe")
+        @load_identity
+        def identity_probe(identity):
+            return jsonify(identity.to_dict()), 200
+
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        self.app.config["IDENTITY_CACHE_ENABLED"] = True
+        self.user = User(username="identity_worker", email="identity_worker@example.com",
+                         password_hash="hashed_password", role=Role.WORKER, first_name="Identity",
+                         family_name="Worker", personal_id="identity-1", company_id="identity_company")
+        db.session.add(self.user)
+        db.session.commit()
+        identity_cache.invalidate(self.user.username)
+        self.client = self.app.test_client()
+        token = create_access_token(identity={"username": self.user.username, "role": self.user.role.value})
+        self.client.set_cookie("access_token_cookie", token)
+
+    def tearDown(self):
+        identity_cache.invalidate("identity_worker")
+        User.query.filter_by(username="identity_worker").delete()
+        db.session.commit()
+
+    def _probe(self):
+        with count_queries() as counter:
+            response = self.client.get("/identity_probe")
+        return response, counter["count"]
+
+    def test_cached_identity_skips_users_query(self):
+        response, queries = self._probe()
+        self.assertEqual(queries, 1)
+        self.assertEqual(response.get_json(), {"id": self.user.id, "username": "identity_worker",
+                                               "role": "worker", "company_id": "identity_company"})
+
+        self.assertEqual(self._probe()[1], 0)
+        # Another process only has the Redis level
+        identity_cache.clear_local()
+        response, queries = self._probe()
+        self.assertEqual(queries, 0)
+        self.assertEqual(response.get_json()["id"], self.user.id)
+
+    def test_update_user_invalidates_identity(self):
+        self._probe()
+
+        UserStore.update_user(self.user.id, {"role": Role.HR_MANAGER})
+
+        response, queries = self._probe()
+        self.assertEqual(queries, 1)
+        self.assertEqual(response.get_json()["role"], "hr_manager")
+
+    def test_delete_user_invalidates_identity(self):
+        self._probe()
+
+        UserStore.delete_user("username", self.user.username)
+
+        response, _ = self._probe()
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNone(IdentityCache().get("identity_worker"))
+
+    def test_disabled_cache_reads_the_database(self):
+        self.app.config["IDENTITY_CACHE_ENABLED"] = False
+
+        for _ in range(2):
+            response, queries = self._probe()
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(queries, 1)
+        self.assertFalse(redis_client.exists(IdentityCache._key("identity_worker")))
+
+
+if __name__ == "__main__":
+    unittest.main()
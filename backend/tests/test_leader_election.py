@@ -0,0 +1,83 @@
+import unittest
+import multiprocessing
+import os
+import signal
+import time
+
+from backend.redis.leader import LeaderLease, run_as_leader
+from backend.redis.redis_client import redis_client
+
+LEASE_NAME = "test_leader_election"
+TTL_MS = 600
+LEADERS_KEY = "test_leader_election:leaders"
+ACTIVE_KEY = "test_leader_election:active"
+OVERLAPS_KEY = "test_leader_election:overlaps"
+
+
+def _candidate():
+    lease = LeaderLease(LEASE_NAME, ttl_ms=TTL_MS)
+
+    def work(should_run):
+        redis_client.rpush(LEADERS_KEY, os.getpid())
+        while should_run():
+            # Only one process may be inside this block at any time
+            if redis_client.incr(ACTIVE_KEY) > 1:
+                redis_client.incr(OVERLAPS_KEY)
+            time.sleep(0.01)
+            redis_client.decr(ACTIVE_KEY)
+            time.sleep(0.01)
+
+    signal.signal(signal.SIGTERM, lambda *_: lease.stop())
+    run_as_leader(lease, work, poll_interval=0.05)
+
+
+class TestLeaderElection(unittest.TestCase):
+    def setUp(self):
+        redis_client.delete(f"leader:{LEASE_NAME}", LEADERS_KEY, ACTIVE_KEY, OVERLAPS_KEY)
+        self.processes = [multiprocessing.Process(target=_candidate) for _ in range(4)]
+        for process in self.processes:
+            process.start()
+
+    def tearDown(self):
+        for process in self.processes:
+            if process.is_alive():
+                process.kill()
+            process.join()
+        redis_client.delete(f"leader:{LEASE_NAME}", LEADERS_KEY, ACTIVE_KEY, OVERLAPS_KEY)
+
+    def _wait_for_leaders(self, count: int, timeout: float) -> list:
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            leaders = [int(pid) for pid in redis_client.lrange(LEADERS_KEY, 0, -1)]
+            if len(leaders) >= count:
+                return leaders
+            time.sleep(0.02)
+        self.fail(f"Expected {count} leaders within {timeout} seconds")
+
+    def _process(self, pid: int) -> multiprocessing.Process:
+        return next(process for process in self.processes if process.pid == pid)
+
+    def test_single_leader_and_failover_after_crash(self):
+        first = self._wait_for_leaders(1, timeout=5)[0]
+        time.sleep(1)
+        self.assertEqual(len(redis_client.lrange(LEADERS_KEY, 0, -1)), 1)
+
+        # A killed leader can't release its lease; another process takes over once it expires
+        killed_at = time.time()
+        self._process(first).kill()
+        redis_client.set(ACTIVE_KEY, 0)
+        second = self._wait_for_leaders(2, timeout=5)[1]
+        self.assertNotEqual(second, first)
+        self.assertLess(time.time() - killed_at, 2 * TTL_MS / 1000)
+
+        # A leader that shuts down cleanly releases its lease for an immediate takeover
+        stopped_at = time.time()
+        self._process(second).terminate()
+        self._wait_for_leaders(3, timeout=5)
+        self.assertLess(time.time() - stopped_at, TTL_MS / 1000)
+
+        self.assertEqual(int(redis_client.get(OVERLAPS_KEY) or 0), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
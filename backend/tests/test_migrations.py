@@ -0,0 +1,109 @@
+import unittest
+import datetime
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.migrations.runner import MIGRATION_LOCK_KEY, Migration, SchemaMigration, run_migrations
+from backend.migrations.versions import MIGRATIONS, create_index_concurrently
+from backend.models.event import Event
+
+TEST_VERSION = 9001
+
+
+class TestMigrations(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def tearDown(self):
+        db.session.rollback()
+        SchemaMigration.query.filter(SchemaMigration.version >= TEST_VERSION).delete()
+        db.session.commit()
+
+    def _autocommit(self):
+        return db.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+    def _index_validity(self, name):
+        return db.session.execute(text(
+            "SELECT pg_index.indisvalid FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+            "WHERE pg_class.relname = :name"
+        ), {"name": name}).scalar()
+
+    def test_new_database_gets_every_migration_once(self):
+        db.session.remove()
+        db.drop_all()
+
+        self.assertEqual(run_migrations(), [migration.version for migration in MIGRATIONS])
+        kind = db.session.execute(text("SELECT relkind FROM pg_class WHERE relname = 'notifications'")).scalar()
+        self.assertEqual(kind, "p")
+        for name in ("ix_event_users_worker_id", "ix_event_jobs_event_id_job_title", "ix_events_recruiter",
+                     "ix_events_start_datetime_id", "ix_reviews_worker_id_timestamp_id"):
+            self.assertTrue(self._index_validity(name), name)
+        db.session.commit()
+
+        self.assertEqual(run_migrations(), [])
+
+    def test_failed_migration_stays_pending(self):
+        calls = []
+
+        def fail_once(connection):
+            calls.append(connection)
+            if len(calls) == 1:
+                raise RuntimeError("interrupted")
+
+        migrations = [Migration(TEST_VERSION, "fails_once", fail_once, transactional=False)]
+        with self.assertRaises(RuntimeError):
+            run_migrations(migrations)
+        self.assertIsNone(db.session.get(SchemaMigration, TEST_VERSION))
+
+        self.assertEqual(run_migrations(migrations), [TEST_VERSION])
+        self.assertEqual(db.session.get(SchemaMigration, TEST_VERSION).name, "fails_once")
+
+    def test_nodes_wait_for_the_one_migrating(self):
+        finished = threading.Event()
+
+        def migrate():
+            with self.app.app_context():
+                run_migrations([Migration(TEST_VERSION, "noop", lambda connection: None)])
+            finished.set()
+
+        with self._autocommit() as other_node:
+            other_node.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            thread = threading.Thread(target=migrate)
+            thread.start()
+            self.assertFalse(finished.wait(0.5))
+            other_node.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        thread.join(5)
+        self.assertTrue(finished.is_set())
+
+    def test_concurrent_index_replaces_an_invalid_one(self):
+        start = datetime.datetime(2030, 1, 1)
+        for name in ("First", "Second"):
+            Event.create_event(name, "", "Tel Aviv", "Street 1", start, start + datetime.timedelta(hours=4),
+                               "migrations_hr", "0")
+        with self._autocommit() as connection:
+            connection.execute(text("DROP INDEX ix_events_recruiter"))
+            # A failed concurrent build leaves an invalid index behind
+            with self.assertRaises(IntegrityError):
+                connection.execute(text("CREATE UNIQUE INDEX CONCURRENTLY ix_events_recruiter ON events (recruiter)"))
+            self.assertFalse(self._index_validity("ix_events_recruiter"))
+            db.session.commit()
+
+            create_index_concurrently(connection, "ix_events_recruiter", "events", ["recruiter"])
+        self.assertTrue(self._index_validity("ix_events_recruiter"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import datetime
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.notification import Notification
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.stores.notification_store import NotificationStore
+from backend.utils.pagination import InvalidCursor
+from backend.utils.query_counter import count_queries
+
+
+class TestNotificationListing(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        cls.user = User(username="listing_hr", email="listing_hr@example.com", password_hash="hashed_password",
+                        role=Role.HR_MANAGER, first_name="Listing", family_name="Manager", personal_id="listing-1")
+        db.session.add(cls.user)
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        Notification.query.filter_by(user_id=self.user.id).delete()
+        db.session.commit()
+
+    def _create(self, count, **fields):
+        created = Notification.bulk_create([
+            {"user_id": self.user.id, "message": f"Request to join {i}", "is_approved": True, **fields}
+            for i in range(count)
+        ])
+        db.session.commit()
+        return [notification.id for notification in created]
+
+    def test_pages_are_newest_first_without_gaps_or_repeats(self):
+        # Rows of one INSERT share created_at with the default; the id breaks the tie
+        same_time = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=1)
+        ids = self._create(5, created_at=same_time) + self._create(7)
+
+        seen = []
+        cursor = None
+        while True:
+            page = NotificationStore.get_user_notifications(self.user.id, limit=5, cursor=cursor)
+            seen.extend(notification["id"] for notification in page["notifications"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(sorted(seen), sorted(ids))
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(seen[-5:], sorted(ids[:5], reverse=True))
+
+        with self.assertRaises(InvalidCursor):
+            NotificationStore.get_user_notifications(self.user.id, cursor="not-a-cursor")
+
+    def test_created_at_is_the_time_of_each_insert(self):
+        first = Notification.create_notification(self.user.id, "First")
+        second = Notification.create_notification(self.user.id, "Second")
+        self.assertLess(first.created_at, second.created_at)
+
+    def test_mark_read_is_one_update(self):
+        ids = self._create(50)
+        with count_queries() as counter:
+            marked = NotificationStore.mark_notifications_as_read(ids + ids[:5], self.user.id)
+        self.assertEqual(marked, 50)
+        # UPDATE ... RETURNING and commit
+        self.assertLessEqual(counter["count"], 2)
+        self.assertEqual(NotificationStore.mark_notifications_as_read(ids, self.user.id), 0)
+
+    def test_mark_all_read_up_to_an_id(self):
+        older = self._create(3)
+        awaiting_approval = self._create(1, is_approved=False)
+        newer = self._create(2)
+
+        marked = NotificationStore.mark_all_read_up_to(self.user.id, awaiting_approval[0])
+        self.assertEqual(marked, 3)
+        unread = {notification["id"]
+                  for notification in NotificationStore.get_user_notifications(self.user.id)["notifications"]}
+        self.assertEqual(unread, set(awaiting_approval + newer))
+        self.assertFalse(unread & set(older))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+import datetime
+
+from sqlalchemy import text
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.notification import Notification
+from backend.models.notification_dedup_key import NotificationDedupKey
+from backend.models.notification_partitions import (
+    TABLE, add_months, archive_notifications, create_partitions, list_partitions, month_start, partition_existing_table,
+    partition_name,
+)
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.redis.redis_client import redis_client
+from backend.redis.unread_counter import _unread_key, get_unread_count
+
+
+class TestNotificationPartitions(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        cls.user = User(username="partition_worker", email="partition_worker@example.com",
+                        password_hash="hashed_password", role=Role.WORKER, first_name="Partition",
+                        family_name="Worker", personal_id="partition-1")
+        db.session.add(cls.user)
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        redis_client.delete(_unread_key(cls.user.id))
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        Notification.query.filter_by(user_id=self.user.id).delete()
+        db.session.commit()
+        redis_client.delete(_unread_key(self.user.id))
+        self.current = month_start(datetime.datetime.now(datetime.UTC))
+
+    def _partitions(self):
+        return list_partitions(db.session.connection())
+
+    def test_create_all_creates_the_months_around_now(self):
+        partitions = self._partitions()
+        for months in range(-1, 4):
+            self.assertIn(partition_name(add_months(self.current, months)), partitions)
+
+        created = Notification.create_notification(self.user.id, "Lands in this month")
+        partition = db.session.execute(text(f"SELECT tableoid::regclass::text FROM {TABLE} WHERE id = :id"),
+                                       {"id": created.id}).scalar()
+        self.assertEqual(partition, partition_name(self.current))
+
+    def test_hot_window_skips_old_notifications(self):
+        old_month = add_months(self.current, -6)
+        create_partitions(db.session.connection(), old_month, 1)
+        old = datetime.datetime.combine(old_month, datetime.time()) + datetime.timedelta(days=1)
+        Notification.bulk_create([{"user_id": self.user.id, "message": "Old", "created_at": old}])
+        Notification.bulk_create([{"user_id": self.user.id, "message": "Recent"}])
+        db.session.commit()
+
+        self.assertEqual(Notification.count_unread(self.user.id), 1)
+        page = Notification.get_unread_page(self.user.id, limit=10)
+        self.assertEqual([notification.message for notification in page], ["Recent"])
+
+    def test_archive_drops_expired_partitions_and_creates_upcoming_ones(self):
+        expired_month = add_months(self.current, -14)
+        create_partitions(db.session.connection(), expired_month, 1)
+        expired_at = datetime.datetime.combine(expired_month, datetime.time()) + datetime.timedelta(days=2)
+        Notification.bulk_create([
+            {"user_id": self.user.id, "message": "Expired", "created_at": expired_at},
+            {"user_id": self.user.id, "message": "Kept"},
+        ])
+        NotificationDedupKey.claim(["archive-test"])
+        db.session.execute(text("UPDATE notification_dedup_keys SET created_at = :at WHERE dedup_key = 'archive-test'"),
+                           {"at": expired_at})
+        db.session.commit()
+        # The expired notification is unread but outside the hot window, so it was never counted
+        redis_client.set(_unread_key(self.user.id), 1)
+
+        now = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=62)
+        result = archive_notifications(now=now)
+
+        self.assertIn(partition_name(expired_month), result["dropped"])
+        self.assertIn(partition_name(add_months(month_start(now), 3)), result["created"])
+        partitions = self._partitions()
+        self.assertNotIn(partition_name(expired_month), partitions)
+        self.assertIn(partition_name(add_months(month_start(now), 3)), partitions)
+        self.assertEqual([notification.message for notification in
+                          Notification.query.filter_by(user_id=self.user.id).all()], ["Kept"])
+        self.assertIsNone(db.session.get(NotificationDedupKey, "archive-test"))
+        self.assertEqual(get_unread_count(self.user.id), 1)
+
+        # Running it again finds nothing to do
+        self.assertEqual(archive_notifications(now=now), {"created": [], "dropped": []})
+
+
+class TestPartitionExistingTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        cls.user = User(username="legacy_worker", email="legacy_worker@example.com",
+                        password_hash="hashed_password", role=Role.WORKER, first_name="Legacy",
+                        family_name="Worker", personal_id="legacy-1")
+        db.session.add(cls.user)
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def test_plain_table_is_converted_with_its_rows(self):
+        # The table as created before partitioning, without dedup_key
+        db.session.execute(text(f"DROP TABLE {TABLE}"))
+        db.session.execute(text(
+            f"CREATE TABLE {TABLE} (id SERIAL PRIMARY KEY, user_id INTEGER NOT NULL REFERENCES users(id), "
+            f"message VARCHAR(512) NOT NULL, is_read BOOLEAN, is_approved BOOLEAN, "
+            f"event_id INTEGER REFERENCES events(id), created_at TIMESTAMP, updated_at TIMESTAMP)"
+        ))
+        two_months_ago = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=62)
+        db.session.execute(text(
+            f"INSERT INTO {TABLE} (user_id, message, is_read, is_approved, created_at) VALUES "
+            f"(:user_id, 'Old', false, true, :old), (:user_id, 'Undated', false, true, NULL)"
+        ), {"user_id": self.user.id, "old": two_months_ago})
+        last_id = db.session.execute(text(f"SELECT max(id) FROM {TABLE}")).scalar()
+        db.session.commit()
+
+        self.assertEqual(partition_existing_table(db.session.connection()), 2)
+        db.session.commit()
+
+        kind = db.session.execute(text("SELECT relkind FROM pg_class WHERE relname = :table"),
+                                  {"table": TABLE}).scalar()
+        self.assertEqual(kind, "p")
+        self.assertIn(partition_name(month_start(two_months_ago)), list_partitions(db.session.connection()))
+        messages = {notification.message for notification in Notification.query.filter_by(user_id=self.user.id)}
+        self.assertEqual(messages, {"Old", "Undated"})
+        created = Notification.create_notification(self.user.id, "After the conversion")
+        self.assertGreater(created.id, last_id)
+
+        self.assertEqual(partition_existing_table(db.session.connection()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
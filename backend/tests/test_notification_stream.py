@@ -0,0 +1,107 @@
+import unittest
+import json
+import time
+
+from flask_jwt_extended import create_access_token
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.notification import Notification
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.redis.notification_stream import notification_multiplexer
+from backend.utils.identity_cache import identity_cache
+
+
+class TestNotificationStream(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        # Identities are dicts, which newer flask-jwt-extended releases reject as "sub" unless told otherwise
+        cls.app.config["JWT_VERIFY_SUB"] = False
+        cls.app.config["NOTIFICATION_STREAM_HEARTBEAT_SECONDS"] = 1
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        cls.users = [User(username=f"stream_user_{i}", email=f"stream_user_{i}@example.com",
+                          password_hash="hashed_password", role=Role.WORKER, first_name="Stream",
+                          family_name=f"User{i}", personal_id=f"stream-{i}")
+                     for i in range(2)]
+        db.session.add_all(cls.users)
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        for user in cls.users:
+            identity_cache.invalidate(user.username)
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def _next_notification(self, subscription, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            notification = subscription.get(timeout=0.1)
+            if notification is not None:
+                return notification
+        return None
+
+    def test_streams_share_one_subscription_and_get_only_their_users_notifications(self):
+        first = notification_multiplexer.subscribe(self.users[0].id)
+        second = notification_multiplexer.subscribe(self.users[0].id)
+        other = notification_multiplexer.subscribe(self.users[1].id)
+        try:
+            created = Notification.create_notification(self.users[0].id, "Pushed")
+            Notification.bulk_create([{"user_id": self.users[0].id, "message": "Bulk pushed"}])
+            db.session.commit()
+
+            for subscription in (first, second):
+                self.assertEqual(self._next_notification(subscription)["id"], created.id)
+                self.assertEqual(self._next_notification(subscription)["message"], "Bulk pushed")
+            self.assertIsNone(other.get(timeout=0.3))
+
+            # Rolled back notifications are never published
+            Notification.bulk_create([{"user_id": self.users[0].id, "message": "Rolled back"}])
+            db.session.rollback()
+            self.assertIsNone(first.get(timeout=0.3))
+        finally:
+            for subscription in (first, second, other):
+                notification_multiplexer.unsubscribe(subscription)
+        self.assertEqual(notification_multiplexer.subscriber_count(), 0)
+
+    def test_stream_resumes_after_the_last_id(self):
+        user = self.users[1]
+        seen = Notification.create_notification(user.id, "Seen before the disconnect")
+        missed = Notification.create_notification(user.id, "Missed while disconnected")
+        token = create_access_token(identity={"username": user.username, "role": user.role.value})
+        client = self.app.test_client()
+        client.set_cookie("access_token_cookie", token)
+
+        response = client.get(f"/notifications/stream?last_id={seen.id}", buffered=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/event-stream")
+        chunks = response.response
+        self.assertTrue(next(chunks).startswith(b"retry:"))
+        replayed = next(chunks).decode()
+        self.assertIn(f"id: {missed.id}\n", replayed)
+
+        live = Notification.create_notification(user.id, "Sent while connected")
+        event = next(chunks).decode()
+        while event.startswith(":"):
+            event = next(chunks).decode()
+        data = json.loads(event.split("data: ", 1)[1])
+        self.assertEqual(data["id"], live.id)
+        response.close()
+
+    def test_invalid_last_id_is_rejected(self):
+        user = self.users[0]
+        token = create_access_token(identity={"username": user.username, "role": user.role.value})
+        client = self.app.test_client()
+        client.set_cookie("access_token_cookie", token)
+        response = client.get("/notifications/stream?last_id=abc")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import datetime
+import time
+from unittest import mock
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.event import Event
+from backend.models.notification import Notification
+from backend.models.notification_dedup_key import NotificationDedupKey
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.redis.notification_scheduler import (
+    APPROVAL_CHECKS_KEY, APPROVAL_PROCESSING_KEY, claim_due_reminders, pending_reminders, purge_event_reminders,
+    reminder_member, _replace_reminders,
+)
+from backend.redis.notification_worker import _dispatch_batch
+from backend.redis.redis_client import redis_client
+from backend.utils.query_counter import count_queries
+
+WORKERS = 20
+
+
+class TestReminderDispatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        cls.workers = [User(username=f"dispatch_worker_{i}", email=f"dispatch_worker_{i}@example.com",
+                            password_hash="hashed_password", role=Role.WORKER, first_name="Dispatch",
+                            family_name=f"Worker{i}", personal_id=f"dispatch-{i}")
+                       for i in range(WORKERS)]
+        start = datetime.datetime.now() + datetime.timedelta(hours=1)
+        cls.event = Event(name="Dispatch Event", description="Event for reminder dispatch", city="Eilat",
+                          start_datetime=start, end_datetime=start + datetime.timedelta(hours=4),
+                          recruiter="dispatch_recruiter")
+        db.session.add_all(cls.workers + [cls.event])
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        purge_event_reminders(cls.event.id)
+        redis_client.delete(APPROVAL_CHECKS_KEY, APPROVAL_PROCESSING_KEY)
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        purge_event_reminders(self.event.id)
+        Notification.query.filter_by(event_id=self.event.id).delete()
+        NotificationDedupKey.query.filter(NotificationDedupKey.dedup_key.like(f"reminder:{self.event.id}:%")).delete()
+        db.session.commit()
+        self.now = time.time()
+        _replace_reminders(self.event.id, [], {
+            reminder_member(self.event.id, worker.id, "1_hour_before"): self.now - 1 for worker in self.workers
+        })
+
+    def _notifications(self):
+        return Notification.query.filter_by(event_id=self.event.id).all()
+
+    def test_batch_is_sent_with_one_insert_and_acknowledged(self):
+        due = claim_due_reminders(self.now, 100)
+        self.assertEqual(len(due), WORKERS)
+        with count_queries() as counter:
+            lags = _dispatch_batch(due)
+        # Events, notifications, commit
+        self.assertLessEqual(counter["count"], 3)
+
+        self.assertEqual(len(lags), WORKERS)
+        notifications = self._notifications()
+        self.assertEqual(sorted(n.user_id for n in notifications), sorted(w.id for w in self.workers))
+        self.assertEqual(pending_reminders(self.event.id), {})
+        self.assertEqual(claim_due_reminders(time.time() + 3600, 100), [])
+        checks = redis_client.zmscore(APPROVAL_CHECKS_KEY, [n.id for n in notifications])
+        self.assertNotIn(None, checks)
+
+    def test_retry_after_failed_acknowledgement_sends_nothing_twice(self):
+        due = claim_due_reminders(self.now, 100)
+        with mock.patch("backend.redis.notification_worker.ack_reminders", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                _dispatch_batch(due)
+        self.assertEqual(len(self._notifications()), WORKERS)
+
+        # The claims expire and the reminders are handed out again
+        retried = claim_due_reminders(time.time() + 3600, 100)
+        self.assertEqual(sorted(member for member, _ in retried), sorted(member for member, _ in due))
+        self.assertEqual(_dispatch_batch(retried), [])
+
+        notifications = self._notifications()
+        self.assertEqual(len(notifications), WORKERS)
+        checks = redis_client.zmscore(APPROVAL_CHECKS_KEY, [n.id for n in notifications])
+        self.assertNotIn(None, checks)
+
+
+if __name__ == "__main__":
+    unittest.main()
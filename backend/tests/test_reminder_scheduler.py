@@ -0,0 +1,234 @@
+import unittest
+import datetime
+import json
+import threading
+import time
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.event import Event
+from backend.redis.notification_scheduler import (
+    LAG_STATS_KEY, PROCESSING_KEY, WAKEUP_KEY, cancel_worker_reminders, claim_due_reminders,
+    pending_reminders,
+    get_delivery_lag_stats, record_delivery_lags, remove_reminder, schedule_reminders_for_workers,
+    parse_reminder, purge_event_reminders, reminder_member, schedule_worker_reminders, _event_index_key, _replace_reminders,
+)
+from backend.redis.maintenance import clear_reminders
+from backend.redis.redis_client import redis_client
+from backend.redis.reminder_loop import run_eta_scheduler
+
+WORKER_IDS = [9001, 9002, 9003]
+
+
+class TestReminderScheduler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        cls.start = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=3)
+        cls.event = Event(
+            name="Reminder Event",
+            description="Event for reminder scheduling",
+            city="Haifa",
+            start_datetime=cls.start,
+            end_datetime=cls.start + datetime.timedelta(hours=4),
+            recruiter="reminder_recruiter",
+        )
+        db.session.add(cls.event)
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        purge_event_reminders(cls.event.id)
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        # Event ids are reused across runs, so drop whatever an earlier run left behind
+        purge_event_reminders(self.event.id)
+
+    def _reminders_of(self, worker_id):
+        pending = pending_reminders(self.event.id)
+        return [pending[reminder_member(self.event.id, worker_id, label)]
+                for label in ("27_hours_before", "1_hour_before")
+                if reminder_member(self.event.id, worker_id, label) in pending]
+
+    def test_rescheduling_replaces_only_that_workers_reminders(self):
+        schedule_reminders_for_workers(self.event.id, WORKER_IDS, self.start)
+        schedule_worker_reminders(self.event.id, WORKER_IDS[0], self.start + datetime.timedelta(hours=1))
+
+        for worker_id in WORKER_IDS:
+            self.assertEqual(len(self._reminders_of(worker_id)), 2)
+        self.assertEqual(redis_client.hlen(_event_index_key(self.event.id)), 2 * len(WORKER_IDS))
+        # The 1_hour_before reminder of an event moved an hour later fires at the original start
+        self.assertIn(self.start.timestamp(), self._reminders_of(WORKER_IDS[0]))
+        self.assertNotIn(self.start.timestamp(), self._reminders_of(WORKER_IDS[1]))
+
+    def test_start_time_change_shifts_all_reminders_at_once(self):
+        workers = list(range(10_000, 10_500))
+        schedule_reminders_for_workers(self.event.id, workers, self.start)
+        before = pending_reminders(self.event.id)
+        self.assertEqual(len(before), 2 * len(workers))
+
+        try:
+            self.event.update_event({"start_datetime": self.start + datetime.timedelta(hours=2)})
+            after = pending_reminders(self.event.id)
+            self.assertEqual(after, {member: score + 7200 for member, score in before.items()})
+        finally:
+            self.event.update_event({"start_datetime": self.start})
+
+    def test_deleting_the_event_purges_its_reminders(self):
+        event = Event(name="Doomed Event", description="Deleted before it starts", city="Haifa",
+                      start_datetime=self.start, end_datetime=self.start + datetime.timedelta(hours=4),
+                      recruiter="reminder_recruiter")
+        db.session.add(event)
+        db.session.commit()
+        schedule_reminders_for_workers(event.id, WORKER_IDS, self.start)
+        self.assertEqual(len(pending_reminders(event.id)), 2 * len(WORKER_IDS))
+
+        Event.delete(event.id)
+
+        self.assertEqual(pending_reminders(event.id), {})
+        self.assertFalse(redis_client.exists(_event_index_key(event.id)))
+
+    def test_cancel_and_dispatch_clean_up_the_index(self):
+        schedule_reminders_for_workers(self.event.id, WORKER_IDS[:2], self.start)
+
+        cancel_worker_reminders(self.event.id, [WORKER_IDS[0]])
+        self.assertEqual(self._reminders_of(WORKER_IDS[0]), [])
+        self.assertEqual(redis_client.hlen(_event_index_key(self.event.id)), 2)
+
+        for member in pending_reminders(self.event.id):
+            remove_reminder(member)
+        self.assertEqual(self._reminders_of(WORKER_IDS[1]), [])
+        self.assertFalse(redis_client.exists(_event_index_key(self.event.id)))
+
+    def test_members_hold_only_ids(self):
+        member = reminder_member(self.event.id, WORKER_IDS[0], "1_hour_before")
+        self.assertEqual(member, f"{self.event.id}:{WORKER_IDS[0]}:1_hour_before")
+        self.assertEqual(parse_reminder(member), (self.event.id, WORKER_IDS[0], "1_hour_before"))
+        legacy = json.dumps({"worker_id": 7, "event_id": 3, "message": "Reminder", "label": "1_hour_before",
+                             "check_delay": 1200})
+        self.assertEqual(parse_reminder(legacy), (3, 7, "1_hour_before"))
+
+
+class TestReminderClaims(unittest.TestCase):
+    def setUp(self):
+        self.now = time.time()
+        self.members = [reminder_member(-1, i, "claim_test") for i in range(200)]
+        # Not due yet, must not be claimed
+        self.future = reminder_member(-1, -1, "claim_test")
+        _replace_reminders(-1, [], {**{member: self.now - 10 for member in self.members}, self.future: self.now + 3600})
+
+    def tearDown(self):
+        purge_event_reminders(-1)
+
+    def test_concurrent_claims_never_overlap(self):
+        claims = []
+        lock = threading.Lock()
+
+        def drain():
+            while True:
+                batch = claim_due_reminders(self.now, 7)
+                if not batch:
+                    return
+                with lock:
+                    claims.extend(member for member, _ in batch)
+
+        threads = [threading.Thread(target=drain) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(claims), len(set(claims)))
+        self.assertEqual(set(claims), set(self.members))
+        self.assertIn(self.future, pending_reminders(-1))
+
+    def test_expired_claims_are_handed_out_again(self):
+        claimed = [member for member, _ in claim_due_reminders(self.now, 10, claim_timeout=5)]
+        remove_reminder(claimed[0])
+
+        self.assertNotIn(claimed[1], [member for member, _ in claim_due_reminders(self.now + 1, 1000)])
+        redelivered = [member for member, _ in claim_due_reminders(self.now + 10, 10)]
+        self.assertEqual(set(redelivered), set(claimed[1:]))
+        self.assertIsNone(redis_client.zscore(PROCESSING_KEY, claimed[0]))
+
+    def test_reminders_are_sharded_into_hourly_buckets(self):
+        later = {reminder_member(-1, 1000 + hour, "claim_test"): self.now + hour * 3600 for hour in range(1, 6)}
+        _replace_reminders(-1, [], later)
+        buckets = {redis_client.hget(_event_index_key(-1), member) for member in later}
+        self.assertEqual(len(buckets), 5)
+        self.assertTrue(all(0 < redis_client.ttl(bucket) for bucket in buckets))
+
+        claimed = {member for member, _ in claim_due_reminders(self.now, 1000)}
+        self.assertEqual(claimed, set(self.members))
+        self.assertEqual(len(pending_reminders(-1)), len(later) + 1)
+
+        claimed = {member for member, _ in claim_due_reminders(self.now + 3 * 3600, 1000)}
+        self.assertTrue({member for member, score in later.items() if score <= self.now + 3 * 3600} <= claimed)
+        self.assertEqual(set(pending_reminders(-1)),
+                         {member for member, score in later.items() if score > self.now + 3 * 3600})
+
+
+class TestEtaScheduler(unittest.TestCase):
+    def setUp(self):
+        clear_reminders(confirm=True)
+        self.enqueued = []
+
+    def tearDown(self):
+        cancel_worker_reminders(-1, [1, 2])
+        redis_client.delete(WAKEUP_KEY)
+
+    def _start_scheduler(self):
+        thread = threading.Thread(target=run_eta_scheduler, kwargs={
+            "enqueue": lambda: self.enqueued.append(time.time()),
+            "max_sleep": 30,
+            "should_run": lambda: not self.enqueued,
+        })
+        thread.start()
+        return thread
+
+    def _schedule(self, worker_id, due_at):
+        member = reminder_member(-1, worker_id, "1_hour_before")
+        _replace_reminders(-1, [worker_id], {member: due_at})
+
+    def test_dispatch_is_enqueued_when_the_reminder_is_due(self):
+        due_at = time.time() + 0.5
+        self._schedule(1, due_at)
+        self._start_scheduler().join(timeout=5)
+
+        self.assertEqual(len(self.enqueued), 1)
+        self.assertGreaterEqual(self.enqueued[0], due_at)
+        self.assertLess(self.enqueued[0] - due_at, 0.5)
+
+    def test_earlier_reminder_wakes_the_scheduler(self):
+        self._schedule(1, time.time() + 3600)
+        thread = self._start_scheduler()
+        time.sleep(0.2)
+        due_at = time.time()
+        self._schedule(2, due_at)
+        thread.join(timeout=5)
+
+        self.assertEqual(len(self.enqueued), 1)
+        self.assertLess(self.enqueued[0] - due_at, 0.5)
+
+    def test_delivery_lag_is_recorded(self):
+        redis_client.delete(LAG_STATS_KEY)
+        record_delivery_lags([0.5, 2.0, 400.0])
+
+        stats = get_delivery_lag_stats()
+        self.assertEqual(stats["count"], 3)
+        self.assertAlmostEqual(stats["mean_seconds"], 134.1666, places=3)
+        self.assertEqual(stats["max_seconds"], 400.0)
+        self.assertEqual(stats["buckets"]["le_1"], 1)
+        self.assertEqual(stats["buckets"]["le_5"], 1)
+        self.assertEqual(stats["buckets"]["le_inf"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
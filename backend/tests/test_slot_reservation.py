@@ -0,0 +1,132 @@
+import unittest
+import datetime
+import threading
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.event import Event
+from backend.models.event_job import EventJob
+from backend.models.event_users import EventUsers, WorkerStatus
+from backend.models.roles import Role
+from backend.models.user import User
+
+THREADS = 40
+SLOTS = 10
+
+
+class TestSlotReservationConcurrency(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        start = datetime.datetime.now() + datetime.timedelta(days=3)
+        cls.event = Event(
+            name="Popular Event",
+            description="Everyone wants in",
+            city="Eilat",
+            start_datetime=start,
+            end_datetime=start + datetime.timedelta(hours=5),
+            recruiter="stress_recruiter",
+        )
+        db.session.add(cls.event)
+        db.session.commit()
+
+        cls.workers = [
+            User(
+                username=f"stress_worker_{i}",
+                email=f"stress_worker_{i}@example.com",
+                password_hash="hashed_password",
+                role=Role.WORKER,
+                first_name="Stress",
+                family_name=f"Worker{i}",
+                personal_id=f"{700000000 + i}",
+            )
+            for i in range(THREADS)
+        ]
+        db.session.add_all(cls.workers)
+        db.session.commit()
+        cls.worker_ids = [worker.id for worker in cls.workers]
+        cls.event_id = cls.event.id
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def _create_job(self, title: str, slots: int = SLOTS) -> int:
+        job = EventJob.create_event_job(event_id=self.event_id, job_title=title, slots=slots)
+        return job.id
+
+    def _run_concurrently(self, target, args_list) -> list:
+        barrier = threading.Barrier(len(args_list))
+        results = [None] * len(args_list)
+
+        def run(index, args):
+            with self.app.app_context():
+                barrier.wait()
+                try:
+                    results[index] = target(*args)
+                except Exception as e:
+                    results[index] = e
+                finally:
+                    db.session.remove()
+
+        threads = [threading.Thread(target=run, args=(i, args)) for i, args in enumerate(args_list)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_reserve_opening_never_oversells(self):
+        job_id = self._create_job("bartender")
+
+        def reserve():
+            remaining = EventJob.reserve_opening(job_id)
+            db.session.commit()
+            return remaining
+
+        results = self._run_concurrently(reserve, [()] * THREADS)
+
+        reserved = [r for r in results if r is not None]
+        self.assertEqual(len(reserved), SLOTS)
+        self.assertEqual(sorted(reserved), list(range(SLOTS)))
+        db.session.expire_all()
+        self.assertEqual(db.session.get(EventJob, job_id).openings, 0)
+
+    def test_concurrent_approvals_fill_job_exactly(self):
+        job_id = self._create_job("usher")
+
+        results = self._run_concurrently(
+            EventUsers.assign_worker,
+            [(self.event_id, worker_id, job_id, WorkerStatus.APPROVED) for worker_id in self.worker_ids],
+        )
+
+        failures = [r for r in results if isinstance(r, Exception)]
+        self.assertEqual(len(failures), THREADS - SLOTS)
+        self.assertTrue(all(isinstance(r, ValueError) for r in failures))
+        db.session.expire_all()
+        approved = EventUsers.query.filter_by(event_id=self.event_id, job_id=job_id,
+                                              status=WorkerStatus.APPROVED).count()
+        self.assertEqual(approved, SLOTS)
+        self.assertEqual(db.session.get(EventJob, job_id).openings, 0)
+
+    def test_moving_job_returns_old_slot(self):
+        old_job_id = self._create_job("cook", slots=1)
+        new_job_id = self._create_job("waiter", slots=1)
+        worker_id = self.worker_ids[0]
+
+        EventUsers.assign_worker(self.event_id, worker_id, old_job_id, WorkerStatus.APPROVED)
+        EventUsers.assign_worker(self.event_id, worker_id, new_job_id, WorkerStatus.APPROVED)
+
+        db.session.expire_all()
+        self.assertEqual(db.session.get(EventJob, old_job_id).openings, 1)
+        self.assertEqual(db.session.get(EventJob, new_job_id).openings, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
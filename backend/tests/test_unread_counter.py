@@ -0,0 +1,96 @@
+import unittest
+
+from flask_jwt_extended import create_access_token
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.notification import Notification
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.redis.redis_client import redis_client
+from backend.redis.unread_counter import _unread_key, get_unread_count, reconcile_unread_counts
+from backend.stores.notification_store import NotificationStore
+from backend.utils.identity_cache import identity_cache
+from backend.utils.query_counter import count_queries
+
+
+class TestUnreadCounter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        # Identities are dicts, which newer flask-jwt-extended releases reject as "sub" unless told otherwise
+        cls.app.config["JWT_VERIFY_SUB"] = False
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        cls.user = User(username="unread_worker", email="unread_worker@example.com", password_hash="hashed_password",
+                        role=Role.WORKER, first_name="Unread", family_name="Worker", personal_id="unread-1")
+        db.session.add(cls.user)
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        redis_client.delete(_unread_key(cls.user.id))
+        identity_cache.invalidate(cls.user.username)
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        Notification.query.filter_by(user_id=self.user.id).delete()
+        db.session.commit()
+        redis_client.delete(_unread_key(self.user.id))
+
+    def test_counter_is_seeded_once_and_follows_changes(self):
+        Notification.create_notification(self.user.id, "Before the counter")
+        self.assertIsNone(get_unread_count(self.user.id))
+        self.assertEqual(NotificationStore.get_unread_count(self.user.id), 1)
+
+        created = Notification.create_notification(self.user.id, "First")
+        Notification.bulk_create([{"user_id": self.user.id, "message": f"Bulk {i}"} for i in range(3)])
+        db.session.commit()
+        self.assertEqual(get_unread_count(self.user.id), 5)
+
+        NotificationStore.mark_notifications_as_read([created.id], self.user.id)
+        # Marking it again changes nothing
+        NotificationStore.mark_notifications_as_read([created.id], self.user.id)
+        self.assertEqual(get_unread_count(self.user.id), 4)
+
+        unread = Notification.query.filter_by(user_id=self.user.id, is_read=False).all()
+        NotificationStore.update_notification(unread[0].id, {"is_approved": True, "is_read": True})
+        Notification.bulk_mark_read([notification.id for notification in unread])
+        db.session.commit()
+        self.assertEqual(get_unread_count(self.user.id), 0)
+
+    def test_rolled_back_changes_are_not_counted(self):
+        self.assertEqual(NotificationStore.get_unread_count(self.user.id), 0)
+        Notification.bulk_create([{"user_id": self.user.id, "message": "Rolled back"}])
+        db.session.rollback()
+        Notification.create_notification(self.user.id, "Kept")
+        self.assertEqual(get_unread_count(self.user.id), 1)
+
+    def test_reconciliation_corrects_drift(self):
+        Notification.create_notification(self.user.id, "Counted")
+        self.assertEqual(NotificationStore.get_unread_count(self.user.id), 1)
+        redis_client.set(_unread_key(self.user.id), 7)
+
+        self.assertGreaterEqual(reconcile_unread_counts(Notification.count_unread_by_user), 1)
+        self.assertEqual(get_unread_count(self.user.id), 1)
+
+    def test_endpoint_serves_the_count_without_queries(self):
+        Notification.create_notification(self.user.id, "Badge")
+        token = create_access_token(identity={"username": self.user.username, "role": self.user.role.value})
+        client = self.app.test_client()
+        client.set_cookie("access_token_cookie", token)
+        client.get("/notifications/unread_count")  # warm up the identity cache and the counter
+
+        with count_queries() as counter:
+            response = client.get("/notifications/unread_count")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"unread_count": 1})
+        self.assertEqual(counter["count"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import unittest
+from unittest.mock import patch
+
+from flask_jwt_extended import create_access_token
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.stores import UserStore
+
+
+def signup_data(name: str, personal_id: str = None, role: Role = Role.WORKER, **overrides) -> dict:
+    data = {
+        "username": f"signup_{name}",
+        "password": "password123",
+        "email": f"signup_{name}@example.com",
+        "role": role,
+        "first_name": "Signup",
+        "family_name": name.capitalize(),
+        "birthdate": None,
+        "phone_number": None,
+        "personal_id": personal_id,
+        "company_id": "signup_company",
+        "company_name": None,
+        "city": "Haifa",
+    }
+    data.update(overrides)
+    return data
+
+
+class TestUserSignup(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        # Identities are dicts, which newer flask-jwt-extended releases reject as "sub" unless told otherwise
+        cls.app.config["JWT_VERIFY_SUB"] = False
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        UserStore.create_user(signup_data("existing", personal_id="100000001"))
+        UserStore.create_user(signup_data("admin", personal_id="100000002", role=Role.ADMIN))
+        UserStore.create_user(signup_data("hr", personal_id="100000003", role=Role.HR_MANAGER))
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def tearDown(self):
+        User.query.filter(User.username.like("signup_new%")).delete(synchronize_session=False)
+        db.session.commit()
+
+    def _client(self, name: str):
+        user = User.find_by({"username": f"signup_{name}"})
+        client = self.app.test_client()
+        client.set_cookie("access_token_cookie",
+                          create_access_token(identity={"username": user.username, "role": user.role.value}))
+        return client
+
+    def _created(self, *names) -> list:
+        return [name for name in names if User.find_by({"username": f"signup_{name}"})]
+
+    def test_create_user_reports_every_taken_field(self):
+        response, status = UserStore.create_user(signup_data("existing", personal_id="100000009"))
+
+        self.assertEqual(status, 400)
+        self.assertEqual(response.get_json(), {"message": "Username already exists, Email already exists"})
+
+        response, status = UserStore.create_user(
+            signup_data("new_1", personal_id="100000001", email="signup_existing@example.com"))
+        self.assertEqual(status, 400)
+        self.assertEqual(response.get_json(), {"message": "Email already exists, Personal ID already exists"})
+        self.assertEqual(self._created("new_1"), [])
+
+    def test_signup_route_rejects_duplicates(self):
+        data = signup_data("existing", personal_id="100000009", role="worker")
+
+        response = self.app.test_client().post("/users/signup", json=data)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {"message": "Username already exists, Email already exists"})
+
+    def test_bulk_reports_duplicates_per_row(self):
+        response, status = UserStore.bulk_create_users([
+            signup_data("existing", personal_id="200000000"),
+            signup_data("new_1", personal_id="200000001"),
+            signup_data("new_2", personal_id="200000001", email="signup_new_1@example.com"),
+            signup_data("new_3", personal_id="200000003"),
+        ])
+
+        self.assertEqual(status, 400)
+        self.assertEqual(response.get_json()["errors"], [
+            {"index": 2, "error": "Email already exists in this batch"},
+            {"index": 2, "error": "Personal ID already exists in this batch"},
+            {"index": 0, "error": "Username already exists"},
+            {"index": 0, "error": "Email already exists"},
+        ])
+        self.assertEqual(self._created("new_1", "new_2", "new_3"), [])
+
+    def test_bulk_accepts_rows_without_personal_id(self):
+        response, status = UserStore.bulk_create_users([signup_data("new_1"), signup_data("new_2", personal_id="")])
+
+        self.assertEqual(status, 201, response.get_json())
+        self.assertEqual(self._created("new_1", "new_2"), ["new_1", "new_2"])
+
+    def test_bulk_creates_nothing_when_an_insert_conflicts(self):
+        users = [signup_data("new_1", personal_id="300000001"),
+                 signup_data("new_2", personal_id="300000002", username="signup_existing")]
+
+        # A user created between the check and the insert
+        with patch.object(User, "find_taken_values", return_value={"username": set(), "email": set(),
+                                                                   "personal_id": set()}):
+            response, status = UserStore.bulk_create_users(users)
+
+        self.assertEqual(status, 409)
+        self.assertEqual(response.get_json(), {"error": "Some users were created concurrently, nothing was imported"})
+        self.assertEqual(self._created("new_1", "new_2"), [])
+
+    def test_bulk_signup_route(self):
+        users = [signup_data(f"new_{i}", personal_id=f"40000000{i}", role="worker") for i in range(3)]
+
+        response = self._client("hr").post("/users/bulk_signup", json={"users": users})
+
+        self.assertEqual(response.status_code, 201, response.get_json())
+        self.assertEqual(self._created("new_0", "new_1", "new_2"), ["new_0", "new_1", "new_2"])
+        self.assertTrue(User.find_by({"username": "signup_new_0"}).check_password("password123"))
+
+    def test_bulk_signup_by_hr_manager_uses_their_company(self):
+        users = [signup_data("new_1", personal_id="600000001", role="worker", company_id=None)]
+
+        response = self._client("hr").post("/users/bulk_signup", json={"users": users})
+
+        self.assertEqual(response.status_code, 201, response.get_json())
+        self.assertEqual(User.find_by({"username": "signup_new_1"}).company_id, "signup_company")
+
+    def test_bulk_signup_route_reports_duplicates_and_roles(self):
+        client = self._client("hr")
+
+        response = client.post("/users/bulk_signup", json={"users": [
+            signup_data("new_1", personal_id="500000001", role="worker"),
+            signup_data("new_2", personal_id="500000002", role="admin")]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {"errors": [{"index": 1, "error": "HR managers can only import workers"}]})
+
+        response = client.post("/users/bulk_signup", json={"users": [
+            signup_data("new_1", personal_id="500000001", role="worker"),
+            signup_data("new_1", personal_id="500000002", role="worker", email="signup_new_2@example.com")]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {"errors": [{"index": 1, "error": "Username already exists in this batch"}]})
+        self.assertEqual(self._created("new_1", "new_2"), [])
+
+        response = client.post("/users/bulk_signup", json={"users": [
+            signup_data("new_1", personal_id="500000001", role="worker", company_id="other_company")]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {"errors": [
+            {"index": 0, "error": "HR managers can only import workers of their own company"}]})
+        self.assertEqual(self._created("new_1", "new_2"), [])
+
+        response = self._client("existing").post("/users/bulk_signup", json={"users": [signup_data("new_1", role="worker")]})
+        self.assertEqual(response.status_code, 403)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import datetime
+import time
+
+from backend.db import db
+from backend.core.app_factory import create_app
+from backend.models.event import Event
+from backend.models.reviews import Review
+from backend.models.roles import Role
+from backend.models.user import User
+from backend.redis.company_directory import invalidate_hr_managers
+from backend.redis.profile_cache import invalidate_profile_summary
+from backend.stores import UserStore
+
+COMPANY_ID = "profile_company"
+
+
+class TestWorkerProfile(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+
+        cls.worker = User(
+            username="profile_worker",
+            email="profile_worker@example.com",
+            password_hash="hashed_password",
+            role=Role.WORKER,
+            first_name="Profile",
+            family_name="Worker",
+            personal_id="640000001",
+            birthdate="01/01/1990",
+            company_id=COMPANY_ID,
+        )
+        cls.hr = User(
+            username="profile_hr",
+            email="profile_hr@example.com",
+            password_hash="hashed_password",
+            role=Role.HR_MANAGER,
+            first_name="Profile",
+            family_name="Hr",
+            personal_id="640000002",
+            phone_number="0500000000",
+            company_id=COMPANY_ID,
+        )
+        start = datetime.datetime.now() - datetime.timedelta(days=1)
+        cls.event = Event(
+            name="Reviewed Event",
+            description="Event the worker was reviewed for",
+            city="Haifa",
+            start_datetime=start,
+            end_datetime=start + datetime.timedelta(hours=4),
+            recruiter="profile_recruiter",
+        )
+        db.session.add_all([cls.worker, cls.hr, cls.event])
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        invalidate_profile_summary(cls.worker.id)
+        invalidate_hr_managers(COMPANY_ID)
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        invalidate_profile_summary(self.worker.id)
+        invalidate_hr_managers(COMPANY_ID)
+
+    def _profile(self, limit: int = 20, cursor: str = None) -> dict:
+        response, status = UserStore.get_worker_profile(self.worker.id, limit=limit, cursor=cursor)
+        self.assertEqual(status, 200)
+        return response.get_json()
+
+    def test_reviews_are_paged_newest_first(self):
+        started = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        for i in range(5):
+            Review.add_review(self.worker.id, self.hr.id, f"Review {i}", self.event.id)
+            time.sleep(0.01)
+
+        texts, timestamps = [], []
+        cursor = None
+        while True:
+            page = self._profile(limit=2, cursor=cursor)
+            texts.extend(review["review_text"] for review in page["reviews"])
+            timestamps.extend(datetime.datetime.fromisoformat(review["timestamp"]) for review in page["reviews"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(texts, [f"Review {i}" for i in reversed(range(5))])
+        # Each review is stamped when it is written, not when the model was imported
+        self.assertEqual(timestamps, sorted(set(timestamps), reverse=True))
+        self.assertGreaterEqual(min(timestamps), started)
+
+    def test_hr_manager_change_shows_in_cached_profile(self):
+        self.assertEqual(self._profile()["hr_manager_phone"], "0500000000")
+
+        UserStore.update_user(self.hr.id, {"phone_number": "0511111111"})
+        try:
+            profile = self._profile()
+            self.assertEqual(profile["hr_manager_name"], "Profile Hr")
+            self.assertEqual(profile["hr_manager_phone"], "0511111111")
+        finally:
+            UserStore.update_user(self.hr.id, {"phone_number": "0500000000"})
+
+
+if __name__ == "__main__":
+    unittest.main()
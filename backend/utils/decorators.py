@@ -1,28 +1,40 @@
 from flask_jwt_extended import jwt_required, get_jwt
 from functools import wraps
-from flask import jsonify
+from flask import jsonify, current_app
 from backend.models.roles import has_permission, Permission
 from backend.stores import UserStore
+from backend.utils.identity_cache import identity_cache, UserIdentity
 
 
-def load_user(fn):
+def load_identity(fn):
+    """
+    Passes the authenticated user's cached UserIdentity (id, username, role, company_id) to the
+    handler, so most requests never touch the users table. Handlers that need the full user
+    load it with UserStore.find_user.
+    """
     @wraps(fn)
     @jwt_required()
     def wrapper(*args, **kwargs):
         jwt_data = get_jwt().get("sub", {})
         if not jwt_data or "username" not in jwt_data:
             return jsonify({"error": "Authentication required"}), 401
-        user = UserStore.find_user("username", jwt_data["username"])
-        if not user:
-            return jsonify({"error": "User not found"}), 404
-        return fn(user, *args, **kwargs)
+        use_cache = current_app.config.get("IDENTITY_CACHE_ENABLED", True)
+        identity = identity_cache.get(jwt_data["username"]) if use_cache else None
+        if identity is None:
+            user = UserStore.find_user("username", jwt_data["username"])
+            if not user:
+                return jsonify({"error": "User not found"}), 404
+            identity = UserIdentity.from_user(user)
+            if use_cache:
+                identity_cache.set(identity)
+        return fn(identity, *args, **kwargs)
 
     return wrapper
 
 
 def permission_required(permission: Permission):
     """
-    Decorator that checks if the current user (provided by load_user)
+    Decorator that checks if the current user (provided by load_identity)
     has the required permission.
     """
     def decorator(fn):
@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from redis.exceptions import RedisError
+
+from backend.models.roles import Role
+from backend.redis.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+IDENTITY_KEY_PREFIX = "user_identity"
+LOCAL_TTL_SECONDS = 30
+REDIS_TTL_SECONDS = 15 * 60
+LOCAL_MAX_SIZE = 10_000
+
+
+class UserIdentity:
+    """
+    The fields of a user that request handlers need for authorization.
+    Handlers that need anything else should load the user with UserStore.find_user.
+    """
+    __slots__ = ("id", "username", "role", "company_id")
+
+    def __init__(self, id: int, username: str, role: Role, company_id: Optional[str]):
+        self.id = id
+        self.username = username
+        self.role = role
+        self.company_id = company_id
+
+    @classmethod
+    def from_user(cls, user) -> "UserIdentity":
+        return cls(user.id, user.username, user.role, user.company_id)
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "username": self.username,
+            "role": self.role.value,
+            "company_id": self.company_id or "",
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "UserIdentity":
+        return cls(int(data["id"]), data["username"], Role(data["role"]), data["company_id"] or None)
+
+
+class IdentityCache:
+    """
+    Two-level cache of user identities keyed by username: an in-process LRU with a short TTL
+    in front of Redis, which is shared by all processes. Invalidation clears both levels in the
+    calling process; other processes may keep serving their local copy for up to the local TTL.
+    """
+
+    def __init__(self, local_ttl: int = LOCAL_TTL_SECONDS, redis_ttl: int = REDIS_TTL_SECONDS,
+                 max_size: int = LOCAL_MAX_SIZE):
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(username: str) -> str:
+        return f"{IDENTITY_KEY_PREFIX}:{username}"
+
+    def get(self, username: str) -> Optional[UserIdentity]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry:
+                identity, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(username)
+                    return identity
+                del self._entries[username]
+
+        try:
+            data = redis_client.hgetall(self._key(username))
+        except RedisError as e:
+            logger.warning(f"Identity cache unavailable: {e}")
+            return None
+        if not data:
+            return None
+        identity = UserIdentity.from_dict(data)
+        self._set_local(identity)
+        return identity
+
+    def set(self, identity: UserIdentity) -> None:
+        self._set_local(identity)
+        try:
+            pipeline = redis_client.pipeline()
+            pipeline.hset(self._key(identity.username), mapping=identity.to_dict())
+            pipeline.expire(self._key(identity.username), self.redis_ttl)
+            pipeline.execute()
+        except RedisError as e:
+            logger.warning(f"Failed to cache identity of {identity.username}: {e}")
+
+    def invalidate(self, username: str) -> None:
+        with self._lock:
+            self._entries.pop(username, None)
+        try:
+            redis_client.delete(self._key(username))
+        except RedisError as e:
+            logger.error(f"Failed to invalidate identity of {username}: {e}")
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _set_local(self, identity: UserIdentity) -> None:
+        with self._lock:
+            self._entries[identity.username] = (identity, time.monotonic() + self.local_ttl)
+            self._entries.move_to_end(identity.username)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+identity_cache = IdentityCache()
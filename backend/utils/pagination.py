@@ -0,0 +1,47 @@
+import base64
+import json
+from typing import Any, List, Optional
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Packs the sort key of the last row of a page into an opaque, URL-safe token.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    """
+    Unpacks a token created by encode_cursor, checking it holds `size` values.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def parse_limit(value: Optional[str], default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    """
+    Parses the `limit` query parameter, clamping it to `maximum`.
+    """
+    if value is None or value == "":
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError("'limit' must be an integer")
+    if limit < 1:
+        raise ValueError("'limit' must be positive")
+    return min(limit, maximum)
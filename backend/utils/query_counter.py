@@ -0,0 +1,59 @@
+from contextlib import contextmanager
+
+from flask import Flask, g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    if has_app_context():
+        g.query_count = g.get("query_count", 0) + 1
+
+
+def get_query_count() -> int:
+    """
+    Returns the number of SQL statements executed in the current request (or app context).
+    """
+    return g.get("query_count", 0) if has_app_context() else 0
+
+
+@contextmanager
+def count_queries():
+    """
+    Counts the SQL statements executed inside the block.
+
+    Usage:
+        with count_queries() as counter:
+            EventStore.get_all_events()
+        print(counter["count"])
+    """
+    counter = {"count": 0}
+    start = get_query_count()
+    try:
+        yield counter
+    finally:
+        counter["count"] = get_query_count() - start
+
+
+def init_query_counter(app: Flask) -> None:
+    """
+    Counts the queries issued by every request. They are reported in the X-Query-Count header
+    only if QUERY_COUNT_HEADER_ENABLED is set or the app runs in debug mode, so production
+    responses don't expose them.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _count_query):
+        event.listen(Engine, "before_cursor_execute", _count_query)
+    if app.config.get("QUERY_COUNT_HEADER_ENABLED") or app.debug:
+        enable_query_count_header(app)
+
+
+def enable_query_count_header(app: Flask) -> None:
+    """
+    Reports the queries of every request in the X-Query-Count header. Call before the app serves requests.
+    """
+    @app.after_request
+    def add_query_count_header(response):
+        response.headers[QUERY_COUNT_HEADER] = str(get_query_count())
+        return response
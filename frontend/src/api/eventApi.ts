@@ -181,12 +181,22 @@ export const generateDescription = async (prompt: string): Promise<string> => {
     }
 };
 
-export const getEventsFeed = async (): Promise<MyEventScheme[]> => {
+export interface EventsFeedPage {
+    events: MyEventScheme[];
+    // Pass to getEventsFeed for the next page; null on the last page
+    next_cursor: string | null;
+}
+
+export const getEventsFeed = async (cursor?: string): Promise<EventsFeedPage> => {
     try {
         const response = await axios.get(`${API_BASE_URL}/events/feed`, {
             withCredentials: true,
+            params: cursor ? { cursor } : undefined,
         });
-        return response.data.map((event: RecievedEvent) => convertRecivedEventToMyEvent(event));
+        return {
+            events: response.data.events.map((event: RecievedEvent) => convertRecivedEventToMyEvent(event)),
+            next_cursor: response.data.next_cursor ?? null,
+        };
     } catch (error) {
         if (axios.isAxiosError(error)) {
             if (error.response?.status === 401) {
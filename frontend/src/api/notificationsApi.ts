@@ -11,6 +11,11 @@ export interface Notification {
     is_approved: boolean;
 }
   
+export interface NotificationsPage {
+    notifications: Notification[];
+    next_cursor: string | null;
+}
+  
 interface CreateNotificationRequest {
     message: string;
 }
@@ -24,11 +29,12 @@ const axiosInstance = axios.create({
     withCredentials: true,
 });
   
-export async function getUserNotifications(): Promise<Notification[]> {
+export async function getUserNotifications(cursor?: string): Promise<NotificationsPage> {
     try {
       // Fixed: Use the specific notifications endpoint instead of root endpoint
-      const response = await axiosInstance.get<Notification[]>('/notifications');
-      console.log("response: ", response);
+      const response = await axiosInstance.get<NotificationsPage>('/notifications', {
+        params: cursor ? { cursor } : undefined
+      });
       return response.data;
     } catch (error) {
       if (axios.isAxiosError(error)) {
@@ -38,6 +44,32 @@ export async function getUserNotifications(): Promise<Notification[]> {
     }
 }
   
+export async function getUnreadCount(): Promise<number> {
+    try {
+      const response = await axiosInstance.get<{unread_count: number}>('/notifications/unread_count');
+      return response.data.unread_count;
+    } catch (error) {
+      if (axios.isAxiosError(error)) {
+        throw new Error(error.response?.data?.error || 'Failed to fetch unread notification count');
+      }
+      throw error;
+    }
+}
+  
+// Calls onNotification for every new notification of the current user, pushed by the server.
+// The browser reconnects on its own and resumes after the last notification it got.
+export function subscribeToNotifications(
+    onNotification: (notification: Notification) => void,
+    lastId?: number
+): () => void {
+    const query = lastId !== undefined ? `?last_id=${lastId}` : '';
+    const source = new EventSource(`${API_BASE_URL}/notifications/stream${query}`, { withCredentials: true });
+    source.addEventListener('notification', (event) => {
+      onNotification(JSON.parse((event as MessageEvent).data));
+    });
+    return () => source.close();
+}
+  
 export async function createNotification(request: CreateNotificationRequest): Promise<Notification> {
     try {
       // Fixed: Use the specific notifications endpoint for creating notifications
@@ -66,6 +98,20 @@ export async function markNotificationsAsRead(notificationIds: number[]): Promis
   }
 }
 
+export async function markAllNotificationsAsRead(upToId: number): Promise<{message: string}> {
+  try {
+    const response = await axiosInstance.post<{message: string}>('/notifications/mark_all_read', {
+      up_to_id: upToId
+    });
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.error || 'Failed to mark notifications as read');
+    }
+    throw error;
+  }
+}
+
 export async function approveNotification(notificationId: number, eventId: number | null): Promise<{message: string}> {
   try {
     const response = await axiosInstance.put<{message: string}>(
@@ -32,7 +32,10 @@ import MarkAsReadIcon from '@mui/icons-material/CheckCircle';
 
 import { 
   getUserNotifications, 
+  getUnreadCount,
+  subscribeToNotifications,
   markNotificationsAsRead, 
+  markAllNotificationsAsRead,
   approveNotification, 
   handleNotificationDismissal, 
   Notification 
@@ -194,6 +197,8 @@ const NotificationItem: React.FC<NotificationItemProps> = ({ notification, onCli
 };
 
 const NOTIFICATION_REFETCH_INTERVAL = 60000; // 1 minute
+// New notifications are pushed over the notifications stream, polling only catches up if it drops
+const UNREAD_COUNT_REFETCH_INTERVAL = 60000; // 1 minute, served from a Redis counter
 
 const NotificationsMenu: React.FC = () => {
   const [anchorEl, setAnchorEl] = useState<HTMLButtonElement | null>(null);
@@ -226,14 +231,36 @@ const NotificationsMenu: React.FC = () => {
     refetch
   } = useQuery(
     'notifications', 
-    getUserNotifications,
+    // The menu shows the newest page of unread notifications
+    async () => (await getUserNotifications()).notifications,
     {
       staleTime: NOTIFICATION_REFETCH_INTERVAL,
-      refetchInterval: NOTIFICATION_REFETCH_INTERVAL,
       refetchOnWindowFocus: true
     }
   );
 
+  // Poll the cheap unread count for the badge and reload the list only when it changes
+  const { data: unreadCount = 0 } = useQuery(
+    'notificationsUnreadCount',
+    getUnreadCount,
+    {
+      refetchInterval: UNREAD_COUNT_REFETCH_INTERVAL,
+      refetchOnWindowFocus: true
+    }
+  );
+
+  useEffect(() => {
+    queryClient.invalidateQueries('notifications');
+  }, [unreadCount, queryClient]);
+
+  // New notifications are pushed over SSE; refresh the list and the badge when one arrives
+  useEffect(() => {
+    return subscribeToNotifications(() => {
+      queryClient.invalidateQueries('notifications');
+      queryClient.invalidateQueries('notificationsUnreadCount');
+    });
+  }, [queryClient]);
+
   // Check for unapproved notifications when notifications are fetched
   useEffect(() => {
     const unapprovedNotification = notifications.find(notif => notif.is_approved === false);
@@ -243,8 +270,6 @@ const NotificationsMenu: React.FC = () => {
     }
   }, [notifications, dialogOpen]);
 
-  const unreadCount = notifications.filter(notif => !notif.is_read && notif.is_approved).length;
-
   const handleClick = (event: React.MouseEvent<HTMLButtonElement>) => {
     setAnchorEl(event.currentTarget);
     // Refresh notifications when opening the menu
@@ -278,6 +303,7 @@ const NotificationsMenu: React.FC = () => {
         
         // Refresh notifications data
         refetch();
+        queryClient.invalidateQueries('notificationsUnreadCount');
         
         // Check for any other pending notifications
         setTimeout(() => {
@@ -313,6 +339,7 @@ const NotificationsMenu: React.FC = () => {
         
         // Refresh notifications data
         refetch();
+        queryClient.invalidateQueries('notificationsUnreadCount');
         
         // Check for any other pending notifications
         setTimeout(() => {
@@ -344,20 +371,19 @@ const NotificationsMenu: React.FC = () => {
   };
 
   const handleMarkAllAsRead = () => {
-    // Get all unread notification IDs
-    const unreadNotificationIds = notifications
-      .filter(notification => !notification.is_read && notification.is_approved)
-      .map(notification => notification.id);
-    
-    if (unreadNotificationIds.length === 0) {
+    if (notifications.length === 0) {
       return; // No unread notifications to mark
     }
     
-    markNotificationsAsRead(unreadNotificationIds)
-      .then(() => {
+    // Everything up to the newest notification shown, including older pages; reminders waiting
+    // for approval stay unread
+    const newestId = Math.max(...notifications.map(notification => notification.id));
+    markAllNotificationsAsRead(newestId)
+      .then(({ message }) => {
         // Invalidate and refetch notifications to update the UI
         queryClient.invalidateQueries('notifications');
-        console.log(`Marked ${unreadNotificationIds.length} notifications as read`);
+        queryClient.invalidateQueries('notificationsUnreadCount');
+        console.log(message);
       })
       .catch(error => {
         console.error('Failed to mark all notifications as read:', error);
@@ -377,6 +403,7 @@ const NotificationsMenu: React.FC = () => {
       .then(() => {
         // Invalidate and refetch notifications to update the UI
         queryClient.invalidateQueries('notifications');
+        queryClient.invalidateQueries('notificationsUnreadCount');
         console.log(`Marked notification ${id} as read`);
       })
       .catch(error => {
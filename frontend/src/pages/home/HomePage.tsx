@@ -22,8 +22,9 @@ import CalendarTodayIcon from '@mui/icons-material/CalendarToday';
 import FeedIcon from '@mui/icons-material/Feed';
 import NewEventModal from './create_event/NewEventModal';
 import { EventFormInputs, convertFormDataToAPIPayload } from './create_event/eventScheme';
-import { createEvent, getMyEvents, getEventsFeed, editEvent, deleteEvent } from '../../api/eventApi';
+import { createEvent, getMyEvents, editEvent, deleteEvent } from '../../api/eventApi';
 import useUserRole from './hooks/useUserRole';
+import useEventsFeed from './hooks/useEventsFeed';
 import FeedList from './feed/FeedList';
 import MyEventList from './my_events/MyEventList';
 import LoadingPage from './LoadingPage';
@@ -44,11 +45,12 @@ const HomePage: React.FC = () => {
     const { data: events = [], isLoading, isError } = useQuery(['events'], getMyEvents);
     const userRole = useUserRole();
     // Only fetch feed events for recruiter view
-    const { data: feedEvents = [] } = useQuery(
-        ['eventsFeed'], 
-        getEventsFeed,
-        { enabled: userRole !== 'worker' }
-    );
+    const {
+        events: feedEvents,
+        loadMore: loadMoreFeed,
+        hasMore: feedHasMore,
+        isLoadingMore: isFeedLoadingMore
+    } = useEventsFeed({ enabled: userRole !== 'worker' });
 
     const handleOpen = () => setModalOpen(true);
     const handleClose = () => setModalOpen(false);
@@ -346,6 +348,17 @@ const HomePage: React.FC = () => {
                                 </Typography>
                             </Box>
                             <FeedList events={feedEvents} />
+                            {feedHasMore && (
+                                <Box sx={{ display: 'flex', justifyContent: 'center', mt: 3 }}>
+                                    <Button
+                                        variant="outlined"
+                                        onClick={() => loadMoreFeed()}
+                                        disabled={isFeedLoadingMore}
+                                    >
+                                        {isFeedLoadingMore ? <CircularProgress size={20} /> : 'Load more events'}
+                                    </Button>
+                                </Box>
+                            )}
                         </Box>
                     )}
                 </Paper>
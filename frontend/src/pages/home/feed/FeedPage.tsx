@@ -7,38 +7,33 @@ import {
   Paper, 
   useTheme, 
   CircularProgress,
+  Button,
   alpha  // Added import for alpha function
 } from '@mui/material';
-import { useQuery } from 'react-query';
 import FeedIcon from '@mui/icons-material/Feed';
 import ResponsiveTabs from '../../../components/ResponsiveTabs';
-import { getEventsFeed } from '../../../api/eventApi';
 import FeedList from './FeedList';
 import EventFilters from './EventFilters';
 import useUserRole from '../hooks/useUserRole';
+import useEventsFeed from '../hooks/useEventsFeed';
 import { Navigate } from 'react-router-dom';
 
 const FeedPage: React.FC = () => {
   const theme = useTheme();
   const userRole = useUserRole();
   
-  // Query configuration with better error handling and refresh on focus
-  const { 
-    data: feedEvents = [], 
+  // The feed is paginated; pages are appended as the worker loads more
+  const {
+    events: feedEvents,
     isLoading: isFeedLoading,
-    refetch
-  } = useQuery(
-    ['eventsFeed'], 
-    getEventsFeed,
-    { 
-      enabled: userRole === 'worker',
-      retry: userRole === 'worker',
-      refetchOnWindowFocus: true,
-      onError: (error) => {
-        console.error('Failed to fetch events:', error);
-      }
-    }
-  );
+    loadMore,
+    hasMore,
+    isLoadingMore
+  } = useEventsFeed({
+    enabled: userRole === 'worker',
+    retry: userRole === 'worker',
+    refetchOnWindowFocus: true
+  });
   
   const [filteredEvents, setFilteredEvents] = useState<any[]>([]);
 
@@ -181,6 +176,19 @@ const FeedPage: React.FC = () => {
                   <FeedList events={filteredEvents} />
                 </Box>
               )}
+
+              {hasMore && !isFeedLoading && (
+                <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+                  <Button
+                    variant="outlined"
+                    size="small"
+                    onClick={() => loadMore()}
+                    disabled={isLoadingMore}
+                  >
+                    {isLoadingMore ? <CircularProgress size={18} /> : 'Load more events'}
+                  </Button>
+                </Box>
+              )}
             </Paper>
           </Grid>
         </Grid>
@@ -0,0 +1,49 @@
+import { useMemo } from 'react';
+import { useInfiniteQuery } from 'react-query';
+import { getEventsFeed } from '../../../api/eventApi';
+import { MyEventScheme } from '../create_event/eventScheme';
+
+interface UseEventsFeedOptions {
+    enabled: boolean;
+    retry?: boolean;
+    refetchOnWindowFocus?: boolean;
+}
+
+// The worker feed, one page at a time. `events` holds every page loaded so far;
+// `loadMore` fetches the next one while `hasMore` is true.
+const useEventsFeed = ({ enabled, retry = true, refetchOnWindowFocus = false }: UseEventsFeedOptions) => {
+    const {
+        data,
+        isLoading,
+        fetchNextPage,
+        hasNextPage,
+        isFetchingNextPage,
+    } = useInfiniteQuery(
+        ['eventsFeed'],
+        ({ pageParam }) => getEventsFeed(pageParam),
+        {
+            enabled,
+            retry,
+            refetchOnWindowFocus,
+            getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+            onError: (error) => {
+                console.error('Failed to fetch events:', error);
+            }
+        }
+    );
+
+    const events = useMemo<MyEventScheme[]>(
+        () => data?.pages.flatMap((page) => page.events) ?? [],
+        [data]
+    );
+
+    return {
+        events,
+        isLoading,
+        loadMore: fetchNextPage,
+        hasMore: Boolean(hasNextPage),
+        isLoadingMore: isFetchingNextPage,
+    };
+};
+
+export default useEventsFeed;